@@ -0,0 +1,23 @@
+from rest_framework import serializers
+
+from apps.notifications.models import PushCampaign
+from apps.shared.models import Language
+from apps.users.models.device import DeviceType
+
+
+class PushCampaignSerializer(serializers.ModelSerializer):
+    languages = serializers.ListField(child=serializers.ChoiceField(choices=Language.choices), required=False)
+    device_types = serializers.ListField(child=serializers.ChoiceField(choices=DeviceType.choices), required=False)
+    app_versions = serializers.ListField(child=serializers.CharField(max_length=100), required=False)
+
+    class Meta:
+        model = PushCampaign
+        fields = (
+            'id', 'title', 'body', 'data', 'history', 'languages', 'device_types', 'app_versions',
+            'status', 'last_device_id', 'sent_count', 'failed_count', 'invalid_count', 'error',
+            'started_at', 'finished_at', 'created_at', 'updated_at'
+        )
+        read_only_fields = (
+            'status', 'last_device_id', 'sent_count', 'failed_count', 'invalid_count', 'error',
+            'started_at', 'finished_at', 'created_at', 'updated_at'
+        )
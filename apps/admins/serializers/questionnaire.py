@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from apps.questionnaires.models import QuestionnaireStatus, Questionnaire, Question, Answer, Vote
+from apps.questionnaires.models import QuestionnaireStatus, Questionnaire, Question, Answer
 from apps.shared.mixins.translation_mixins import TranslatedFieldsReadMixin, TranslatedFieldsWriteMixin
 
 class BaseMixin:
@@ -23,20 +23,20 @@ class BaseMixin:
 
 
 class AnswerDetailSerializer(BaseMixin, TranslatedFieldsReadMixin, TranslatedFieldsWriteMixin, serializers.ModelSerializer):
-    votes_count = serializers.SerializerMethodField()
     percent = serializers.SerializerMethodField()
 
     class Meta:
         model = Answer
         fields = ('id', 'title', 'votes_count', 'percent')
 
-    def get_votes_count(self, obj):
-        return obj.votes.count()
-
     def get_percent(self, obj):
-        total_votes = self.context.get('total_votes', 0)
-        count = obj.votes.count()
-        return round((count / total_votes) * 100, 2) if total_votes > 0 else 0
+        if not obj.votes_count:
+            return 0
+        # Passed by QuestionDetailSerializer; the answer views select_related('question')
+        total_votes = self.context.get('total_votes')
+        if total_votes is None:
+            total_votes = obj.question.votes_count
+        return round((obj.votes_count / total_votes) * 100, 2) if total_votes > 0 else 0
 
 
 class QuestionDetailSerializer(BaseMixin, TranslatedFieldsWriteMixin, TranslatedFieldsReadMixin, serializers.ModelSerializer):
@@ -47,8 +47,7 @@ class QuestionDetailSerializer(BaseMixin, TranslatedFieldsWriteMixin, Translated
         fields = ('id', 'title', 'answers')
 
     def get_answers(self, obj):
-        total_votes = Vote.objects.filter(answer__question=obj).count()
-        serializer = AnswerDetailSerializer(obj.answers.all(), many=True, context={'total_votes': total_votes})
+        serializer = AnswerDetailSerializer(obj.answers.all(), many=True, context={'total_votes': obj.votes_count})
         return serializer.data
 
 
@@ -60,6 +59,6 @@ class QuestionnaireDetailSerializer(BaseMixin, TranslatedFieldsWriteMixin, Trans
         fields = ('id', 'title', 'status', 'questions')
 
     def get_questions(self, obj):
-        serializer = QuestionDetailSerializer(obj.questions.all(), many=True)
+        serializer = QuestionDetailSerializer(obj.questions.prefetch_related('answers'), many=True)
         return serializer.data
 
@@ -164,3 +164,25 @@ class PreparationStepsSerializer(TranslatedFieldsReadMixin, TranslatedFieldsWrit
             raise serializers.ValidationError('Description must be at least 2 characters long')
         return description
 
+
+class IngredientImportSerializer(serializers.ModelSerializer):
+    # Existence is checked by the importer for a whole batch at once
+    product_id = serializers.IntegerField()
+
+    class Meta:
+        model = RecipesProduct
+        fields = ['product_id', 'quantity', 'measurement']
+
+    def validate_quantity(self, quantity):
+        if quantity <= 0:
+            raise serializers.ValidationError('Quantity must be greater than 0')
+        return quantity
+
+
+class RecipeImportSerializer(RecipesListCreateSerializer):
+    """A recipe with its ingredients and preparation steps, used by the bulk import"""
+    ingredients = IngredientImportSerializer(many=True, allow_empty=False)
+    steps = PreparationStepsSerializer(many=True, required=False)
+
+    class Meta(RecipesListCreateSerializer.Meta):
+        pass
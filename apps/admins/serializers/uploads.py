@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from rest_framework import serializers
+
+from apps.shared.models import Media, UploadSession
+from apps.shared.utils.uploads import check_upload
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    upload_id = serializers.UUIDField(source='uuid', read_only=True)
+    # Target object as "app_label.model", e.g. "products.product"
+    target = serializers.CharField(write_only=True, required=False)
+    # Stored lower-case like TranslatedFieldsWriteMixin does
+    language = serializers.ChoiceField(choices=settings.LANGUAGES, required=False, allow_null=True)
+    chunk_size = serializers.SerializerMethodField()
+    media = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadSession
+        fields = (
+            'upload_id', 'filename', 'media_type', 'mime_type', 'total_size', 'offset', 'chunk_size',
+            'target', 'object_id', 'language', 'is_public', 'media', 'created_at'
+        )
+        read_only_fields = ('mime_type', 'offset', 'created_at')
+
+    def get_chunk_size(self, obj):
+        return settings.UPLOAD_CHUNK_SIZE
+
+    def get_media(self, obj: UploadSession):
+        media: Media = obj.media
+        if media is None:
+            return None
+        return {
+            'id': str(media.id),
+            'url': media.variant_url(),
+            'filename': media.original_filename,
+            'size': media.file_size,
+            'type': media.media_type,
+            'mime_type': media.mime_type,
+            'language': media.language,
+        }
+
+    def validate(self, attrs):
+        check_upload(attrs['media_type'], attrs['total_size'])
+
+        target = attrs.pop('target', None)
+        if target:
+            try:
+                content_type = ContentType.objects.get_by_natural_key(*target.lower().split('.', 1))
+            except (ContentType.DoesNotExist, TypeError):
+                raise serializers.ValidationError({'target': 'Unknown target model'})
+            if not content_type.model_class().objects.filter(pk=attrs.get('object_id')).exists():
+                raise serializers.ValidationError({'object_id': 'Target object not found'})
+            attrs['content_type'] = content_type
+        elif attrs.get('object_id') is not None:
+            raise serializers.ValidationError({'target': 'Required with object_id'})
+        return attrs
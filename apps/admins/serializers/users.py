@@ -1,6 +1,7 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+from apps.users.models.device import DeviceActivityRollup
 from apps.users.models.device import Device
 
 User = get_user_model()
@@ -77,3 +78,30 @@ class UserStatisticsSerializer(serializers.ModelSerializer):
     def get_device_type(self, obj):
         device = obj.devices.first()
         return device.device_model if device else 'Unknown'
+
+
+class DeviceActivityQuerySerializer(serializers.Serializer):
+    GROUP_BY_CHOICES = DeviceActivityRollup.objects.DIMENSIONS
+
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    device_type = serializers.CharField(required=False)
+    app_version = serializers.CharField(required=False)
+    language = serializers.CharField(required=False)
+    group_by = serializers.CharField(required=False, allow_blank=True, default='')
+
+    def validate_group_by(self, group_by):
+        dimensions = [d.strip() for d in group_by.split(',') if d.strip()]
+        for dimension in dimensions:
+            if dimension not in self.GROUP_BY_CHOICES:
+                raise serializers.ValidationError(
+                    'group_by must be a comma separated subset of {}'.format(', '.join(self.GROUP_BY_CHOICES))
+                )
+        return dimensions
+
+    def validate(self, attrs):
+        date_from = attrs.get('date_from')
+        date_to = attrs.get('date_to')
+        if date_from and date_to and date_from > date_to:
+            raise serializers.ValidationError({'date_from': 'date_from must be before date_to'})
+        return attrs
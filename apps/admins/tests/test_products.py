@@ -0,0 +1,150 @@
+import io
+import json
+import shutil
+import tempfile
+import zipfile
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.products.models import Product
+from apps.shared.models import Media
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+DESCRIPTION_EN = 'Fresh and tasty product delivered from the farm every morning.'
+DESCRIPTION_UZ = "Har kuni ertalab fermadan yetkaziladigan yangi va mazali mahsulot."
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ProductImportTestCase(APITestCase):
+    """Test cases for bulk product import"""
+    url = '/api/v1/admins/products/import/'
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            phone='+998901234500',
+            username='admin_user',
+            password='AdminPass123!',
+            is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+
+    def csv_file(self, rows):
+        header = 'title_en,title_uz,description_en,description_uz,price,quantity,weight,measurement,images_en\n'
+        return SimpleUploadedFile('products.csv', (header + ''.join(rows)).encode('utf-8'), 'text/csv')
+
+    def archive(self, names):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            for name in names:
+                archive.writestr(name, b'\x89PNG fake image')
+        return SimpleUploadedFile('images.zip', buffer.getvalue(), 'application/zip')
+
+    def test_import_csv_with_images(self):
+        """CSV va rasmlar arxividan mahsulotlar yaratiladi"""
+        rows = [
+            f'Green apple,Yashil olma,{DESCRIPTION_EN},{DESCRIPTION_UZ},12000,10,500,gr,apple.png;apple-2.png\n',
+            f'Red pepper,Qizil qalampir,{DESCRIPTION_EN},{DESCRIPTION_UZ},8000,0,,,\n',
+        ]
+
+        response = self.client.post(self.url, {
+            'file': self.csv_file(rows), 'images': self.archive(['apple.png', 'apple-2.png'])
+        }, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['created'], 2)
+        self.assertEqual(response.data['data']['failed'], 0)
+        apple = Product.objects.get(title_en='Green apple')
+        self.assertEqual(apple.title_uz, 'Yashil olma')
+        self.assertEqual(apple.weight, 500)
+        self.assertEqual(
+            sorted(apple.media_files.values_list('original_filename', 'language', 'media_type')),
+            [('apple-2.png', 'en', 'image'), ('apple.png', 'en', 'image')]
+        )
+        self.assertEqual(Media.objects.count(), 2)
+
+        response = self.client.get(f'/api/v1/admins/products/{apple.id}/')
+        self.assertEqual(len(response.data['data']['images']), 2)
+
+    def test_invalid_rows_are_reported(self):
+        """Xato qatorlar raqami bilan qaytariladi, qolganlari saqlanadi"""
+        rows = [
+            f'Green apple,Yashil olma,{DESCRIPTION_EN},{DESCRIPTION_UZ},12000,10,,,\n',
+            f'Bad,Yomon,{DESCRIPTION_EN},{DESCRIPTION_UZ},-5,10,,,\n',
+            f'Missing image,Rasm yoq,{DESCRIPTION_EN},{DESCRIPTION_UZ},100,1,,,nope.png\n',
+        ]
+
+        response = self.client.post(self.url, {'file': self.csv_file(rows)}, format='multipart')
+
+        report = response.data['data']
+        self.assertEqual((report['created'], report['failed']), (1, 2))
+        self.assertEqual([error['line'] for error in report['errors']], [3, 4])
+        self.assertIn('price', report['errors'][0]['errors'])
+        self.assertIn('images_en', report['errors'][1]['errors'])
+        self.assertEqual(Product.objects.count(), 1)
+
+    def test_import_ndjson_in_batches(self):
+        """NDJSON qatorlari batch'lar bilan kiritiladi"""
+        lines = [
+            json.dumps({
+                'title_en': f'Product number {i}', 'title_uz': f'Mahsulot {i}',
+                'description_en': DESCRIPTION_EN, 'description_uz': DESCRIPTION_UZ,
+                'price': '1000.00', 'quantity': i,
+            }) for i in range(25)
+        ]
+        lines.insert(3, '{broken json')
+        upload = SimpleUploadedFile('products.ndjson', '\n'.join(lines).encode('utf-8'))
+
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+
+        report = response.data['data']
+        self.assertEqual((report['created'], report['failed']), (25, 1))
+        self.assertEqual(report['errors'][0]['line'], 4)
+        self.assertEqual(Product.objects.count(), 25)
+
+    @patch('apps.shared.utils.bulk_import.JSON_READ_SIZE', 100)
+    def test_import_json_array_incrementally(self):
+        """JSON massiv butunlay xotiraga yuklanmasdan qatorma-qator o'qiladi"""
+        rows = [{
+            'title_en': f'Product number {i}', 'title_uz': f'Mahsulot {i}',
+            'description_en': DESCRIPTION_EN, 'description_uz': DESCRIPTION_UZ,
+            'price': '1000.00', 'quantity': i,
+        } for i in range(5)]
+        content = json.dumps(rows, indent=2)[:-1] + ', {"title_en": ]'
+        upload = SimpleUploadedFile('products.json', content.encode('utf-8'))
+
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+
+        report = response.data['data']
+        self.assertEqual((report['created'], report['failed']), (5, 1))
+        self.assertEqual(report['errors'][0]['line'], 6)
+        self.assertEqual(Product.objects.count(), 5)
+
+    def test_unknown_file_type(self):
+        """Noma'lum fayl turi rad etiladi"""
+        upload = SimpleUploadedFile('products.xml', b'<products/>')
+
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_regular_user_forbidden(self):
+        """Oddiy foydalanuvchiga ruxsat yo'q"""
+        user = User.objects.create_user(phone='+998901234501', username='user', password='TestPass123!')
+        self.client.force_authenticate(user)
+
+        response = self.client.post(self.url, {'file': self.csv_file([])}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,254 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.db.models.deletion import Collector
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.questionnaires.models import Questionnaire, Question, Answer, Vote
+
+User = get_user_model()
+
+
+class QuestionnaireResultsTestCase(APITestCase):
+    """Test cases for precomputed questionnaire vote tallies"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            phone='+998901234500',
+            username='admin_user',
+            password='AdminPass123!',
+            is_staff=True
+        )
+        self.voters = [
+            User.objects.create_user(phone=f'+99890765430{i}', username=f'voter_{i}', password='TestPass123!')
+            for i in range(4)
+        ]
+        self.questionnaire = Questionnaire.objects.create(title_en='Survey', title_uz='So\'rovnoma')
+        self.questions = []
+        for q in range(3):
+            question = Question.objects.create(questionnaire=self.questionnaire, title_en=f'Question {q}')
+            for a in range(2):
+                Answer.objects.create(question=question, title_en=f'Answer {q}.{a}')
+            self.questions.append(question)
+
+    def vote(self, user, answer):
+        self.client.force_authenticate(user)
+        return self.client.post('/api/v1/questionnaires/vote/', {'answer_id': answer.id})
+
+    def test_vote_updates_tallies(self):
+        """Ovoz berilganda hisoblagichlar yangilanadi"""
+        first, second = self.questions[0].answers.order_by('id')
+
+        self.assertEqual(self.vote(self.voters[0], first).status_code, status.HTTP_201_CREATED)
+        self.vote(self.voters[1], first)
+        self.vote(self.voters[2], second)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.questions[0].refresh_from_db()
+        self.assertEqual((first.votes_count, second.votes_count), (2, 1))
+        self.assertEqual(self.questions[0].votes_count, 3)
+
+    def test_revote_moves_tally(self):
+        """Qayta ovoz berish eski javobdan yangisiga o'tkazadi"""
+        first, second = self.questions[0].answers.order_by('id')
+
+        self.vote(self.voters[0], first)
+        self.vote(self.voters[0], second)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.questions[0].refresh_from_db()
+        self.assertEqual((first.votes_count, second.votes_count), (0, 1))
+        self.assertEqual(self.questions[0].votes_count, 1)
+        self.assertEqual(Vote.objects.filter(user=self.voters[0]).count(), 1)
+
+    def test_batch_vote_for_questionnaire(self):
+        """So'rovnomaning barcha savollariga bitta so'rovda ovoz berish"""
+        first_answers = [question.answers.order_by('id').first() for question in self.questions]
+        self.client.force_authenticate(self.voters[0])
+        url = f'/api/v1/questionnaires/{self.questionnaire.id}/votes/'
+
+        response = self.client.post(url, {'answers': [a.id for a in first_answers]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        # Change the answer of the first question only
+        changed = self.questions[0].answers.order_by('id').last()
+        response = self.client.post(url, {'answers': [changed.id, first_answers[1].id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(Vote.objects.filter(user=self.voters[0]).count(), 3)
+        counts = dict(Answer.objects.values_list('id', 'votes_count'))
+        self.assertEqual(counts[first_answers[0].id], 0)
+        self.assertEqual(counts[changed.id], 1)
+        self.assertEqual(counts[first_answers[1].id], 1)
+        self.assertEqual(counts[first_answers[2].id], 1)
+        self.assertEqual(
+            list(Question.objects.filter(questionnaire=self.questionnaire).values_list('votes_count', flat=True)),
+            [1, 1, 1]
+        )
+
+    def test_batch_vote_validation(self):
+        """Boshqa so'rovnoma javobi yoki bitta savolga ikki javob rad etiladi"""
+        other = Questionnaire.objects.create(title_en='Other')
+        foreign = Answer.objects.create(question=Question.objects.create(questionnaire=other, title_en='Q'))
+        first, second = self.questions[0].answers.order_by('id')
+        self.client.force_authenticate(self.voters[0])
+        url = f'/api/v1/questionnaires/{self.questionnaire.id}/votes/'
+
+        response = self.client.post(url, {'answers': [foreign.id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(url, {'answers': [first.id, second.id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Vote.objects.exists())
+
+    def test_batch_vote_query_count_does_not_grow_with_answers(self):
+        """Ovozlar soni so'rovlar soniga ta'sir qilmaydi"""
+        self.client.force_authenticate(self.voters[0])
+        url = f'/api/v1/questionnaires/{self.questionnaire.id}/votes/'
+        answers = [question.answers.order_by('id').first().id for question in self.questions]
+
+        with self.assertNumQueries(8):
+            self.client.post(url, {'answers': answers[:1]}, format='json')
+        with self.assertNumQueries(8):
+            self.client.post(url, {'answers': answers}, format='json')
+
+    def test_deleting_user_releases_votes(self):
+        """Foydalanuvchi o'chirilganda ovozlari hisobdan chiqariladi"""
+        first, _ = self.questions[0].answers.order_by('id')
+        self.vote(self.voters[0], first)
+
+        self.voters[0].delete()
+
+        first.refresh_from_db()
+        self.questions[0].refresh_from_db()
+        self.assertEqual(first.votes_count, 0)
+        self.assertEqual(self.questions[0].votes_count, 0)
+        # Votes have no delete receivers, the cascade deletes them in bulk
+        self.assertTrue(Collector(using='default').can_fast_delete(Vote.objects.all()))
+
+    def test_deleting_votes_and_answers_recounts_tallies(self):
+        """Ovozlar yoki javob o'chirilganda hisoblagichlar qayta sanaladi"""
+        first, second = self.questions[0].answers.order_by('id')
+        for voter in self.voters[:3]:
+            self.vote(voter, first)
+        self.vote(self.voters[3], second)
+
+        Vote.objects.filter(user__in=self.voters[:2]).delete()
+        first.refresh_from_db()
+        self.questions[0].refresh_from_db()
+        self.assertEqual((first.votes_count, self.questions[0].votes_count), (1, 2))
+
+        first.delete()
+        self.questions[0].refresh_from_db()
+        self.assertEqual(self.questions[0].votes_count, 1)
+
+    def test_results_percentages(self):
+        """Natijalar foizlari"""
+        first, second = self.questions[0].answers.order_by('id')
+        for voter in self.voters[:3]:
+            self.vote(voter, first)
+        self.vote(self.voters[3], second)
+
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(f'/api/v1/admins/questionnaires/{self.questionnaire.id}/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        question = next(q for q in response.data['data']['questions'] if q['id'] == self.questions[0].id)
+        results = {answer['id']: (answer['votes_count'], answer['percent']) for answer in question['answers']}
+        self.assertEqual(results[first.id], (3, 75.0))
+        self.assertEqual(results[second.id], (1, 25.0))
+
+    def test_answer_percent_without_extra_queries(self):
+        """Javob foizi savol uchun alohida so'rovsiz hisoblanadi"""
+        first, second = self.questions[0].answers.order_by('id')
+        for voter in self.voters[:3]:
+            self.vote(voter, first)
+        self.vote(self.voters[3], second)
+
+        self.client.force_authenticate(self.admin)
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/v1/admins/answers/{first.id}/')
+        self.assertEqual(response.data['data']['percent'], 75.0)
+
+    def test_results_query_count_does_not_grow_with_questions(self):
+        """Natijalar so'rovlari savollar soniga bog'liq emas"""
+        self.client.force_authenticate(self.admin)
+        url = f'/api/v1/admins/questionnaires/{self.questionnaire.id}/'
+
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+        for q in range(10):
+            question = Question.objects.create(questionnaire=self.questionnaire, title_en=f'Extra {q}')
+            Answer.objects.create(question=question, title_en='Yes')
+
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+
+class QuestionnaireExportTestCase(APITestCase):
+    """Test cases for streaming vote/result exports"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            phone='+998901234500',
+            username='admin_user',
+            password='AdminPass123!',
+            is_staff=True
+        )
+        self.questionnaire = Questionnaire.objects.create(title_en='Survey')
+        self.question = Question.objects.create(questionnaire=self.questionnaire, title_en='Favourite colour?')
+        self.red = Answer.objects.create(question=self.question, title_en='Red')
+        self.blue = Answer.objects.create(question=self.question, title_en='Blue, "navy"')
+        for i in range(3):
+            voter = User.objects.create_user(phone=f'+99890765430{i}', username=f'voter_{i}', password='TestPass123!')
+            Vote.objects.cast(voter, {self.question.id: (self.red if i < 2 else self.blue).id})
+        self.client.force_authenticate(self.admin)
+
+    def read(self, response):
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_votes_csv(self):
+        """Ovozlarni CSV ko'rinishida yuklab olish"""
+        response = self.client.get(f'/api/v1/admins/questionnaires/{self.questionnaire.id}/votes/export/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn('text/csv', response['Content-Type'])
+        rows = list(csv.reader(io.StringIO(self.read(response))))
+        self.assertEqual(rows[0], ['vote_id', 'question_id', 'question', 'answer_id', 'answer', 'user_id', 'phone'])
+        self.assertEqual(len(rows), 4)
+        self.assertIn('Blue, "navy"', [row[4] for row in rows[1:]])
+
+    def test_votes_ndjson(self):
+        """Ovozlarni NDJSON ko'rinishida yuklab olish"""
+        response = self.client.get(
+            f'/api/v1/admins/questionnaires/{self.questionnaire.id}/votes/export/', {'file_type': 'ndjson'}
+        )
+
+        records = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(len(records), 3)
+        self.assertEqual(sum(record['answer_id'] == self.red.id for record in records), 2)
+        self.assertTrue(all(record['question'] == 'Favourite colour?' for record in records))
+
+    def test_results_csv(self):
+        """Natijalarni CSV ko'rinishida yuklab olish"""
+        response = self.client.get(f'/api/v1/admins/questionnaires/{self.questionnaire.id}/results/export/')
+
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+        self.assertEqual([(row['answer'], row['votes_count'], row['percent']) for row in rows], [
+            ('Red', '2', '66.67'),
+            ('Blue, "navy"', '1', '33.33'),
+        ])
+
+    def test_invalid_file_type(self):
+        """Noto'g'ri format"""
+        response = self.client.get(
+            f'/api/v1/admins/questionnaires/{self.questionnaire.id}/votes/export/', {'file_type': 'xml'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
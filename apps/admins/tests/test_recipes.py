@@ -0,0 +1,108 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.products.models import Product
+from apps.recipes.models import Recipe, RecipesCategory, RecipesProduct, PreparationSteps
+
+User = get_user_model()
+
+
+class RecipeImportTestCase(APITestCase):
+    """Test cases for bulk recipe import"""
+    url = '/api/v1/admins/recipes/import/'
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            phone='+998901234500',
+            username='admin_user',
+            password='AdminPass123!',
+            is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+        self.category = RecipesCategory.objects.create(title_en='Breakfast', title_uz='Nonushta')
+        self.products = [
+            Product.objects.create(
+                title_en=f'Product {i}', title_uz=f'Mahsulot {i}', description='Description', price=1000, quantity=5
+            ) for i in range(3)
+        ]
+
+    def recipe(self, number, product_ids):
+        return {
+            'title_en': f'Omelette number {number}',
+            'title_uz': f'Omlet raqami {number}',
+            'category': self.category.id,
+            'calories': 300,
+            'cooking_time': 15,
+            'ingredients': [
+                {'product_id': product_id, 'quantity': 2, 'measurement': 'pc'} for product_id in product_ids
+            ],
+            'steps': [
+                {'description_en': 'Beat the eggs', 'description_uz': 'Tuxumlarni chaling'},
+                {'description_en': 'Fry them', 'description_uz': 'Qovuring'},
+            ],
+        }
+
+    def upload(self, recipes, file_type='ndjson'):
+        if file_type == 'json':
+            content = json.dumps(recipes)
+        else:
+            content = '\n'.join(json.dumps(recipe) for recipe in recipes)
+        upload = SimpleUploadedFile(f'recipes.{file_type}', content.encode('utf-8'))
+        return self.client.post(self.url, {'file': upload}, format='multipart')
+
+    def test_import_nested_recipes(self):
+        """Retseptlar ingredientlar va qadamlar bilan yaratiladi"""
+        product_ids = [product.id for product in self.products]
+
+        response = self.upload([self.recipe(i, product_ids) for i in range(3)], file_type='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        report = response.data['data']
+        self.assertEqual((report['created'], report['failed']), (3, 0))
+        self.assertEqual(report['results'][0]['ingredients'], 3)
+        self.assertEqual(report['results'][0]['steps'], 2)
+
+        recipe = Recipe.objects.get(pk=report['results'][0]['id'])
+        self.assertEqual(recipe.title_uz, 'Omlet raqami 0')
+        self.assertEqual(sorted(recipe.ingredients.values_list('product_id', flat=True)), product_ids)
+        self.assertEqual(list(recipe.steps.values_list('description_uz', flat=True)),
+                         ['Tuxumlarni chaling', 'Qovuring'])
+        self.assertEqual(RecipesProduct.objects.count(), 9)
+        self.assertEqual(PreparationSteps.objects.count(), 6)
+
+    def test_unknown_products_and_invalid_rows(self):
+        """Mavjud bo'lmagan mahsulot yoki xato qator o'tkazib yuboriladi"""
+        recipes = [
+            self.recipe(0, [self.products[0].id]),
+            self.recipe(1, [self.products[0].id, 999999]),
+            {**self.recipe(2, [self.products[1].id]), 'calories': 0},
+        ]
+
+        report = self.upload(recipes).data['data']
+
+        self.assertEqual((report['created'], report['failed']), (1, 2))
+        errors = {error['line']: error['errors'] for error in report['errors']}
+        self.assertIn('ingredients', errors[2])
+        self.assertIn('calories', errors[3])
+        self.assertEqual(Recipe.objects.count(), 1)
+
+    def test_query_count_does_not_grow_with_recipes(self):
+        """So'rovlar soni retseptlar soniga bog'liq emas"""
+        product_ids = [product.id for product in self.products]
+
+        with self.assertNumQueries(7):
+            self.upload([self.recipe(i, product_ids) for i in range(2)])
+        with self.assertNumQueries(7):
+            self.upload([self.recipe(i, product_ids) for i in range(20)])
+
+    def test_csv_is_rejected(self):
+        """CSV formatida ichma-ich ma'lumot yo'q"""
+        upload = SimpleUploadedFile('recipes.csv', b'title_en\nOmelette')
+
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,166 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from PIL import Image
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.products.models import Product
+from apps.shared.models import Media, UploadSession
+from apps.shared.storage import ContentAddressedStorage
+from apps.shared.utils.media_access import is_private
+
+User = get_user_model()
+
+TEMP_ROOT = tempfile.mkdtemp()
+
+
+def tearDownModule():
+    shutil.rmtree(TEMP_ROOT, ignore_errors=True)
+
+
+def make_png():
+    buffer = io.BytesIO()
+    Image.new('RGB', (300, 300), (10, 120, 10)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+@override_settings(
+    MEDIA_ROOT=os.path.join(TEMP_ROOT, 'media'),
+    CHUNKED_UPLOAD_DIR=os.path.join(TEMP_ROOT, 'uploads'),
+    IMAGE_VARIANT_WORKERS=0,
+)
+class ResumableUploadTestCase(APITestCase):
+    """Test cases for chunked, resumable media uploads"""
+    url = '/api/v1/admins/uploads/'
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            phone='+998901234500',
+            username='admin_user',
+            password='AdminPass123!',
+            is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+        self.product = Product.objects.create(title_en='Green apple', description='Fresh', price=1000, quantity=5)
+        self.content = make_png()
+
+    def start(self, **data):
+        payload = {
+            'filename': 'apple.png', 'media_type': 'image', 'total_size': len(self.content),
+            'target': 'products.product', 'object_id': self.product.id, 'language': 'en',
+        }
+        payload.update(data)
+        return self.client.post(self.url, payload, format='json')
+
+    def send(self, upload_id, offset, chunk):
+        return self.client.generic(
+            'PATCH', f'{self.url}{upload_id}/', chunk,
+            content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET=str(offset)
+        )
+
+    def test_upload_in_chunks(self):
+        """Fayl bo'laklarda yuklanadi va Media yaratiladi"""
+        response = self.start()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        upload_id = response.data['data']['upload_id']
+
+        middle = len(self.content) // 2
+        response = self.send(upload_id, 0, self.content[:middle])
+        self.assertEqual(response.data['data']['offset'], middle)
+        self.assertEqual(response.data['data']['mime_type'], 'image/png')
+        self.assertIsNone(response.data['data']['media'])
+
+        response = self.send(upload_id, middle, self.content[middle:])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        media = Media.objects.get(pk=response.data['data']['media']['id'])
+        self.assertEqual(media.object_id, self.product.id)
+        self.assertEqual((media.mime_type, media.file_size, media.language), ('image/png', len(self.content), 'en'))
+        with media.file.open('rb') as file:
+            self.assertEqual(file.read(), self.content)
+
+    def test_resume_from_server_offset(self):
+        """Uzilishdan keyin server aytgan joydan davom etiladi"""
+        upload_id = self.start().data['data']['upload_id']
+        self.send(upload_id, 0, self.content[:100])
+
+        response = self.send(upload_id, 50, self.content[50:])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['offset'], 100)
+
+        offset = self.client.get(f'{self.url}{upload_id}/').data['data']['offset']
+        response = self.send(upload_id, offset, self.content[offset:])
+        self.assertIsNotNone(response.data['data']['media'])
+
+    def test_private_upload(self):
+        """Sessiyada berilgan ko'rinish Media ga o'tadi"""
+        upload_id = self.start(is_public=False).data['data']['upload_id']
+
+        response = self.send(upload_id, 0, self.content)
+
+        media = Media.objects.get(pk=response.data['data']['media']['id'])
+        self.assertFalse(media.is_public)
+        self.assertTrue(is_private(media.file.name))
+
+    def test_file_is_stored_after_lock_released(self):
+        """Fayl sessiya qulfi bo'shatilgandan keyin saqlanadi, xatoda oxirgi bo'lak qayta yuboriladi"""
+        upload_id = self.start().data['data']['upload_id']
+        self.send(upload_id, 0, self.content[:100])
+
+        with mock.patch('apps.shared.models.sniff_file', side_effect=OSError('disk full')):
+            response = self.send(upload_id, 100, self.content[100:])
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        session = UploadSession.objects.get(uuid=upload_id)
+        self.assertEqual((session.offset, session.media), (100, None))
+
+        depth = len(connection.atomic_blocks)
+        store_depths = []
+        original_save = ContentAddressedStorage._save
+
+        def save(storage, name, content):
+            store_depths.append(len(connection.atomic_blocks))
+            return original_save(storage, name, content)
+
+        with mock.patch.object(ContentAddressedStorage, '_save', save):
+            response = self.send(upload_id, 100, self.content[100:])
+        self.assertIsNotNone(response.data['data']['media'])
+        # Not inside the transaction holding the session row lock
+        self.assertEqual(store_depths[0], depth)
+        with Media.objects.get().file.open('rb') as file:
+            self.assertEqual(file.read(), self.content)
+
+    def test_content_must_match_media_type(self):
+        """Rasm deb e'lon qilingan PDF rad etiladi"""
+        pdf = b'%PDF-1.7\n' + b'0' * 100
+        upload_id = self.start(total_size=len(pdf)).data['data']['upload_id']
+
+        response = self.send(upload_id, 0, pdf)
+
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        self.assertEqual(UploadSession.objects.get(uuid=upload_id).offset, 0)
+        self.assertFalse(Media.objects.exists())
+
+    def test_size_limit(self):
+        """Turi bo'yicha hajm chegarasi"""
+        with self.settings(MEDIA_UPLOAD_LIMITS={'image': 1000, 'other': 1000}):
+            response = self.start(total_size=1001)
+
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    def test_media_save_sniffs_mime_type(self):
+        """Mijoz yuborgan MIME turiga ishonilmaydi"""
+        media = Media.objects.create(
+            file=SimpleUploadedFile('fake.png', b'%PDF-1.4 document', content_type='image/png'),
+            media_type='document',
+            original_filename='fake.png',
+        )
+
+        self.assertEqual(media.mime_type, 'application/pdf')
@@ -1,6 +1,6 @@
 from django.urls import path
 from apps.admins.views import recipes, questionnaire, histories, products
-from apps.admins.views import users
+from apps.admins.views import users, notifications, uploads, system
 
 app_name = 'admins'
 
@@ -9,6 +9,8 @@ urlpatterns = [
     path('users/<int:pk>/', users.UserDetailAPIView.as_view(), name='user_detail'),
     path('users/<int:pk>/devices/<int:id>/', users.DeviceDestroyAPIView.as_view(), name='user_devices'),
     path('users/statistics/', users.UserStatisticsAPIView.as_view(), name='users-statistics'),
+    path('users/activity/', users.DeviceActivityStatisticsAPIView.as_view(), name='users-activity'),
+    path('recipes/import/', recipes.RecipeImportAPIView.as_view(), name='recipes_import'),
     path('recipes/<int:pk>/', recipes.RecipeRetrieveUpdateDestroyAPIView.as_view(), name='recipes_detail'),
     path('recipes/', recipes.RecipeListCreateAPIView.as_view(), name='recipes_list'),
     path('recipes/<int:pk>/ingredients/', recipes.IngredientsListCreateAPIView.as_view(), name='recipes_ingredients'),
@@ -17,11 +19,18 @@ urlpatterns = [
     path('recipes/<int:pk>/preparationsteps/<int:id>/', recipes.PreparationStepsRetrieveUpdateDestroyAPIView.as_view(), name='recipes_preparation_detail'),
     path('questionnaires/<int:pk>/', questionnaire.QuestionnaireDetailAPIView.as_view(), name='questionnaire_detail'),
     path("questionnaires/<int:questionnaire_id>/questions/", questionnaire.QuestionCreateAPIView.as_view()),
+    path('questionnaires/<int:pk>/votes/export/', questionnaire.QuestionnaireVotesExportAPIView.as_view(), name='questionnaire_votes_export'),
+    path('questionnaires/<int:pk>/results/export/', questionnaire.QuestionnaireResultsExportAPIView.as_view(), name='questionnaire_results_export'),
     path("questions/<int:pk>/", questionnaire.QuestionRetrieveUpdateDestroyAPIView.as_view()),
     path("questions/<int:question_id>/answers/", questionnaire.AnswerCreateAPIView.as_view()),
     path("answers/<int:pk>/", questionnaire.AnswerRetrieveUpdateDestroyAPIView.as_view()),
     path('histories/', histories.HistoryListCreateAPIView.as_view(), name='histories_list'),
     path('histories/<int:pk>/', histories.HistoryRetrieveUpdateDestroyAPIView.as_view(), name='histories_detail'),
     path('products/', products.ProductAdminListCreateAPIView.as_view(), name='product-list'),
+    path('products/import/', products.ProductAdminImportAPIView.as_view(), name='product-import'),
     path('products/<int:pk>/', products.ProductAdminRetrieveUpdateDestroyAPIView.as_view(), name='product-detail'),
+    path('push-campaigns/', notifications.PushCampaignListCreateAPIView.as_view(), name='push-campaigns'),
+    path('uploads/', uploads.UploadSessionCreateAPIView.as_view(), name='uploads'),
+    path('uploads/<uuid:upload_id>/', uploads.UploadSessionAPIView.as_view(), name='upload-detail'),
+    path('system/database/', system.DatabaseConnectionsAPIView.as_view(), name='system-database'),
 ]
\ No newline at end of file
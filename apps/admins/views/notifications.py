@@ -0,0 +1,34 @@
+from rest_framework import status
+from rest_framework.generics import ListCreateAPIView
+from rest_framework.permissions import IsAdminUser
+
+from ..serializers.notifications import PushCampaignSerializer
+from ...notifications.models import PushCampaign
+from ...shared.utils.custom_pagination import CustomPageNumberPagination
+from ...shared.utils.custom_response import CustomResponse
+
+
+class PushCampaignListCreateAPIView(ListCreateAPIView):
+    """
+    Create push campaigns and follow their progress.
+    Campaigns are sent by the send_push_campaign management command.
+    """
+    queryset = PushCampaign.objects.all().order_by('-created_at')
+    serializer_class = PushCampaignSerializer
+    permission_classes = [IsAdminUser]
+    pagination_class = CustomPageNumberPagination
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return CustomResponse.success(data=serializer.data, status_code=status.HTTP_200_OK)
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return CustomResponse.success(data=serializer.data, status_code=status.HTTP_201_CREATED)
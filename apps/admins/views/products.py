@@ -1,9 +1,12 @@
 from rest_framework import status, filters
 from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
 
 from apps.admins.serializers.products import ProductAdminSerializer
 from apps.products.models import Product
+from apps.shared.utils.bulk_import import import_from_request
 from apps.shared.utils.custom_pagination import CustomPageNumberPagination
 from apps.shared.utils.custom_response import CustomResponse
 
@@ -75,3 +78,20 @@ class ProductAdminRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
             message='Product deleted successfully',
             status_code=status.HTTP_200_OK
         )
+
+
+class ProductAdminImportAPIView(APIView):
+    """
+    Import products from a CSV / NDJSON file with an optional zip of images.
+    Rows are validated like the create endpoint; invalid rows are reported by line number.
+    """
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, *args, **kwargs):
+        report = import_from_request(request, ProductAdminSerializer)
+        return CustomResponse.success(
+            data=report,
+            message='Products imported successfully',
+            status_code=status.HTTP_200_OK
+        )
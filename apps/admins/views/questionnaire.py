@@ -1,12 +1,17 @@
 from django.db.models import Count
 from rest_framework import status
-from rest_framework.generics import RetrieveUpdateDestroyAPIView, CreateAPIView
+from rest_framework.generics import RetrieveUpdateDestroyAPIView, CreateAPIView, get_object_or_404
 from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
 
 from apps.admins.serializers.questionnaire import QuestionnaireDetailSerializer, QuestionDetailSerializer, \
     AnswerDetailSerializer
-from apps.questionnaires.models import Questionnaire, Answer, Question
+from apps.questionnaires.models import Questionnaire, Answer, Question, Vote
+from apps.shared.exceptions.custom_exceptions import CustomException
 from apps.shared.utils.custom_response import CustomResponse
+from apps.shared.utils.streaming import EXPORT_FORMATS, streaming_export_response
+
+EXPORT_CHUNK_SIZE = 5000
 
 
 class QuestionnaireDetailAPIView(RetrieveUpdateDestroyAPIView):
@@ -82,7 +87,7 @@ class AnswerCreateAPIView(CreateAPIView):
 
 
 class AnswerRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
-    queryset = Answer.objects.all()
+    queryset = Answer.objects.select_related('question')
     serializer_class = AnswerDetailSerializer
     permission_classes = [IsAdminUser]
 
@@ -96,3 +101,68 @@ class AnswerRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
     def destroy(self, request, *args, **kwargs):
         super().destroy(request, *args, **kwargs)
         return CustomResponse.success(status_code=204)
+
+
+def get_export_format(request):
+    export_format = request.query_params.get('file_type', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        raise CustomException(message_key='VALIDATION_ERROR', context={'file_type': export_format})
+    return export_format
+
+
+class QuestionnaireVotesExportAPIView(APIView):
+    """
+    Stream every vote of a questionnaire as CSV or NDJSON (``?file_type=``).
+    Votes are read through a server-side cursor, so memory use does not grow with the export.
+    """
+    permission_classes = [IsAdminUser]
+    fields = ('vote_id', 'question_id', 'question', 'answer_id', 'answer', 'user_id', 'phone')
+
+    def get(self, request, pk):
+        export_format = get_export_format(request)
+        questionnaire = get_object_or_404(Questionnaire, pk=pk)
+
+        # A questionnaire has few answers; join their titles in Python instead of per vote row
+        answers = {
+            answer_id: (question_id, question_title, answer_title)
+            for answer_id, question_id, question_title, answer_title in Answer.objects.filter(
+                question__questionnaire=questionnaire
+            ).values_list('id', 'question_id', 'question__title', 'title')
+        }
+        votes = (
+            Vote.objects.filter(question_id__in={question_id for question_id, _, _ in answers.values()})
+            .order_by()
+            .values_list('id', 'answer_id', 'user_id', 'user__phone')
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+
+        def rows():
+            for vote_id, answer_id, user_id, phone in votes:
+                question_id, question, answer = answers[answer_id]
+                yield vote_id, question_id, question, answer_id, answer, user_id, phone
+
+        return streaming_export_response(
+            self.fields, rows(), export_format, filename=f'questionnaire-{questionnaire.pk}-votes'
+        )
+
+
+class QuestionnaireResultsExportAPIView(APIView):
+    """Per-answer results of a questionnaire as CSV or NDJSON (``?file_type=``)"""
+    permission_classes = [IsAdminUser]
+    fields = ('question_id', 'question', 'answer_id', 'answer', 'votes_count', 'percent')
+
+    def get(self, request, pk):
+        export_format = get_export_format(request)
+        questionnaire = get_object_or_404(Questionnaire, pk=pk)
+
+        answers = Answer.objects.filter(question__questionnaire=questionnaire).order_by('question_id', 'id').values_list(
+            'question_id', 'question__title', 'id', 'title', 'votes_count', 'question__votes_count'
+        )
+        rows = (
+            (question_id, question, answer_id, answer, votes_count,
+             round(votes_count / total_votes * 100, 2) if total_votes else 0)
+            for question_id, question, answer_id, answer, votes_count, total_votes in answers.iterator()
+        )
+        return streaming_export_response(
+            self.fields, rows, export_format, filename=f'questionnaire-{questionnaire.pk}-results'
+        )
@@ -1,12 +1,15 @@
 from django.http import Http404
 from rest_framework import status, viewsets
 from rest_framework.generics import RetrieveUpdateDestroyAPIView, CreateAPIView, ListCreateAPIView, get_object_or_404
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
 
 from apps.admins.serializers.recipes import RecipesDetailSerializer, RecipesListCreateSerializer, \
-    IngredientsViewSetSerializer, PreparationStepsSerializer
+    IngredientsViewSetSerializer, PreparationStepsSerializer, RecipeImportSerializer
 from apps.products.models import Product
 from apps.recipes.models import Recipe, RecipesProduct, PreparationSteps
+from apps.shared.utils.bulk_import import BulkImporter, import_from_request
 from apps.shared.utils.custom_pagination import CustomPageNumberPagination
 from apps.shared.utils.custom_response import CustomResponse
 
@@ -34,6 +37,59 @@ class RecipeListCreateAPIView(ListCreateAPIView):
         headers = self.get_success_headers(serializer.data)
         return CustomResponse.success(data=serializer.data, status_code=status.HTTP_201_CREATED, headers=headers)
 
+class RecipeImporter(BulkImporter):
+    """
+    Imports recipes together with their ingredients and steps: product ids of a batch are
+    resolved with one query, and recipes, ingredients and steps get one bulk insert each.
+    """
+    chunk_size = 500
+    nested_fields = ('ingredients', 'steps')
+
+    def check_chunk(self, rows):
+        product_ids = {item['product_id'] for _, attrs, _ in rows for item in attrs['ingredients']}
+        existing = set(Product.objects.filter(id__in=product_ids).values_list('id', flat=True))
+
+        checked = []
+        for line_no, attrs, media in rows:
+            missing = sorted({item['product_id'] for item in attrs['ingredients']} - existing)
+            if missing:
+                self.add_error(line_no, {'ingredients': [f'Products not found: {missing}']})
+            else:
+                checked.append((line_no, attrs, media))
+        return checked
+
+    def build_instance(self, attrs):
+        return Recipe(**{key: value for key, value in attrs.items() if key not in self.nested_fields})
+
+    def after_insert(self, instances, attrs_list):
+        RecipesProduct.objects.bulk_create([
+            RecipesProduct(recipe=recipe, **item)
+            for recipe, attrs in zip(instances, attrs_list) for item in attrs['ingredients']
+        ])
+        PreparationSteps.objects.bulk_create([
+            PreparationSteps(recipe=recipe, **step)
+            for recipe, attrs in zip(instances, attrs_list) for step in attrs.get('steps', [])
+        ])
+
+    def result_for(self, line_no, instance, attrs):
+        return {
+            'line': line_no,
+            'id': instance.pk,
+            'ingredients': len(attrs['ingredients']),
+            'steps': len(attrs.get('steps', [])),
+        }
+
+
+class RecipeImportAPIView(APIView):
+    """Import recipes with nested ingredients and steps from a JSON array or NDJSON file"""
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, *args, **kwargs):
+        report = import_from_request(request, RecipeImportSerializer, RecipeImporter, formats=('json', 'ndjson'))
+        return CustomResponse.success(data=report, status_code=status.HTTP_200_OK)
+
+
 class RecipeRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
     queryset = Recipe.objects.all()
     serializer_class = RecipesDetailSerializer
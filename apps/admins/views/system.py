@@ -0,0 +1,14 @@
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+
+from apps.shared.utils.custom_response import CustomResponse
+from apps.shared.utils.db_connections import connection_stats
+
+
+class DatabaseConnectionsAPIView(APIView):
+    """Connection and pool metrics of the worker serving the request"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return CustomResponse.success(data=connection_stats(), status_code=status.HTTP_200_OK)
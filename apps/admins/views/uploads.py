@@ -0,0 +1,93 @@
+import os
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework import status
+from rest_framework.generics import CreateAPIView, get_object_or_404
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+
+from ..serializers.uploads import UploadSessionSerializer
+from ...shared.exceptions.custom_exceptions import CustomException
+from ...shared.models import UploadSession
+from ...shared.utils.custom_response import CustomResponse
+from ...shared.utils.uploads import append_chunk, complete_upload, part_path
+
+
+class UploadSessionCreateAPIView(CreateAPIView):
+    """
+    Start a resumable upload: declare the file name, media type and total size,
+    then PATCH the bytes to ``uploads/<upload_id>/`` in chunks.
+    """
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsAdminUser]
+
+    def perform_create(self, serializer):
+        serializer.save(uploaded_by=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return CustomResponse.success(data=serializer.data, status_code=status.HTTP_201_CREATED)
+
+
+class UploadSessionAPIView(APIView):
+    """
+    GET: current offset to resume from.
+    PATCH: append the raw request body at the ``Upload-Offset`` header; the body is read
+    from the socket in small pieces, so a chunk is never held in memory. The request
+    that completes the file creates the Media row.
+    DELETE: cancel the upload.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, upload_id):
+        session = get_object_or_404(UploadSession, uuid=upload_id)
+        return CustomResponse.success(data=UploadSessionSerializer(session).data, status_code=status.HTTP_200_OK)
+
+    def patch(self, request, upload_id):
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = int(request.headers.get('Content-Length', ''))
+        except ValueError:
+            raise CustomException(message_key='VALIDATION_ERROR', context={'headers': 'Upload-Offset, Content-Length'})
+        if length <= 0 or length > settings.UPLOAD_CHUNK_SIZE:
+            raise CustomException(message_key='VALIDATION_ERROR', context={'chunk_size': settings.UPLOAD_CHUNK_SIZE})
+
+        with transaction.atomic():
+            # Serializes chunks of the same upload sent by concurrent requests
+            session = get_object_or_404(UploadSession.objects.select_for_update(), uuid=upload_id)
+            if session.media_id or offset != session.offset:
+                return CustomResponse.error(
+                    message_key='UPLOAD_OFFSET_MISMATCH',
+                    request=request,
+                    context={'offset': session.offset},
+                    offset=session.offset
+                )
+
+            previous_offset = session.offset
+            append_chunk(session, request, length)
+            session.save(update_fields=['offset', 'mime_type', 'updated_at'])
+
+        if session.is_complete:
+            # Copied and hashed into the media storage after the row lock is released;
+            # meanwhile the session is complete without media, so no chunk is accepted
+            try:
+                complete_upload(session)
+            except Exception:
+                # The client can send the last chunk again
+                UploadSession.objects.filter(pk=session.pk, media__isnull=True).update(offset=previous_offset)
+                raise
+
+        return CustomResponse.success(data=UploadSessionSerializer(session).data, status_code=status.HTTP_200_OK)
+
+    def delete(self, request, upload_id):
+        session = get_object_or_404(UploadSession, uuid=upload_id, media__isnull=True)
+        if session.is_complete:
+            # Being moved into the media storage
+            raise CustomException(message_key='UPLOAD_OFFSET_MISMATCH', context={'offset': session.offset})
+        session.delete()
+        path = part_path(session)
+        transaction.on_commit(lambda: os.path.exists(path) and os.remove(path))
+        return CustomResponse.success(status_code=status.HTTP_204_NO_CONTENT)
@@ -5,10 +5,13 @@ from django.utils import timezone
 from rest_framework import status
 from rest_framework.generics import ListAPIView, get_object_or_404, RetrieveAPIView, RetrieveDestroyAPIView
 from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
 
-from apps.admins.serializers.users import UsersListSerializer, UserDetailSerializer, UserStatisticsSerializer
+from apps.admins.serializers.users import UsersListSerializer, UserDetailSerializer, UserStatisticsSerializer, \
+    DeviceActivityQuerySerializer
 from apps.shared.utils.custom_pagination import CustomPageNumberPagination
 from apps.shared.utils.custom_response import CustomResponse
+from apps.users.models.device import DeviceActivityRollup
 from apps.users.models.device import Device
 
 User = get_user_model()
@@ -95,4 +98,47 @@ class UserStatisticsAPIView(ListAPIView):
                 "results": serializer.data
             },
             status_code=status.HTTP_200_OK
-        )
\ No newline at end of file
+        )
+
+
+class DeviceActivityStatisticsAPIView(APIView):
+    """
+    DAU/WAU/MAU per day, read from the pre-aggregated rollup table: the rows
+    grouped by exactly the requested and filtered dimensions, so no distinct
+    counts are added up.
+
+    Query params: date_from, date_to (default: last 30 days), device_type,
+    app_version, language filters and group_by=device_type,app_version,language.
+    """
+    permission_classes = [IsAdminUser]
+    DEFAULT_PERIOD_DAYS = 30
+
+    def get(self, request, *args, **kwargs):
+        serializer = DeviceActivityQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        date_to = params.get('date_to') or timezone.localdate()
+        date_from = params.get('date_from') or date_to - timedelta(days=self.DEFAULT_PERIOD_DAYS - 1)
+
+        group_by = params['group_by']
+        queryset = DeviceActivityRollup.objects.filter(day__gte=date_from, day__lte=date_to)
+        for dimension in DeviceActivityRollup.objects.DIMENSIONS:
+            if params.get(dimension):
+                queryset = queryset.filter(**{dimension: params[dimension]})
+            elif dimension in group_by:
+                queryset = queryset.exclude(**{dimension: DeviceActivityRollup.objects.ALL})
+            else:
+                queryset = queryset.filter(**{dimension: DeviceActivityRollup.objects.ALL})
+
+        rows = queryset.values('day', *group_by, 'dau', 'wau', 'mau').order_by('day', *group_by)
+
+        return CustomResponse.success(
+            data={
+                'date_from': date_from,
+                'date_to': date_to,
+                'group_by': group_by,
+                'results': list(rows),
+            },
+            status_code=status.HTTP_200_OK
+        )
@@ -77,7 +77,7 @@ class CartProductCreateSerializer(serializers.ModelSerializer):
         fields = ['id', 'product_images', 'product_title', 'quantity', 'measurement', 'product']
 
     def get_product_images(self, obj):
-        return [m.file.url for m in obj.product.media_files.all()]
+        return [m.variant_url() for m in obj.product.media_files.all()]
 
     def get_product_title(self, obj):
         return obj.product.title
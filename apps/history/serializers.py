@@ -10,6 +10,9 @@ class HistoryTranslationMixin:
 
 
 class HistoryListSerializer(HistoryTranslationMixin, TranslatedFieldsReadMixin, serializers.ModelSerializer):
+    # The list doesn't render long_description, so it isn't loaded either
+    translatable_fields = ['title', 'short_description', 'images']
+
     class Meta:
        model = History
        fields = ['title', 'short_description',
@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from django.utils import timezone, translation
 from rest_framework.test import APITestCase, APIClient
@@ -10,6 +12,7 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 
 from apps.history.models import History
 from apps.history.serializers import HistoryListSerializer, HistoryRetrieveSerializer
+from apps.users.models.device import AppVersion, Device, DeviceType
 
 User = get_user_model()
 
@@ -129,6 +132,27 @@ class HistoryListAPIViewTestCase(APITestCase):
 
     # Boshqa testlar avvalgidek, rus tiliga oid barcha tekshiruvlar olib tashlandi
 
+    def test_list_loads_only_rendered_columns(self):
+        """Ro'yxat faqat chiqariladigan ustunlarni va so'ralgan tilni yuklashini tekshirish"""
+        app_version = AppVersion.objects.create(version='1.0.0', is_active=True, device_type=DeviceType.ANDROID)
+        device = Device.objects.create(
+            device_model='Pixel 8', operation_version='Android 14', device_type=DeviceType.ANDROID,
+            device_id='history_device_001', ip_address='192.168.1.1', app_version=app_version
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'lang': 'en'}, HTTP_TOKEN=str(device.device_token))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        titles = {item['title'] for item in response.data['results']}
+        self.assertEqual(titles, {'History 1 EN', 'History 2 EN'})
+        self.assertNotIn('long_description', response.data['results'][0])
+
+        select = next(query['sql'] for query in queries.captured_queries
+                      if 'FROM "history_history"' in query['sql'] and 'COUNT' not in query['sql'])
+        self.assertNotIn('long_description', select)
+        self.assertNotIn('title_uz', select)
+        self.assertIn('title_en', select)
+
 
 class HistoryRetrieveAPIViewTestCase(APITestCase):
 
@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from apps.notifications.models import PushCampaign
+
+
+@admin.register(PushCampaign)
+class PushCampaignAdmin(admin.ModelAdmin):
+    list_display = ('id', 'title', 'status', 'sent_count', 'failed_count', 'invalid_count', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    search_fields = ('title',)
+    raw_id_fields = ('history',)
+    # Progress is written by the fan-out only
+    readonly_fields = (
+        'status', 'last_device_id', 'sent_count', 'failed_count', 'invalid_count', 'error', 'started_at', 'finished_at'
+    )
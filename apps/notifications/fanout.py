@@ -0,0 +1,131 @@
+"""
+Push campaign fan-out.
+
+Recipients are streamed in primary-key order through a server-side cursor and
+cut into transport-sized batches, which a bounded pool of worker threads sends.
+At most ``max_in_flight`` batches exist at any time, so memory stays flat no
+matter how many devices the segment has.
+
+Only the calling thread touches the database. It collects results in submission
+order and checkpoints the campaign after each batch, so an interrupted campaign
+resumes right after the last device whose batch finished.
+"""
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db.models import F
+from django.utils import timezone
+
+from apps.notifications.models import CampaignStatus, PushCampaign
+from apps.notifications.transports import PushMessage, get_transport
+from apps.users.models.device import Device
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 8
+DEFAULT_CHUNK_SIZE = 2000
+
+
+class CampaignFanOut:
+    """Sends one campaign to its segment; call ``run()``"""
+
+    def __init__(self, campaign, transport=None, workers=DEFAULT_WORKERS, batch_size=None,
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+        self.campaign = campaign
+        self.transport = transport or get_transport()
+        self.workers = workers
+        self.batch_size = min(batch_size or self.transport.max_batch_size, self.transport.max_batch_size)
+        self.chunk_size = chunk_size
+        self.max_in_flight = workers * 2
+
+    def claim(self, force=False):
+        """Mark the campaign RUNNING unless another process already does; returns success"""
+        statuses = list(PushCampaign.RESUMABLE_STATUSES)
+        if force:
+            statuses.append(CampaignStatus.RUNNING)
+        now = timezone.now()
+        claimed = PushCampaign.objects.filter(pk=self.campaign.pk, status__in=statuses).update(
+            status=CampaignStatus.RUNNING, error='', updated_at=now
+        )
+        if claimed:
+            self.campaign.refresh_from_db()
+            if self.campaign.started_at is None:
+                self.campaign.started_at = now
+                self.campaign.save(update_fields=['started_at'])
+        return bool(claimed)
+
+    def run(self, force=False):
+        """
+        Send the campaign, resuming from its checkpoint.
+
+        Returns:
+            The campaign with its final progress, or None when it could not be claimed
+        """
+        if not self.claim(force=force):
+            return None
+
+        campaign = self.campaign
+        message = PushMessage(title=campaign.title, body=campaign.body, data=campaign.data)
+        pending = deque()
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='push-fanout')
+        try:
+            for batch in self._batches():
+                tokens = [token for _, token in batch]
+                pending.append((pool.submit(self.transport.send, message, tokens), batch[-1][0]))
+                while len(pending) >= self.max_in_flight:
+                    self._complete(*pending.popleft())
+            while pending:
+                self._complete(*pending.popleft())
+        except KeyboardInterrupt:
+            self._finish(CampaignStatus.PAUSED)
+            raise
+        except Exception as exc:
+            logger.exception(f"push campaign {campaign.pk} failed after device {campaign.last_device_id}")
+            self._finish(CampaignStatus.FAILED, error=repr(exc))
+            raise
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        self._finish(CampaignStatus.COMPLETED)
+        return campaign
+
+    def _batches(self):
+        queryset = (
+            self.campaign.recipients()
+            .filter(pk__gt=self.campaign.last_device_id)
+            .order_by('pk')
+            .values_list('pk', 'firebase_token')
+        )
+        batch = []
+        for row in queryset.iterator(chunk_size=self.chunk_size):
+            batch.append(row)
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _complete(self, future, last_device_id):
+        result = future.result()
+        if result.invalid_tokens:
+            # Tokens the provider rejected for good; stop sending to them
+            Device.objects.filter(firebase_token__in=result.invalid_tokens).update(firebase_token=None)
+
+        PushCampaign.objects.filter(pk=self.campaign.pk).update(
+            last_device_id=last_device_id,
+            sent_count=F('sent_count') + result.sent,
+            failed_count=F('failed_count') + result.failed,
+            invalid_count=F('invalid_count') + len(result.invalid_tokens),
+            updated_at=timezone.now(),
+        )
+        self.campaign.last_device_id = last_device_id
+
+    def _finish(self, status, error=''):
+        campaign = self.campaign
+        campaign.refresh_from_db()
+        campaign.status = status
+        campaign.error = error
+        if status == CampaignStatus.COMPLETED:
+            campaign.finished_at = timezone.now()
+        campaign.save(update_fields=['status', 'error', 'finished_at', 'updated_at'])
@@ -0,0 +1,55 @@
+"""
+Django command to send push campaigns.
+
+Without arguments every pending, paused or failed campaign is sent (resumed
+from its checkpoint), so the command can be scheduled as a drain job.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.history.models import History
+from apps.notifications.fanout import CampaignFanOut, DEFAULT_CHUNK_SIZE, DEFAULT_WORKERS
+from apps.notifications.models import PushCampaign
+
+
+class Command(BaseCommand):
+    """Django command to fan out push campaigns."""
+
+    help = 'Send (or resume) push notification campaigns.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('campaign_ids', nargs='*', type=int, help='Campaigns to send, default all resumable')
+        parser.add_argument('--history', type=int, help='Create and send broadcast campaigns for this History story')
+        parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Concurrent transport batches')
+        parser.add_argument('--batch-size', type=int, help='Devices per transport call')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows fetched per cursor read')
+        parser.add_argument('--force', action='store_true', help='Also take over campaigns marked RUNNING')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if options['history']:
+            history = History.objects.filter(pk=options['history']).first()
+            if history is None:
+                raise CommandError(f"History {options['history']} does not exist")
+            campaigns = PushCampaign.objects.create_for_history(history)
+        elif options['campaign_ids']:
+            campaigns = PushCampaign.objects.filter(pk__in=options['campaign_ids']).order_by('pk')
+        else:
+            campaigns = PushCampaign.objects.resumable().order_by('pk')
+
+        for campaign in campaigns:
+            fan_out = CampaignFanOut(
+                campaign,
+                workers=options['workers'],
+                batch_size=options['batch_size'],
+                chunk_size=options['chunk_size'],
+            )
+            result = fan_out.run(force=options['force'])
+            if result is None:
+                self.stdout.write(self.style.WARNING(f'Campaign {campaign.pk}: skipped ({campaign.status})'))
+                continue
+            self.stdout.write(
+                f'Campaign {result.pk}: {result.sent_count} sent, {result.failed_count} failed, '
+                f'{result.invalid_count} invalid tokens'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Push campaigns sent!'))
@@ -0,0 +1,40 @@
+from django.db import models
+
+from apps.shared.models import Language
+
+
+class PushCampaignManager(models.Manager):
+    """Custom manager for PushCampaign model"""
+
+    # History stories are translated to en/uz only; every device language maps to one of them
+    HISTORY_LANGUAGES = {
+        'en': [Language.EN, Language.RU],
+        'uz': [Language.UZ, Language.CRL],
+    }
+
+    def resumable(self):
+        """Campaigns that still have devices to send to and nobody is sending right now"""
+        return self.filter(status__in=self.model.RESUMABLE_STATUSES)
+
+    def create_for_history(self, history, **segment):
+        """
+        Create broadcast campaigns for a History story, one per translation.
+
+        Args:
+            history: History instance
+            **segment: Optional device_types / app_versions restrictions
+
+        Returns:
+            List of created campaigns
+        """
+        campaigns = []
+        for code, languages in self.HISTORY_LANGUAGES.items():
+            campaigns.append(self.create(
+                history=history,
+                title=getattr(history, f'title_{code}', None) or history.title,
+                body=getattr(history, f'short_description_{code}', None) or history.short_description,
+                data={'type': 'history', 'history_id': history.pk},
+                languages=list(languages),
+                **segment
+            ))
+        return campaigns
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:39
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('history', '0002_remove_history_image_alter_history_button_link_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PushCampaign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('title', models.CharField(max_length=255)),
+                ('body', models.TextField()),
+                ('data', models.JSONField(blank=True, default=dict, help_text='Custom payload delivered with the notification')),
+                ('languages', models.JSONField(blank=True, default=list)),
+                ('device_types', models.JSONField(blank=True, default=list)),
+                ('app_versions', models.JSONField(blank=True, default=list)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('PAUSED', 'Paused'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed')], db_index=True, default='PENDING', max_length=9)),
+                ('last_device_id', models.BigIntegerField(default=0)),
+                ('sent_count', models.PositiveIntegerField(default=0)),
+                ('failed_count', models.PositiveIntegerField(default=0)),
+                ('invalid_count', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('history', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='push_campaigns', to='history.history')),
+            ],
+            options={
+                'verbose_name': 'push campaign',
+                'verbose_name_plural': 'push campaigns',
+                'db_table': 'push_campaigns',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,78 @@
+from django.db import models
+
+from apps.notifications.managers import PushCampaignManager
+from apps.shared.models import BaseModel
+from apps.users.models.device import Device
+
+
+class CampaignStatus(models.TextChoices):
+    PENDING = "PENDING", "Pending"
+    RUNNING = "RUNNING", "Running"
+    PAUSED = "PAUSED", "Paused"
+    COMPLETED = "COMPLETED", "Completed"
+    FAILED = "FAILED", "Failed"
+
+
+class PushCampaign(BaseModel):
+    """
+    One push notification sent to a segment of devices.
+
+    Devices are handled in primary-key order and ``last_device_id`` is the
+    checkpoint: every device up to it has been handled, so an interrupted
+    campaign resumes right after it.
+    """
+    RESUMABLE_STATUSES = (CampaignStatus.PENDING, CampaignStatus.PAUSED, CampaignStatus.FAILED)
+
+    # Message
+    title = models.CharField(max_length=255)
+    body = models.TextField()
+    data = models.JSONField(default=dict, blank=True, help_text="Custom payload delivered with the notification")
+    history = models.ForeignKey(
+        'history.History',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='push_campaigns'
+    )
+
+    # Segment (an empty list means no restriction)
+    languages = models.JSONField(default=list, blank=True)
+    device_types = models.JSONField(default=list, blank=True)
+    app_versions = models.JSONField(default=list, blank=True)
+
+    # Progress
+    status = models.CharField(
+        max_length=9,
+        choices=CampaignStatus.choices,
+        default=CampaignStatus.PENDING,
+        db_index=True
+    )
+    last_device_id = models.BigIntegerField(default=0)
+    sent_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    invalid_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    objects = PushCampaignManager()
+
+    class Meta:
+        db_table = 'push_campaigns'
+        verbose_name = 'push campaign'
+        verbose_name_plural = 'push campaigns'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.title} [{self.status}]"
+
+    def recipients(self):
+        """Devices of the campaign segment that can receive a push"""
+        queryset = Device.objects.with_push_enabled().filter(firebase_token__isnull=False).exclude(firebase_token='')
+        if self.languages:
+            queryset = queryset.filter(language__in=self.languages)
+        if self.device_types:
+            queryset = queryset.filter(device_type__in=self.device_types)
+        if self.app_versions:
+            queryset = queryset.filter(app_version__version__in=self.app_versions)
+        return queryset
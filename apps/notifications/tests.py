@@ -0,0 +1,156 @@
+from datetime import timedelta
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.history.models import History
+from apps.notifications.fanout import CampaignFanOut
+from apps.notifications.models import CampaignStatus, PushCampaign
+from apps.notifications.transports import FakeTransport, get_transport
+from apps.shared.models import Language
+from apps.users.models.device import AppVersion, Device, DeviceType
+
+
+class FailingTransport(FakeTransport):
+    """Transport that breaks after ``fail_after`` batches"""
+
+    def __init__(self, fail_after, **kwargs):
+        super().__init__(**kwargs)
+        self.fail_after = fail_after
+
+    def send(self, message, tokens):
+        if len(self.batches) >= self.fail_after:
+            raise ConnectionError('provider unavailable')
+        return super().send(message, tokens)
+
+
+class PushCampaignFanOutTestCase(TestCase):
+    """Test cases for push campaign fan-out"""
+
+    def setUp(self):
+        self.v1 = AppVersion.objects.create(version='1.0.0', is_active=True, device_type=DeviceType.ALL)
+        self.v2 = AppVersion.objects.create(version='2.0.0', is_active=True, device_type=DeviceType.ALL)
+        self.devices = []
+        for i in range(10):
+            self.devices.append(Device.objects.create(
+                device_model='Samsung Galaxy S21',
+                operation_version='Android 12',
+                device_type=DeviceType.ANDROID if i % 2 else DeviceType.IOS,
+                device_id=f'push_device_{i}',
+                ip_address='192.168.1.1',
+                app_version=self.v1 if i < 5 else self.v2,
+                language=Language.UZ if i < 3 else Language.EN,
+                firebase_token=f'fcm_{i}',
+            ))
+        # Not eligible: push disabled / no token
+        Device.objects.filter(pk=self.devices[9].pk).update(is_push_notification=False)
+        Device.objects.filter(pk=self.devices[8].pk).update(firebase_token=None)
+
+    def test_sends_to_all_eligible_devices_in_batches(self):
+        """Barcha mos qurilmalarga batch'lar bilan yuboriladi"""
+        campaign = PushCampaign.objects.create(title='Yangilik', body='Matn')
+        transport = FakeTransport(max_batch_size=3)
+
+        CampaignFanOut(campaign, transport=transport, workers=2, chunk_size=2).run()
+
+        self.assertEqual(sorted(transport.tokens), sorted(f'fcm_{i}' for i in range(8)))
+        self.assertTrue(all(len(tokens) <= 3 for _, tokens in transport.batches))
+        campaign.refresh_from_db()
+        self.assertEqual(campaign.status, CampaignStatus.COMPLETED)
+        self.assertEqual(campaign.sent_count, 8)
+        self.assertEqual(campaign.last_device_id, self.devices[7].pk)
+        self.assertIsNotNone(campaign.finished_at)
+
+    def test_segmentation(self):
+        """Til, qurilma turi va ilova versiyasi bo'yicha segment"""
+        campaign = PushCampaign.objects.create(
+            title='Segment', body='Matn',
+            languages=[Language.EN], device_types=[DeviceType.ANDROID], app_versions=['1.0.0']
+        )
+        transport = FakeTransport()
+
+        CampaignFanOut(campaign, transport=transport).run()
+
+        # EN (3..), ANDROID (odd), version 1.0.0 (<5)
+        self.assertEqual(sorted(transport.tokens), ['fcm_3'])
+
+    def test_invalid_tokens_are_released(self):
+        """Provayder rad etgan tokenlar o'chiriladi"""
+        campaign = PushCampaign.objects.create(title='Yangilik', body='Matn')
+        transport = FakeTransport(invalid_tokens=['fcm_1', 'fcm_4'])
+
+        CampaignFanOut(campaign, transport=transport).run()
+
+        campaign.refresh_from_db()
+        self.assertEqual(campaign.sent_count, 6)
+        self.assertEqual(campaign.invalid_count, 2)
+        self.assertFalse(Device.objects.filter(firebase_token__in=['fcm_1', 'fcm_4']).exists())
+
+    def test_resume_after_failure(self):
+        """Xatodan keyin kampaniya to'xtagan joyidan davom etadi"""
+        campaign = PushCampaign.objects.create(title='Yangilik', body='Matn')
+
+        with self.assertRaises(ConnectionError):
+            CampaignFanOut(campaign, transport=FailingTransport(fail_after=1, max_batch_size=3), workers=1).run()
+
+        campaign.refresh_from_db()
+        self.assertEqual(campaign.status, CampaignStatus.FAILED)
+        self.assertEqual(campaign.sent_count, 3)
+        self.assertEqual(campaign.last_device_id, self.devices[2].pk)
+
+        transport = FakeTransport(max_batch_size=3)
+        CampaignFanOut(campaign, transport=transport, workers=1).run()
+
+        self.assertEqual(transport.tokens, [f'fcm_{i}' for i in range(3, 8)])
+        campaign.refresh_from_db()
+        self.assertEqual(campaign.status, CampaignStatus.COMPLETED)
+        self.assertEqual(campaign.sent_count, 8)
+
+    def test_running_campaign_is_not_claimed_twice(self):
+        """Boshqa jarayon yuborayotgan kampaniya qayta olinmaydi"""
+        campaign = PushCampaign.objects.create(title='Yangilik', body='Matn', status=CampaignStatus.RUNNING)
+        transport = FakeTransport()
+
+        self.assertIsNone(CampaignFanOut(campaign, transport=transport).run())
+        self.assertEqual(transport.batches, [])
+
+        CampaignFanOut(campaign, transport=transport).run(force=True)
+        self.assertEqual(len(transport.tokens), 8)
+
+    def test_create_for_history(self):
+        """History uchun har bir tarjimaga alohida kampaniya"""
+        history = History.objects.create(
+            title_en='News', title_uz='Yangilik',
+            short_description_en='Short', short_description_uz='Qisqa',
+            long_description='Long',
+            start_date=timezone.now(), end_date=timezone.now() + timedelta(days=1),
+            button_text='Open',
+        )
+
+        campaigns = PushCampaign.objects.create_for_history(history)
+
+        by_title = {campaign.title: campaign for campaign in campaigns}
+        self.assertEqual(set(by_title), {'News', 'Yangilik'})
+        self.assertEqual(sorted(by_title['Yangilik'].languages), sorted([Language.UZ, Language.CRL]))
+        self.assertEqual(by_title['News'].data, {'type': 'history', 'history_id': history.pk})
+
+        transport = FakeTransport()
+        CampaignFanOut(by_title['Yangilik'], transport=transport).run()
+        self.assertEqual(sorted(transport.tokens), ['fcm_0', 'fcm_1', 'fcm_2'])
+
+    @override_settings(PUSH_TRANSPORT='apps.notifications.transports.FakeTransport')
+    def test_fake_transport_only_with_debug(self):
+        """FakeTransport DEBUG'siz ishlatilmaydi, kampaniya yuborilmay qoladi"""
+        campaign = PushCampaign.objects.create(title='Salom', body='Yangi mahsulotlar')
+
+        with override_settings(DEBUG=False), self.assertRaises(ImproperlyConfigured):
+            CampaignFanOut(campaign)
+        campaign.refresh_from_db()
+        self.assertEqual(campaign.status, CampaignStatus.PENDING)
+
+        with override_settings(DEBUG=True):
+            self.assertIsInstance(get_transport(), FakeTransport)
+
+        with override_settings(PUSH_TRANSPORT=''), self.assertRaises(ImproperlyConfigured):
+            get_transport()
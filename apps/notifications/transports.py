@@ -0,0 +1,122 @@
+"""
+Push transports used by the campaign fan-out.
+
+A transport sends one message to a batch of device tokens and reports which
+tokens the provider no longer accepts. ``settings.PUSH_TRANSPORT`` selects the
+implementation; transports are called from worker threads and must not touch
+the database.
+"""
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PushMessage:
+    title: str
+    body: str
+    data: Dict = field(default_factory=dict)
+
+
+@dataclass
+class SendResult:
+    sent: int = 0
+    failed: int = 0
+    invalid_tokens: List[str] = field(default_factory=list)
+
+
+class BaseTransport:
+    """Interface every push transport implements"""
+
+    max_batch_size = 500
+
+    def send(self, message: PushMessage, tokens: List[str]) -> SendResult:
+        raise NotImplementedError
+
+
+class FakeTransport(BaseTransport):
+    """
+    Keeps sent batches in memory instead of delivering them.
+    Used by tests and local development.
+    """
+
+    def __init__(self, invalid_tokens=(), max_batch_size=None):
+        self.invalid_tokens = set(invalid_tokens)
+        if max_batch_size:
+            self.max_batch_size = max_batch_size
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def send(self, message, tokens):
+        invalid = [token for token in tokens if token in self.invalid_tokens]
+        with self._lock:
+            self.batches.append((message, list(tokens)))
+        logger.info(f"push (fake): '{message.title}' to {len(tokens)} devices")
+        return SendResult(sent=len(tokens) - len(invalid), failed=len(invalid), invalid_tokens=invalid)
+
+    @property
+    def tokens(self):
+        return [token for _, tokens in self.batches for token in tokens]
+
+
+class FCMTransport(BaseTransport):
+    """Firebase Cloud Messaging through the optional firebase-admin package"""
+
+    APP_NAME = 'push-fanout'
+
+    def __init__(self):
+        try:
+            import firebase_admin
+            from firebase_admin import credentials, messaging
+        except ImportError as exc:
+            raise ImproperlyConfigured('FCMTransport requires the firebase-admin package') from exc
+
+        if not settings.FCM_CREDENTIALS_FILE:
+            raise ImproperlyConfigured('FCMTransport requires FCM_CREDENTIALS_FILE')
+
+        self.messaging = messaging
+        try:
+            self.app = firebase_admin.get_app(self.APP_NAME)
+        except ValueError:
+            self.app = firebase_admin.initialize_app(
+                credentials.Certificate(settings.FCM_CREDENTIALS_FILE), name=self.APP_NAME
+            )
+
+    def send(self, message, tokens):
+        messaging = self.messaging
+        response = messaging.send_each_for_multicast(
+            messaging.MulticastMessage(
+                tokens=tokens,
+                notification=messaging.Notification(title=message.title, body=message.body),
+                data={key: str(value) for key, value in message.data.items()},
+            ),
+            app=self.app,
+        )
+        invalid = [
+            token for token, result in zip(tokens, response.responses)
+            if not result.success
+            and isinstance(result.exception, (messaging.UnregisteredError, messaging.SenderIdMismatchError))
+        ]
+        return SendResult(sent=response.success_count, failed=response.failure_count, invalid_tokens=invalid)
+
+
+def get_transport() -> BaseTransport:
+    """
+    Instantiate the transport configured in ``settings.PUSH_TRANSPORT``.
+
+    FakeTransport is refused outside DEBUG: campaigns would be marked completed
+    while nothing was delivered.
+    """
+    if not settings.PUSH_TRANSPORT:
+        raise ImproperlyConfigured('PUSH_TRANSPORT is not set')
+    transport_class = import_string(settings.PUSH_TRANSPORT)
+    if issubclass(transport_class, FakeTransport) and not settings.DEBUG:
+        raise ImproperlyConfigured(f'{settings.PUSH_TRANSPORT} does not deliver pushes, it is only allowed with DEBUG')
+    return transport_class()
@@ -1,4 +1,10 @@
+from decimal import Decimal
+
+from django.db.models import (
+    BooleanField, DecimalField, ExpressionWrapper, F, FloatField, OuterRef, Q, Subquery, Value
+)
 from django.db.models.aggregates import Avg
+from django.db.models.functions import Round
 from rest_framework import serializers
 
 from apps.products.models import Product, ProductRating
@@ -19,6 +25,24 @@ class ProductListSerializer(ProductTranslationMixin, TranslatedFieldsReadMixin,
     discount_price = serializers.SerializerMethodField()
     in_stock = serializers.SerializerMethodField()
 
+    # The list doesn't render description, so it isn't loaded either
+    translatable_fields = ['title', 'images']
+    # Columns read by the method fields, see apps.shared.utils.projection
+    source_fields = ['price', 'discount', 'quantity']
+    # The method fields in SQL, see apps.shared.utils.values_serializer
+    values_expressions = {
+        'discount_price': Round(
+            F('price') * (100 - F('discount')) / Value(Decimal('100.0')), 2,
+            output_field=DecimalField(max_digits=12, decimal_places=2)
+        ),
+        'avg_rating': Subquery(
+            ProductRating.objects.filter(product=OuterRef('pk')).order_by()
+            .values('product').annotate(avg_rating=Avg('rating')).values('avg_rating'),
+            output_field=FloatField()
+        ),
+        'in_stock': ExpressionWrapper(Q(quantity__gt=0), output_field=BooleanField()),
+    }
+
     class Meta:
         model = Product
         fields = ['id', 'title', 'price', 'discount_price',
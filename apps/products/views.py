@@ -7,27 +7,19 @@ from rest_framework.response import Response
 from apps.products.models import Product, ProductRating
 from apps.products.serializers import ProductListSerializer, ProductRetrieveSerializer, \
     ProductRatingCreateSerializer
+from apps.shared.mixins.projection_mixins import ProjectedQuerysetMixin, ValuesListMixin
+from apps.shared.mixins.throttle_mixins import ThrottleFirstMixin
 from apps.shared.permissions.mobile import IsMobileUser, IsAuthenticatedOrMobileUser
 from apps.shared.utils.custom_pagination import CustomPageNumberPagination
 from apps.shared.utils.custom_response import CustomResponse
 
 
-class ProductListAPIView(ListAPIView):
+class ProductListAPIView(ValuesListMixin, ProjectedQuerysetMixin, ListAPIView):
     queryset = Product.objects.filter(is_available=True)
     serializer_class = ProductListSerializer
     pagination_class = CustomPageNumberPagination
     permission_classes = [IsMobileUser | IsAuthenticated]
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-
-        serializer = self.get_serializer(queryset, many=True)
-        return CustomResponse.success(data=serializer.data, status_code=status.HTTP_200_OK)
-
 
 class ProductRetrieveAPIView(RetrieveAPIView):
     queryset = Product.objects.filter(is_available=True)
@@ -45,10 +37,11 @@ class ProductRetrieveAPIView(RetrieveAPIView):
         return CustomResponse.success(data=serializer.data, status_code=status.HTTP_200_OK)
 
 
-class ProductRatingCreateAPIView(CreateAPIView):
+class ProductRatingCreateAPIView(ThrottleFirstMixin, CreateAPIView):
     queryset = Product.objects.filter(is_available=True)
     serializer_class = ProductRatingCreateSerializer
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'rating'
 
     def get_object(self):
         return get_object_or_404(Product, pk=self.kwargs['pk'], is_available=True)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class QuestionnaireConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.questionnaires'
+
+    def ready(self):
+        import apps.questionnaires.signals
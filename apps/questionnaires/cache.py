@@ -0,0 +1,26 @@
+"""
+Cache of rendered questionnaire trees, one entry per questionnaire and language.
+
+Entries are dropped by signals whenever the questionnaire, one of its questions
+or one of its answers changes; the timeout only bounds memory use.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+TREE_CACHE_TIMEOUT = 60 * 60  # seconds
+
+
+def tree_cache_key(questionnaire_id, lang):
+    return f'questionnaires:tree:{questionnaire_id}:{lang}'
+
+
+def get_tree(questionnaire_id, lang):
+    return cache.get(tree_cache_key(questionnaire_id, lang))
+
+
+def set_tree(questionnaire_id, lang, data, timeout=TREE_CACHE_TIMEOUT):
+    cache.set(tree_cache_key(questionnaire_id, lang), data, timeout=timeout)
+
+
+def invalidate_tree(questionnaire_id):
+    cache.delete_many([tree_cache_key(questionnaire_id, code) for code, _ in settings.LANGUAGES])
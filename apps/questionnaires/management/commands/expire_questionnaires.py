@@ -0,0 +1,20 @@
+"""
+Django command to expire questionnaires past their expires_at.
+
+Meant to be scheduled (e.g. every minute); each run is a single bulk UPDATE.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.questionnaires.models import Questionnaire
+
+
+class Command(BaseCommand):
+    """Django command to expire overdue questionnaires."""
+
+    help = 'Mark published questionnaires past their expiry date as expired.'
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        expired_ids = Questionnaire.objects.expire_overdue()
+        self.stdout.write(f'{len(expired_ids)} questionnaires expired')
+        self.stdout.write(self.style.SUCCESS('Questionnaires expired!'))
@@ -0,0 +1,144 @@
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db import models, transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+class QuestionnaireQuerySet(models.QuerySet):
+
+    def with_questions_count(self):
+        """Annotate questions_count in the same grouped query"""
+        return self.annotate(questions_count=Count('questions'))
+
+    def published(self):
+        """Questionnaires clients can answer, including overdue ones the expiry job hasn't flipped yet"""
+        from apps.questionnaires.models import QuestionnaireStatus
+
+        return self.filter(status=QuestionnaireStatus.PUBLISHED).filter(
+            Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now())
+        )
+
+
+class QuestionnaireManager(models.Manager.from_queryset(QuestionnaireQuerySet)):
+    """Custom manager for Questionnaire model"""
+
+    def expire_overdue(self, now=None):
+        """
+        Flip every PUBLISHED questionnaire past its expires_at to EXPIRED in one UPDATE.
+
+        Returns:
+            List of expired questionnaire ids
+        """
+        from apps.questionnaires.cache import invalidate_tree
+        from apps.questionnaires.models import QuestionnaireStatus
+
+        now = now or timezone.now()
+        with transaction.atomic(using=self.db):
+            overdue = self.select_for_update().filter(status=QuestionnaireStatus.PUBLISHED, expires_at__lte=now)
+            expired_ids = list(overdue.values_list('pk', flat=True))
+            self.filter(pk__in=expired_ids).update(status=QuestionnaireStatus.EXPIRED, updated_at=now)
+
+        # Bulk update skips the model signals, so drop the cached trees here
+        for questionnaire_id in expired_ids:
+            invalidate_tree(questionnaire_id)
+        return expired_ids
+
+
+class VoteQuerySet(models.QuerySet):
+
+    def delete(self):
+        """Delete the votes and recount the tallies they were part of"""
+        with transaction.atomic(using=self.db):
+            answer_ids, question_ids = set(), set()
+            for answer_id, question_id in self.order_by().values_list('answer_id', 'question_id').distinct():
+                answer_ids.add(answer_id)
+                question_ids.add(question_id)
+            deleted = super().delete()
+            self.model.objects.db_manager(self.db).recount_tallies(answer_ids, question_ids)
+        return deleted
+
+
+class VoteManager(models.Manager.from_queryset(VoteQuerySet)):
+    """Custom manager for Vote model"""
+
+    def cast(self, user, choices):
+        """
+        Record a user's votes with a single INSERT ... ON CONFLICT (user, question) DO UPDATE.
+
+        The answer and question tallies are moved in the same transaction with one
+        UPDATE each, however many votes the batch holds.
+
+        Args:
+            user: Voting user
+            choices: Dict of {question_id: answer_id}
+
+        Returns:
+            List of Vote instances, one per question
+        """
+        from apps.questionnaires.models import Answer, Question
+
+        with transaction.atomic(using=self.db):
+            # Serializes concurrent batches of the same user so tally deltas stay exact
+            list(get_user_model().objects.select_for_update().filter(pk=user.pk).values_list('pk', flat=True))
+
+            previous = dict(
+                self.filter(user=user, question_id__in=choices).values_list('question_id', 'answer_id')
+            )
+            votes = [
+                self.model(user=user, question_id=question_id, answer_id=answer_id)
+                for question_id, answer_id in choices.items()
+            ]
+            self.bulk_create(
+                votes,
+                update_conflicts=True,
+                unique_fields=['user', 'question'],
+                update_fields=['answer'],
+            )
+
+            answer_deltas = Counter()
+            question_deltas = Counter()
+            for question_id, answer_id in choices.items():
+                old_answer_id = previous.get(question_id)
+                if old_answer_id == answer_id:
+                    continue
+                answer_deltas[answer_id] += 1
+                if old_answer_id is None:
+                    question_deltas[question_id] += 1
+                else:
+                    answer_deltas[old_answer_id] -= 1
+
+            self._apply_tally_deltas(Answer, answer_deltas)
+            self._apply_tally_deltas(Question, question_deltas)
+
+        return votes
+
+    @staticmethod
+    def _apply_tally_deltas(model, deltas):
+        deltas = {pk: delta for pk, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        model.objects.filter(pk__in=deltas).update(votes_count=F('votes_count') + Case(
+            *[When(pk=pk, then=Value(delta)) for pk, delta in deltas.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        ))
+
+    def recount_tallies(self, answer_ids=(), question_ids=()):
+        """
+        Set votes_count of the given answers and questions from their votes, one UPDATE
+        per table. Used after deletes, where there are no deltas to apply.
+        """
+        from apps.questionnaires.models import Answer, Question
+
+        for model, field, ids in ((Answer, 'answer', answer_ids), (Question, 'question', question_ids)):
+            if not ids:
+                continue
+            counts = self.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(
+                count=Count('pk')
+            ).values('count')
+            model.objects.using(self.db).filter(pk__in=ids).update(
+                votes_count=Coalesce(Subquery(counts), Value(0))
+            )
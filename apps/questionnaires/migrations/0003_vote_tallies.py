@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:41
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_existing_votes(apps, schema_editor):
+    Answer = apps.get_model('questionnaires', 'Answer')
+    Question = apps.get_model('questionnaires', 'Question')
+    Vote = apps.get_model('questionnaires', 'Vote')
+
+    answer_votes = Vote.objects.filter(answer=OuterRef('pk')).values('answer').annotate(total=Count('pk')).values('total')
+    Answer.objects.update(votes_count=Coalesce(Subquery(answer_votes), Value(0)))
+
+    question_votes = (
+        Vote.objects.filter(answer__question=OuterRef('pk'))
+        .values('answer__question').annotate(total=Count('pk')).values('total')
+    )
+    Question.objects.update(votes_count=Coalesce(Subquery(question_votes), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questionnaires', '0002_answer_title_en_answer_title_uz_question_title_en_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answer',
+            name='votes_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='votes_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_existing_votes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_vote_question(apps, schema_editor):
+    Answer = apps.get_model('questionnaires', 'Answer')
+    Question = apps.get_model('questionnaires', 'Question')
+    Vote = apps.get_model('questionnaires', 'Vote')
+
+    Vote.objects.update(question=Subquery(Answer.objects.filter(pk=OuterRef('answer')).values('question')[:1]))
+
+    # Keep only the latest vote of a user per question before the unique constraint is added
+    latest = Vote.objects.values('user', 'question').annotate(latest=Max('pk')).filter(
+        user=OuterRef('user'), question=OuterRef('question')
+    ).values('latest')
+    Vote.objects.exclude(pk=Subquery(latest)).delete()
+
+    answer_votes = Vote.objects.filter(answer=OuterRef('pk')).values('answer').annotate(total=Count('pk')).values('total')
+    Answer.objects.update(votes_count=Coalesce(Subquery(answer_votes), Value(0)))
+    question_votes = Vote.objects.filter(question=OuterRef('pk')).values('question').annotate(total=Count('pk')).values('total')
+    Question.objects.update(votes_count=Coalesce(Subquery(question_votes), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questionnaires', '0003_vote_tallies'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vote',
+            name='question',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='questionnaires.question'),
+        ),
+        migrations.RunPython(fill_vote_question, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questionnaires', '0005_vote_user_question_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='questionnaire',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='questionnaire',
+            index=models.Index(fields=['status', '-created_at'], name='questionnaire_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='questionnaire',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['expires_at'], name='questionnaire_expiry_idx'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from apps.questionnaires.managers import QuestionnaireManager, VoteManager
+
 
 User = get_user_model()
 
@@ -15,6 +17,9 @@ class Questionnaire(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(choices=QuestionnaireStatus.choices, max_length=32, default=QuestionnaireStatus.PUBLISHED)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    objects = QuestionnaireManager()
 
     def __str__(self):
         return self.title
@@ -22,15 +27,21 @@ class Questionnaire(models.Model):
     class Meta:
         verbose_name_plural = "Questionnaires"
         verbose_name = "Questionnaire"
-
-    @property
-    def questions_count(self):
-        return self.questions.count()
+        indexes = [
+            models.Index(fields=['status', '-created_at'], name='questionnaire_status_idx'),
+            models.Index(
+                fields=['expires_at'],
+                condition=models.Q(status=QuestionnaireStatus.PUBLISHED),
+                name='questionnaire_expiry_idx'
+            ),
+        ]
 
 
 class Question(models.Model):
     questionnaire = models.ForeignKey(Questionnaire, on_delete=models.CASCADE, related_name='questions')
     title = models.CharField(max_length=255)
+    # Number of votes given on the question, maintained by signals on Vote
+    votes_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.title
@@ -43,6 +54,8 @@ class Question(models.Model):
 class Answer(models.Model):
     question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='answers')
     title = models.CharField(max_length=255)
+    # Number of votes for the answer, maintained by signals on Vote
+    votes_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.question.title
@@ -53,13 +66,20 @@ class Answer(models.Model):
 
 
 class Vote(models.Model):
+    # Denormalized from answer so one vote per user and question is enforced by the database
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='votes')
     answer = models.ForeignKey(Answer, on_delete=models.CASCADE, related_name='votes')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='votes')
 
+    objects = VoteManager()
+
     def __str__(self):
         return self.answer.title
 
     class Meta:
         verbose_name_plural = "Votes"
         verbose_name = "Vote"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'question'], name='vote_user_question_unique'),
+        ]
 
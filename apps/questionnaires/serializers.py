@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework.pagination import PageNumberPagination
 
@@ -27,7 +28,8 @@ class BaseMixin:
 
 
 class QuestionnaireSerializer(BaseMixin, TranslatedFieldsWriteMixin, TranslatedFieldsReadMixin, serializers.ModelSerializer):
-    questions_count = serializers.IntegerField(source='questions.count', read_only=True)
+    # Annotated by QuestionnaireManager.with_questions_count(); a new questionnaire has none
+    questions_count = serializers.IntegerField(read_only=True, default=0)
 
     class Meta:
         model = Questionnaire
@@ -54,25 +56,71 @@ class QuestionListSerializer(BaseMixin, TranslatedFieldsWriteMixin, TranslatedFi
         fields = ['id', 'title', 'answers']
 
 
+class AnswerTreeSerializer(serializers.ModelSerializer):
+    """Answer in the active language (modeltranslation resolves ``title``)"""
+
+    class Meta:
+        model = Answer
+        fields = ['id', 'title']
+
+
+class QuestionTreeSerializer(serializers.ModelSerializer):
+    answers = AnswerTreeSerializer(many=True)
+
+    class Meta:
+        model = Question
+        fields = ['id', 'title', 'answers']
+
+
+class QuestionnaireTreeSerializer(serializers.ModelSerializer):
+    """Whole questionnaire with questions and answers; render inside translation.override()"""
+    questions = QuestionTreeSerializer(many=True)
+
+    class Meta:
+        model = Questionnaire
+        fields = ['id', 'title', 'status', 'questions']
+
+
 class VoteCreateSerializer(BaseMixin, TranslatedFieldsWriteMixin, TranslatedFieldsReadMixin, serializers.Serializer):
     answer_id = serializers.IntegerField()
 
-    def validate_answer_id(self, value):
-        try:
-            answer = Answer.objects.get(id=value)
-        except Answer.DoesNotExist:
-            raise serializers.ValidationError("Answer not found")
-        return value
+    def validate(self, attrs):
+        question_id = Answer.objects.filter(id=attrs['answer_id']).values_list('question_id', flat=True).first()
+        if question_id is None:
+            raise serializers.ValidationError({'answer_id': "Answer not found"})
+        attrs['question_id'] = question_id
+        return attrs
 
     def create(self, validated_data):
         user = self.context['request'].user
-        answer = Answer.objects.get(id=validated_data['answer_id'])
-
-        Vote.objects.filter(
-            user=user,
-            answer__question=answer.question
-        ).delete()
-
-        return Vote.objects.create(answer=answer, user=user)
-
+        vote, = Vote.objects.cast(user, {validated_data['question_id']: validated_data['answer_id']})
+        return vote
+
+
+class VoteBatchCreateSerializer(serializers.Serializer):
+    """Votes for several questions of one questionnaire in a single request"""
+    answers = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=500)
+
+    def validate(self, attrs):
+        answers = attrs['answers']
+        questions = dict(
+            Answer.objects.filter(
+                id__in=answers,
+                question__questionnaire_id=self.context['questionnaire_id']
+            ).values_list('id', 'question_id')
+        )
+        missing = sorted(set(answers) - set(questions))
+        if missing:
+            raise serializers.ValidationError({'answers': f"Answers not found in this questionnaire: {missing}"})
+
+        choices = {}
+        for answer_id in answers:
+            question_id = questions[answer_id]
+            if choices.setdefault(question_id, answer_id) != answer_id:
+                raise serializers.ValidationError({'answers': "Only one answer per question is allowed"})
+        attrs['choices'] = choices
+        return attrs
 
+    def create(self, validated_data):
+        user = self.context['request'].user
+        return Vote.objects.cast(user, validated_data['choices'])
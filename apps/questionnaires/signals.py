@@ -0,0 +1,64 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from .cache import invalidate_tree
+from .models import User, Vote, Answer, Question, Questionnaire
+
+
+def update_tallies(vote: Vote, delta):
+    Answer.objects.filter(pk=vote.answer_id).update(votes_count=F('votes_count') + delta)
+    Question.objects.filter(pk=vote.question_id).update(votes_count=F('votes_count') + delta)
+
+
+# Vote.objects.cast() moves the tallies itself; this covers single saves
+@receiver(post_save, sender=Vote)
+def increment_tallies_on_vote(sender, instance, created, **kwargs):
+    if created:
+        update_tallies(instance, 1)
+
+
+# Votes have no delete receivers so cascades delete them in bulk; the tallies
+# they were part of are recounted once per deleted user or answer instead
+@receiver(pre_delete, sender=User)
+def collect_voted_tallies(sender, instance, **kwargs):
+    instance._voted_tallies = list(
+        Vote.objects.filter(user=instance).order_by().values_list('answer_id', 'question_id')
+    )
+
+
+@receiver(post_delete, sender=User)
+def recount_tallies_on_user_delete(sender, instance, **kwargs):
+    voted = getattr(instance, '_voted_tallies', None)
+    if voted:
+        answer_ids, question_ids = zip(*voted)
+        Vote.objects.recount_tallies(set(answer_ids), set(question_ids))
+
+
+@receiver(post_delete, sender=Answer)
+def recount_tallies_on_answer_delete(sender, instance, **kwargs):
+    Vote.objects.recount_tallies(question_ids=[instance.question_id])
+
+
+def schedule_tree_invalidation(questionnaire_id):
+    if questionnaire_id is not None:
+        transaction.on_commit(lambda: invalidate_tree(questionnaire_id))
+
+
+@receiver([post_save, post_delete], sender=Questionnaire)
+def invalidate_tree_on_questionnaire_change(sender, instance, **kwargs):
+    schedule_tree_invalidation(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Question)
+def invalidate_tree_on_question_change(sender, instance, **kwargs):
+    schedule_tree_invalidation(instance.questionnaire_id)
+
+
+@receiver([post_save, post_delete], sender=Answer)
+def invalidate_tree_on_answer_change(sender, instance, **kwargs):
+    questionnaire_id = Question.objects.filter(pk=instance.question_id).values_list(
+        'questionnaire_id', flat=True
+    ).first()
+    schedule_tree_invalidation(questionnaire_id)
@@ -1,3 +1,150 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.questionnaires.models import Questionnaire, QuestionnaireStatus, Question, Answer
+
+User = get_user_model()
+
+
+class QuestionnaireTreeAPIViewTestCase(APITestCase):
+    """Test cases for the whole-questionnaire endpoint"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(phone='+998901234567', username='testuser', password='TestPass123!')
+        self.client.force_authenticate(self.user)
+        self.questionnaire = Questionnaire.objects.create(title_en='Survey', title_uz="So'rovnoma")
+        for q in range(3):
+            question = Question.objects.create(
+                questionnaire=self.questionnaire, title_en=f'Question {q}', title_uz=f'Savol {q}'
+            )
+            for a in range(2):
+                Answer.objects.create(question=question, title_en=f'Answer {q}.{a}', title_uz=f'Javob {q}.{a}')
+        self.url = f'/api/v1/questionnaires/{self.questionnaire.id}/'
+
+    def test_tree_is_translated(self):
+        """Butun so'rovnoma tanlangan tilda qaytadi"""
+        response = self.client.get(self.url, {'lang': 'uz'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data['data']
+        self.assertEqual(data['title'], "So'rovnoma")
+        self.assertEqual([q['title'] for q in data['questions']], ['Savol 0', 'Savol 1', 'Savol 2'])
+        self.assertEqual([a['title'] for a in data['questions'][0]['answers']], ['Javob 0.0', 'Javob 0.1'])
+
+        response = self.client.get(self.url, {'lang': 'en'})
+        self.assertEqual(response.data['data']['questions'][0]['title'], 'Question 0')
+
+    def test_tree_query_count_and_cache(self):
+        """Ikki prefetch so'rovi, keyin keshdan"""
+        with self.assertNumQueries(3):
+            self.client.get(self.url, {'lang': 'en'})
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'lang': 'en'})
+        self.assertEqual(len(response.data['data']['questions']), 3)
+
+    def test_tree_cache_invalidated_on_change(self):
+        """Savol o'zgarsa kesh yangilanadi"""
+        self.client.get(self.url, {'lang': 'en'})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            question = self.questionnaire.questions.order_by('id').first()
+            question.title_en = 'Changed'
+            question.save()
+
+        response = self.client.get(self.url, {'lang': 'en'})
+        self.assertEqual(response.data['data']['questions'][0]['title'], 'Changed')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Answer.objects.create(question=question, title_en='New answer')
+
+        response = self.client.get(self.url, {'lang': 'en'})
+        self.assertEqual(len(response.data['data']['questions'][0]['answers']), 3)
+
+    def test_tree_not_found(self):
+        """Mavjud bo'lmagan so'rovnoma"""
+        response = self.client.get('/api/v1/questionnaires/999999/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tree_only_published(self):
+        """Qoralama va muddati o'tgan so'rovnomalar qaytmaydi"""
+        Questionnaire.objects.filter(pk=self.questionnaire.pk).update(status=QuestionnaireStatus.DRAFT)
+        response = self.client.get(self.url, {'lang': 'en'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        Questionnaire.objects.filter(pk=self.questionnaire.pk).update(
+            status=QuestionnaireStatus.PUBLISHED, expires_at=timezone.now() - timedelta(minutes=1)
+        )
+        response = self.client.get(self.url, {'lang': 'en'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_paged_mode_still_works(self):
+        """Sahifalangan rejim saqlanadi"""
+        response = self.client.get(f'/api/v1/questionnaires/{self.questionnaire.id}/questions/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class QuestionnaireListAPIViewTestCase(APITestCase):
+    """Test cases for the questionnaire list"""
+
+    def setUp(self):
+        cache.clear()
+        self.url = '/api/v1/questionnaires/'
+        self.user = User.objects.create_user(phone='+998901234567', username='testuser', password='TestPass123!')
+        self.admin = User.objects.create_user(
+            phone='+998901234568', username='admin', password='TestPass123!', is_staff=True
+        )
+        self.published = Questionnaire.objects.create(title_en='Published')
+        for q in range(3):
+            Question.objects.create(questionnaire=self.published, title_en=f'Question {q}')
+        self.draft = Questionnaire.objects.create(title_en='Draft', status=QuestionnaireStatus.DRAFT)
+        self.expired = Questionnaire.objects.create(title_en='Expired', status=QuestionnaireStatus.EXPIRED)
+        self.overdue = Questionnaire.objects.create(
+            title_en='Overdue', expires_at=timezone.now() - timedelta(minutes=1)
+        )
+
+    def test_clients_see_published_only(self):
+        """Mijozlar faqat chop etilgan so'rovnomalarni ko'radi"""
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual([item['id'] for item in results], [self.published.id])
+        self.assertEqual(results[0]['questions_count'], 3)
+
+    def test_admin_filters_by_status(self):
+        """Admin status bo'yicha filtrlaydi"""
+        self.client.force_authenticate(self.admin)
+
+        response = self.client.get(self.url, {'status': QuestionnaireStatus.DRAFT})
+        self.assertEqual([item['id'] for item in response.data['results']], [self.draft.id])
+
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data['results']), 4)
+
+    def test_questions_count_is_annotated(self):
+        """Savollar soni har bir qator uchun alohida hisoblanmaydi"""
+        self.client.force_authenticate(self.admin)
+        for i in range(5):
+            Questionnaire.objects.create(title_en=f'Extra {i}')
+
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
+
+    def test_expire_overdue(self):
+        """Muddati o'tgan so'rovnomalar EXPIRED bo'ladi"""
+        call_command('expire_questionnaires', stdout=StringIO())
+
+        self.overdue.refresh_from_db()
+        self.published.refresh_from_db()
+        self.assertEqual(self.overdue.status, QuestionnaireStatus.EXPIRED)
+        self.assertEqual(self.published.status, QuestionnaireStatus.PUBLISHED)
@@ -5,6 +5,8 @@ app_name = 'questionnaires'
 
 urlpatterns = [
     path('', views.QuestionnaireListCreateAPIView.as_view(), name='questionnaires_list_create'),
+    path("<int:pk>/", views.QuestionnaireTreeAPIView.as_view(), name='questionnaire_tree'),
     path("<int:questionnaire_id>/questions/", views.QuestionnaireQuestionsListAPIView.as_view()),
+    path("<int:questionnaire_id>/votes/", views.VoteBatchCreateAPIView.as_view()),
     path("vote/", views.VoteCreateAPIView.as_view()),
 ]
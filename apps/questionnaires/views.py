@@ -1,21 +1,40 @@
+from django.db.models import Prefetch
+from django.utils import timezone, translation
 from rest_framework import status
-from rest_framework.generics import ListCreateAPIView, ListAPIView, CreateAPIView
+from rest_framework.generics import ListCreateAPIView, ListAPIView, CreateAPIView, get_object_or_404
 from rest_framework.permissions import IsAdminUser
 
-from .serializers import QuestionnaireSerializer, VoteCreateSerializer, QuestionListSerializer, QuestionPagination
+from .serializers import QuestionnaireSerializer, VoteCreateSerializer, QuestionListSerializer, QuestionPagination, \
+    VoteBatchCreateSerializer, QuestionnaireTreeSerializer
+from .cache import TREE_CACHE_TIMEOUT, get_tree, set_tree
+from apps.shared.mixins.throttle_mixins import ThrottleFirstMixin
 from apps.shared.utils.custom_response import CustomResponse
+from apps.shared.utils.language import get_language_context
 from ..shared.permissions.mobile import IsMobileUser, IsAuthenticatedOrMobileUser
 from ..shared.utils.custom_pagination import CustomPageNumberPagination
 from rest_framework.generics import RetrieveAPIView
 from django.db.models import Count
-from .models import Questionnaire, Answer, Question
+from .models import Questionnaire, Answer, Question, QuestionnaireStatus
 
 
 class QuestionnaireListCreateAPIView(ListCreateAPIView):
-    queryset = Questionnaire.objects.all()
+    """
+    Clients get the published questionnaires only; admins may filter by ``?status=``.
+    """
     serializer_class = QuestionnaireSerializer
     pagination_class = CustomPageNumberPagination
 
+    def get_queryset(self):
+        user = self.request.user
+        if user and user.is_staff:
+            queryset = Questionnaire.objects.all()
+            status_filter = self.request.query_params.get('status')
+            if status_filter in QuestionnaireStatus.values:
+                queryset = queryset.filter(status=status_filter)
+        else:
+            queryset = Questionnaire.objects.published()
+        return queryset.with_questions_count().order_by('-created_at')
+
     def get_permissions(self):
         if self.request.method == "POST":
             return [IsAdminUser()]
@@ -51,7 +70,7 @@ class QuestionnaireQuestionsListAPIView(ListAPIView):
 
     def get_queryset(self):
         questionnaire = Questionnaire.objects.get(pk=self.kwargs['questionnaire_id'])
-        return Question.objects.filter(questionnaire=questionnaire).order_by('id')
+        return Question.objects.filter(questionnaire=questionnaire).prefetch_related('answers').order_by('id')
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
@@ -63,9 +82,42 @@ class QuestionnaireQuestionsListAPIView(ListAPIView):
         serializer = self.get_serializer(queryset, many=True)
         return CustomResponse.success(data=serializer.data, status_code=status.HTTP_200_OK)
 
-class VoteCreateAPIView(CreateAPIView):
+class QuestionnaireTreeAPIView(RetrieveAPIView):
+    """
+    Whole published questionnaire (questions and answers) in one response, translated to the
+    request's language. Built with two prefetch queries and cached per language, until it expires at the latest.
+    """
+    serializer_class = QuestionnaireTreeSerializer
+    permission_classes = [IsAuthenticatedOrMobileUser]
+
+    def get_queryset(self):
+        return Questionnaire.objects.published().prefetch_related(
+            Prefetch('questions', queryset=Question.objects.order_by('id').prefetch_related(
+                Prefetch('answers', queryset=Answer.objects.order_by('id'))
+            ))
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lang = get_language_context(request).content
+
+        questionnaire_id = self.kwargs['pk']
+        data = get_tree(questionnaire_id, lang)
+        if data is None:
+            questionnaire = get_object_or_404(self.get_queryset(), pk=questionnaire_id)
+            with translation.override(lang):
+                data = self.get_serializer(questionnaire).data
+            timeout = TREE_CACHE_TIMEOUT
+            if questionnaire.expires_at:
+                timeout = min(timeout, int((questionnaire.expires_at - timezone.now()).total_seconds()) + 1)
+            set_tree(questionnaire_id, lang, data, timeout=timeout)
+
+        return CustomResponse.success(data=data, status_code=status.HTTP_200_OK)
+
+
+class VoteCreateAPIView(ThrottleFirstMixin, CreateAPIView):
     serializer_class = VoteCreateSerializer
     permission_classes = [IsAuthenticatedOrMobileUser]
+    throttle_scope = 'vote'
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -78,3 +130,30 @@ class VoteCreateAPIView(CreateAPIView):
 
         serializer.save()
         return CustomResponse.success(data=serializer.data, status_code=status.HTTP_201_CREATED)
+
+
+class VoteBatchCreateAPIView(ThrottleFirstMixin, CreateAPIView):
+    """Answer several questions of a questionnaire at once (live polls)"""
+    serializer_class = VoteBatchCreateSerializer
+    permission_classes = [IsAuthenticatedOrMobileUser]
+    throttle_scope = 'vote'
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['questionnaire_id'] = self.kwargs['questionnaire_id']
+        return context
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return CustomResponse.error(
+                message_key="VALIDATION_ERROR",
+                errors=serializer.errors,
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        votes = serializer.save()
+        return CustomResponse.success(
+            data={'answers': [vote.answer_id for vote in votes]},
+            status_code=status.HTTP_201_CREATED
+        )
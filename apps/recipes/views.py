@@ -8,13 +8,15 @@ from apps.products.models import Product
 from apps.recipes.models import Recipe, RecipesProduct
 from apps.recipes.serializers import RecipesListSerializer, RecipesDetailSerializer, RecipeReviewCreateSerializer
 from apps.shared.exceptions.custom_exceptions import CustomException
+from apps.shared.mixins.projection_mixins import ValuesListMixin
 from apps.shared.permissions.mobile import IsMobileUser
+from apps.shared.utils.projection import project_queryset
 from apps.shared.utils.custom_pagination import CustomPageNumberPagination
 from apps.shared.utils.custom_response import CustomResponse
 from apps.users.models.device import Device
 
 
-class RecipesListAPI(ListAPIView):
+class RecipesListAPI(ValuesListMixin, ListAPIView):
     pagination_class = CustomPageNumberPagination
     serializer_class = RecipesListSerializer
     permission_classes = [IsMobileUser | IsAuthenticated]
@@ -42,19 +44,7 @@ class RecipesListAPI(ListAPIView):
             recipes = recipes.filter(cooking_time__lte=int(max_cooking_time))
         if order_by:
             recipes = recipes.order_by(order_by)
-        return recipes
-
-
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-
-        serializer = self.get_serializer(queryset, many=True)
-        return CustomResponse.success(data=serializer.data, status_code=status.HTTP_200_OK)
+        return project_queryset(recipes, self.get_serializer_class())
 
 
 class RecipeDetailAPI(RetrieveAPIView):
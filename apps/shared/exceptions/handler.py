@@ -6,6 +6,7 @@ for critical errors while preventing spam from common exceptions.
 """
 
 import logging
+import math
 import traceback
 from typing import Dict, Any, Optional
 
@@ -85,6 +86,9 @@ class DRFExceptionHandler:
         if isinstance(exc, CustomException):
             return self._handle_custom_exception(exc, request)
 
+        if isinstance(exc, Throttled):
+            return self._handle_throttled(exc, request)
+
         # Handle known/mapped exceptions
         response = self._handle_known_exception(exc, context, request)
         if response:
@@ -105,11 +109,36 @@ class DRFExceptionHandler:
         Returns:
             Custom error response with exception context
         """
-        return CustomResponse.error(
+        response = CustomResponse.error(
             message_key=exc.message_key,
             request=request,
             context=exc.context
         )
+        if 'retry_after' in exc.context:
+            response['Retry-After'] = str(exc.context['retry_after'])
+        return response
+
+    @staticmethod
+    def _handle_throttled(exc: Throttled, request) -> Response:
+        """
+        Handle Throttled with the wait in the message and the Retry-After header.
+
+        Args:
+            exc: Throttled instance
+            request: Django request object
+
+        Returns:
+            Custom error response with Retry-After when the wait is known
+        """
+        wait = math.ceil(exc.wait) if exc.wait is not None else None
+        response = CustomResponse.error(
+            message_key="THROTTLED",
+            request=request,
+            context={'wait': wait if wait is not None else '-'}
+        )
+        if wait is not None:
+            response['Retry-After'] = str(wait)
+        return response
 
     def _handle_known_exception(self, exc: Exception, context: Dict[str, Any], request) -> Optional[Response]:
         """
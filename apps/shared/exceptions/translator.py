@@ -2,6 +2,7 @@ import logging
 from typing import TypedDict, Any, Dict
 
 from apps.shared.messages import MESSAGES, MessageTemplate
+from apps.shared.utils.language import language_context
 
 logger = logging.getLogger(__name__)
 
@@ -37,12 +38,8 @@ def get_message_detail(
     messages_dict = message["messages"]
 
     # Language fallback chain
-    base_lang = lang.split('-')[0].split('_')[0]
-    template = (
-            messages_dict.get(lang)
-            or messages_dict.get(base_lang)
-            or messages_dict.get("en", "Error occurred")
-    )
+    code = language_context(lang).pick(messages_dict)
+    template = messages_dict[code] if code else "Error occurred"
 
     # Format message
     try:
@@ -0,0 +1,113 @@
+"""
+Django command comparing serialization throughput of the list endpoints' serializers
+with their compiled ``.values()`` fast path, on pages of generated rows.
+
+Rows are created inside a transaction that is rolled back at the end.
+"""
+import time
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from django.utils import timezone, translation
+
+from apps.history.models import History
+from apps.history.serializers import HistoryListSerializer
+from apps.products.models import Product, ProductRating
+from apps.products.serializers import ProductListSerializer
+from apps.recipes.models import Recipe, RecipesCategory
+from apps.recipes.serializers import RecipesListSerializer
+from apps.shared.models import Media
+from apps.shared.utils.language import get_language_context
+from apps.shared.utils.values_serializer import compile_serializer
+from apps.users.models.device import AppVersion, Device, DeviceType
+
+
+class Command(BaseCommand):
+    """Django command to benchmark list serializers."""
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100, help='Rows per page')
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--lang', default='uz')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        rows, repeat = options['rows'], options['repeat']
+        request = RequestFactory().get('/', {'lang': options['lang']})
+        language = get_language_context(request)
+
+        with transaction.atomic():
+            self._create_rows(rows)
+            with translation.override(language.content):
+                for serializer_class, queryset in (
+                    (ProductListSerializer, Product.objects.filter(title_en__startswith='Benchmark')),
+                    (RecipesListSerializer, Recipe.objects.filter(title_en__startswith='Benchmark')),
+                    (HistoryListSerializer, History.objects.filter(title_en__startswith='Benchmark')),
+                ):
+                    self._compare(serializer_class, queryset, request, language.content, rows, repeat)
+            transaction.set_rollback(True)
+
+    def _compare(self, serializer_class, queryset, request, language, rows, repeat):
+        compiled = compile_serializer(serializer_class, language)
+
+        def regular():
+            return serializer_class(list(queryset[:rows]), many=True, context={'request': request}).data
+
+        def fast():
+            return compiled.render(compiled.values(queryset)[:rows], request)
+
+        regular_time, fast_time = self._time(regular, repeat), self._time(fast, repeat)
+        self.stdout.write(
+            f'{serializer_class.__name__:<24} serializer {rows / regular_time:>9,.0f} rows/s   '
+            f'values {rows / fast_time:>9,.0f} rows/s   x{regular_time / fast_time:.1f}'
+        )
+
+    @staticmethod
+    def _time(func, repeat):
+        func()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - start) / repeat
+
+    def _create_rows(self, rows):
+        app_version = AppVersion.objects.create(version='benchmark', device_type=DeviceType.ANDROID)
+        device = Device.objects.create(
+            device_model='Benchmark', operation_version='-', device_type=DeviceType.ANDROID,
+            device_id='benchmark', ip_address='127.0.0.1', app_version=app_version
+        )
+        category = RecipesCategory.objects.create(title_en='Benchmark', title_uz='Benchmark')
+        now = timezone.now()
+
+        products = Product.objects.bulk_create(
+            Product(title_en=f'Benchmark {i}', title_uz=f'Benchmark {i}', description='-',
+                    price='12345.67', discount=i % 30, quantity=i % 5)
+            for i in range(rows)
+        )
+        ProductRating.objects.bulk_create(
+            ProductRating(device=device, product=product, rating=1 + i % 5) for i, product in enumerate(products)
+        )
+        recipes = Recipe.objects.bulk_create(
+            Recipe(title_en=f'Benchmark {i}', title_uz=f'Benchmark {i}', category=category,
+                   calories=100 + i, cooking_time=10 + i)
+            for i in range(rows)
+        )
+        histories = History.objects.bulk_create(
+            History(title_en=f'Benchmark {i}', title_uz=f'Benchmark {i}', short_description_en='-',
+                    short_description_uz='-', long_description_en='-' * 2000, long_description_uz='-' * 2000,
+                    button_text_en='-', button_text_uz='-', start_date=now, end_date=now)
+            for i in range(rows)
+        )
+
+        # Media rows only, the files themselves are never read
+        media = []
+        for obj in [*products, *recipes, *histories]:
+            content_type = ContentType.objects.get_for_model(obj)
+            for language in ('en', 'uz'):
+                media.append(Media(
+                    file=f'cas/be/nc/benchmark-{language}.jpg', media_type='image', original_filename='photo.jpg',
+                    file_size=1, content_type=content_type, object_id=obj.pk, language=language, is_public=True,
+                ))
+        Media.objects.bulk_create(media)
@@ -0,0 +1,33 @@
+"""
+Django command to delete resumable uploads that were abandoned before completion.
+"""
+import os
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.shared.models import UploadSession
+from apps.shared.utils.uploads import part_path
+
+
+class Command(BaseCommand):
+    """Django command to delete stale upload sessions and their partial files."""
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24, help='Idle time after which an upload is stale')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        stale = UploadSession.objects.filter(media__isnull=True, updated_at__lt=cutoff)
+
+        count = 0
+        for session in stale.iterator():
+            path = part_path(session)
+            if os.path.exists(path):
+                os.remove(path)
+            count += 1
+        stale.delete()
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {count} stale uploads'))
@@ -0,0 +1,28 @@
+"""
+Django command to generate responsive variants for images uploaded before the pipeline existed.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.shared.models import Media
+from apps.shared.utils.image_variants import process_media
+
+
+class Command(BaseCommand):
+    """Django command to generate missing image variants."""
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Regenerate variants of every image')
+        parser.add_argument('--batch-size', type=int, default=100)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        queryset = Media.objects.filter(media_type='image').order_by('pk')
+        if not options['all']:
+            queryset = queryset.filter(variants={})
+
+        ids = list(queryset.values_list('pk', flat=True))
+        batch_size = options['batch_size']
+        for start in range(0, len(ids), batch_size):
+            process_media(ids[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {len(ids)} images'))
@@ -0,0 +1,39 @@
+"""
+Django command to delete stored media blobs no Media row references any more.
+
+Deleting a Media row keeps its blob (another upload of the same content may be
+reusing it), so this is meant to run periodically, e.g. daily.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.shared.models import Media
+from apps.shared.storage import ContentAddressedStorage
+
+
+class Command(BaseCommand):
+    """Django command to delete unreferenced media blobs."""
+
+    help = 'Delete media blobs and image variants no longer referenced by any Media row.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24, help='Keep blobs stored more recently than this')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        storage = Media._meta.get_field('file').storage
+        if not isinstance(storage, ContentAddressedStorage):
+            raise CommandError('Media files are not in a ContentAddressedStorage')
+
+        # Read before listing the blobs: one stored later is too recent to be deleted anyway
+        referenced = set()
+        for name, variants in Media.objects.values_list('file', 'variants').iterator(chunk_size=2000):
+            referenced.add(name)
+            for variant in (variants or {}).values():
+                referenced.update(path for key, path in variant.items() if key not in ('width', 'height'))
+
+        count = 0
+        for name in storage.blob_names():
+            if name not in referenced and storage.delete_idle(name, options['hours'] * 60 * 60):
+                count += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {count} unreferenced blobs'))
@@ -1,26 +1,46 @@
 """
 Django command to wait for the database to be available.
+
+Connects the way requests do, through a psycopg pool configured like the
+workers' when DB_POOL is on, retrying with backoff until it succeeds or, if
+given, --timeout seconds have passed.
 """
 import time
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
 from django.db.utils import OperationalError
-from psycopg2 import OperationalError as Psycopg2OpError
+
+from apps.shared.utils.db_connections import connection_stats
 
 
 class Command(BaseCommand):
     """Django command to wait for database."""
 
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--timeout', type=float, default=None, help='Seconds to wait before failing (default: forever)')
+
     def handle(self, *args, **options):
         """Entrypoint for command."""
         self.stdout.write('Waiting for database...')
-        db_up = False
-        while db_up is False:
+        connection = connections[options['database']]
+        deadline = None if options['timeout'] is None else time.monotonic() + options['timeout']
+        delay = 0.5
+
+        while True:
             try:
-                self.check(databases=['default'])
-                db_up = True
-            except (Psycopg2OpError, OperationalError):
-                self.stdout.write('Database unavailable, waiting 1 second...')
-                time.sleep(1)
+                connection.ensure_connection()
+                break
+            except OperationalError as error:
+                if deadline is not None and time.monotonic() + delay > deadline:
+                    raise CommandError(f'Database unavailable after {options["timeout"]:g} seconds: {error}')
+                self.stdout.write(f'Database unavailable, waiting {delay:g} seconds...')
+                time.sleep(delay)
+                delay = min(delay * 2, 5)
 
+        stats = connection_stats(options['database'])
+        connection.close()
+        if stats['pool']:
+            self.stdout.write(f'Connection pool open ({stats["pool"]["size"]} connections)')
         self.stdout.write(self.style.SUCCESS('Database available!'))
@@ -21,6 +21,15 @@ ACCOUNT_MESSAGES: Dict[str, MessageTemplate] = {
         },
         "status_code": 404
     },
+    "INVALID_USER": {
+        "id": "INVALID_USER",
+        "messages": {
+            "en": "Invalid phone number or password",
+            "uz": "Telefon raqami yoki parol noto'g'ri",
+            "ru": "Неверный номер телефона или пароль",
+        },
+        "status_code": 400
+    },
     "USER_ALREADY_EXISTS": {
         "id": "USER_ALREADY_EXISTS",
         "messages": {
@@ -147,6 +156,15 @@ ACCOUNT_MESSAGES: Dict[str, MessageTemplate] = {
         },
         "status_code": 200
     },
+    "OTP_RATE_LIMITED": {
+        "id": "OTP_RATE_LIMITED",
+        "messages": {
+            "en": "Too many verification codes requested. Try again in {retry_after} seconds",
+            "uz": "Juda ko'p tasdiqlash kodi so'raldi. {retry_after} soniyadan keyin urinib ko'ring",
+            "ru": "Запрошено слишком много кодов подтверждения. Повторите через {retry_after} секунд",
+        },
+        "status_code": 429
+    },
     "OTP_SENT": {
         "id": "OTP_SENT",
         "messages": {
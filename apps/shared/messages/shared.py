@@ -75,6 +75,33 @@ SHARED_MESSAGES: Dict[str, MessageTemplate] = {
         },
         "status_code": 404
     },
+    "FILE_TOO_LARGE": {
+        "id": "FILE_TOO_LARGE",
+        "messages": {
+            "en": "File is too large, the limit for {media_type} is {limit} bytes",
+            "uz": "Fayl juda katta, {media_type} uchun chegara {limit} bayt",
+            "ru": "Файл слишком большой, ограничение для {media_type}: {limit} байт",
+        },
+        "status_code": 413
+    },
+    "UNSUPPORTED_FILE_TYPE": {
+        "id": "UNSUPPORTED_FILE_TYPE",
+        "messages": {
+            "en": "File content ({mime_type}) is not a valid {media_type}",
+            "uz": "Fayl mazmuni ({mime_type}) yaroqli {media_type} emas",
+            "ru": "Содержимое файла ({mime_type}) не является допустимым {media_type}",
+        },
+        "status_code": 415
+    },
+    "UPLOAD_OFFSET_MISMATCH": {
+        "id": "UPLOAD_OFFSET_MISMATCH",
+        "messages": {
+            "en": "Upload must continue from byte {offset}",
+            "uz": "Yuklash {offset}-baytdan davom etishi kerak",
+            "ru": "Загрузка должна продолжаться с байта {offset}",
+        },
+        "status_code": 409
+    },
     "PERMISSION_DENIED": {
         "id": "PERMISSION_DENIED",
         "messages": {
@@ -93,6 +120,15 @@ SHARED_MESSAGES: Dict[str, MessageTemplate] = {
         },
         "status_code": 401
     },
+    "THROTTLED": {
+        "id": "THROTTLED",
+        "messages": {
+            "en": "Too many requests. Try again in {wait} seconds",
+            "uz": "So'rovlar juda ko'p. {wait} soniyadan keyin urinib ko'ring",
+            "ru": "Слишком много запросов. Повторите через {wait} секунд",
+        },
+        "status_code": 429
+    },
     "INTERNAL_SERVER_ERROR": {
         "id": "INTERNAL_SERVER_ERROR",
         "messages": {
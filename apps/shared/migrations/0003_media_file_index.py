@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0002_media_image_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='media',
+            name='file',
+            field=models.FileField(db_index=True, upload_to='%Y/%m/%d/'),
+        ),
+    ]
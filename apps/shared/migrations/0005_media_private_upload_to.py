@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:12
+
+import apps.shared.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0004_upload_session'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='media',
+            name='file',
+            field=models.FileField(db_index=True, upload_to=apps.shared.models.media_upload_to),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0005_media_private_upload_to'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='media',
+            name='file_size',
+            field=models.PositiveBigIntegerField(help_text='Size in bytes'),
+        ),
+    ]
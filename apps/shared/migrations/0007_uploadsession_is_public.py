@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0006_alter_media_file_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadsession',
+            name='is_public',
+            field=models.BooleanField(default=True),
+        ),
+    ]
@@ -0,0 +1,45 @@
+from rest_framework import status
+
+from apps.shared.utils.custom_response import CustomResponse
+from apps.shared.utils.language import get_language_context
+from apps.shared.utils.projection import project_queryset
+from apps.shared.utils.values_serializer import compile_serializer
+
+
+class ProjectedQuerysetMixin:
+    """
+    Mixin for read-only list/retrieve views
+    Loads only the columns the serializer renders in the active language
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request is None or self.request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            return queryset
+        return project_queryset(queryset, self.get_serializer_class())
+
+
+class ValuesListMixin:
+    """
+    Mixin for hot list views
+    Renders pages from .values() rows with the compiled serializer instead of model instances
+    """
+    values_fast_path = True
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.values_fast_path:
+            compiled = compile_serializer(self.get_serializer_class(), get_language_context(request).content)
+            queryset = compiled.values(queryset)
+
+            def render(rows):
+                return compiled.render(rows, request)
+        else:
+            def render(rows):
+                return self.get_serializer(rows, many=True).data
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(render(page))
+
+        return CustomResponse.success(data=render(queryset), status_code=status.HTTP_200_OK)
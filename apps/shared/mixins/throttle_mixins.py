@@ -0,0 +1,30 @@
+from apps.shared.utils.throttling import DeviceThrottle, IPThrottle, UserThrottle
+
+
+class ThrottleFirstMixin:
+    """
+    Mixin for write endpoints open to bursts (OTP, login, votes, ratings)
+    Checks the view's throttle_scope before authentication and permissions, so a
+    throttled request is refused before their user and device queries
+    """
+    throttle_classes = (DeviceThrottle, UserThrottle, IPThrottle)
+
+    def initial(self, request, *args, **kwargs):
+        # APIView.initial with the throttles moved first
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        self.check_throttles(request)
+        self.perform_authentication(request)
+        self.check_permissions(request)
+
+    def check_throttles(self, request):
+        # Stop at the first throttle refusing, a refused request doesn't use up the others
+        for throttle in self.get_throttles():
+            if not throttle.allow_request(request, self):
+                self.throttled(request, throttle.wait())
@@ -1,7 +1,12 @@
+import copy
+
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from rest_framework import serializers
 
+from apps.shared.utils.language import get_language_context
+from apps.shared.utils.uploads import MediaFileValidator, media_type_for
+
 
 class TranslatedFieldsWriteMixin:
     """
@@ -9,10 +14,34 @@ class TranslatedFieldsWriteMixin:
     Handles text translations and media uploads
     """
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.languages = settings.LANGUAGES
-
+    # Field map built once per serializer class by _compile_fields(), see get_fields()
+    _compiled_fields = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every subclass compiles its own map
+        cls._compiled_fields = None
+
+    @property
+    def languages(self):
+        return settings.LANGUAGES
+
+    def get_fields(self):
+        cls = type(self)
+        if cls._compiled_fields is None:
+            cls._compiled_fields = self._compile_fields(super().get_fields())
+        return {name: self._copy_field(field) for name, field in cls._compiled_fields.items()}
+
+    @staticmethod
+    def _copy_field(field):
+        # Unbound plain fields only hold configuration, a shallow copy is enough to bind it;
+        # fields with children bind those to themselves, so they need their own copies
+        if isinstance(field, (serializers.BaseSerializer, serializers.ListField, serializers.DictField)):
+            return copy.deepcopy(field)
+        return copy.copy(field)
+
+    def _compile_fields(self, fields):
+        """Add the language-specific and media fields to the serializer's own fields"""
         translatable_fields = getattr(self, 'translatable_fields', [])
         media_fields = getattr(self, 'media_fields', [])
 
@@ -21,8 +50,8 @@ class TranslatedFieldsWriteMixin:
             is_media = field_name in media_fields
 
             # Make base field optional if exists
-            if field_name in self.fields:
-                self.fields[field_name].required = False
+            if field_name in fields:
+                fields[field_name].required = False
 
             # Create language fields
             for lang_code, lang_name in self.languages:
@@ -30,24 +59,11 @@ class TranslatedFieldsWriteMixin:
 
                 if is_media:
                     # Media field
-                    is_list = field_name.endswith('s')
-                    if is_list:
-                        self.fields[field_key] = serializers.ListField(
-                            child=serializers.FileField(),
-                            required=False,
-                            allow_empty=True,
-                            help_text=f"{lang_name} files"
-                        )
-                    else:
-                        self.fields[field_key] = serializers.FileField(
-                            required=False,
-                            allow_null=True,
-                            help_text=f"{lang_name} file"
-                        )
-                elif field_name in self.fields:
+                    fields[field_key] = self._media_field(field_name, f"{lang_name} file")
+                elif field_name in fields:
                     # Text field
-                    original = self.fields[field_name]
-                    self.fields[field_key] = original.__class__(
+                    original = fields[field_name]
+                    fields[field_key] = original.__class__(
                         required=True,
                         allow_blank=True,
                         allow_null=True,
@@ -58,25 +74,29 @@ class TranslatedFieldsWriteMixin:
         # Create non-translatable media fields (shared)
         for field_name in media_fields:
             if field_name not in translatable_fields:
-                is_list = field_name.endswith('s')
-                if is_list:
-                    self.fields[field_name] = serializers.ListField(
-                        child=serializers.FileField(),
-                        required=False,
-                        allow_empty=True,
-                        help_text="Media files"
-                    )
-                else:
-                    self.fields[field_name] = serializers.FileField(
-                        required=False,
-                        allow_null=True,
-                        help_text="Media file"
-                    )
+                fields[field_name] = self._media_field(field_name, "Media file")
+
+        return fields
+
+    @staticmethod
+    def _media_field(field_name, help_text):
+        validators = [MediaFileValidator(media_type_for(field_name))]
+        if field_name.endswith('s'):
+            return serializers.ListField(
+                child=serializers.FileField(validators=validators),
+                required=False,
+                allow_empty=True,
+                help_text=f"{help_text}s"
+            )
+        return serializers.FileField(
+            required=False,
+            allow_null=True,
+            validators=validators,
+            help_text=help_text
+        )
 
     def create(self, validated_data):
         media_data = self._extract_media_data(validated_data)
-        for field in self.fields:
-            print(field)
         instance = super().create(validated_data)
         self._save_media_files(instance, media_data)
         return instance
@@ -166,7 +186,7 @@ class TranslatedFieldsWriteMixin:
 class TranslatedFieldsReadMixin:
     """
     Mixin for GET/LIST serializers
-    Returns content in language from request.lang
+    Returns content in the request's language, falling back along its chain
     """
 
     def to_representation(self, instance):
@@ -176,19 +196,19 @@ class TranslatedFieldsReadMixin:
         media_fields = getattr(self, 'media_fields', [])
 
         request = self.context.get('request')
-        lang = self._get_language(request)
+        language = get_language_context(request)
+        lang = language.content
 
         # Handle translatable fields
         for field_name in translatable_fields:
             if field_name in media_fields:
                 # Media field
-                data[field_name] = self._get_media(instance, field_name, lang)
+                data[field_name] = self._get_media(instance, field_name, language)
             else:
                 # Text field
-                field_key = f"{field_name}_{lang}"
-                if hasattr(instance, field_key):
-                    value = getattr(instance, field_key, '')
-                    data[field_name] = value if value else ''
+                if hasattr(instance, f"{field_name}_{lang}"):
+                    values = (getattr(instance, f"{field_name}_{code}", '') for code in language.content_chain)
+                    data[field_name] = next((value for value in values if value), '')
 
             # Remove language fields
             for lc, _ in settings.LANGUAGES:
@@ -201,9 +221,6 @@ class TranslatedFieldsReadMixin:
 
         return data
 
-    def _get_language(self, request):
-        return 'en'
-
     def _get_media(self, instance, field_name, language):
         is_list = field_name.endswith('s')
 
@@ -222,33 +239,33 @@ class TranslatedFieldsReadMixin:
             media_type = 'other'
 
         if language:
-            # Language-specific media
-            lang_map = {l[0].lower(): l[0] for l in settings.LANGUAGES}
-            db_lang = lang_map.get(language)
-            qs = instance.media_files.filter(media_type=media_type, language=db_lang)
+            # Language-specific media, from the first language of the chain that has any
+            items = list(instance.media_files.filter(media_type=media_type, language__in=language.content_chain))
+            picked = language.pick({m.language for m in items})
+            items = [m for m in items if m.language == picked]
         else:
             # Shared media (no language)
-            qs = instance.media_files.filter(media_type=media_type, language__isnull=True)
+            items = list(instance.media_files.filter(media_type=media_type, language__isnull=True))
 
         # Return list or single object
         if is_list:
-            return [{
-                'id': str(m.id),
-                'url': m.file.url if m.file else None,
-                'filename': m.original_filename,
-                'size': m.file_size,
-                'type': m.media_type,
-                'language': m.language
-            } for m in qs]
+            return [self._media_item(m) for m in items]
         else:
-            first = qs.first()
-            if first:
-                return {
-                    'id': str(first.id),
-                    'url': first.file.url if first.file else None,
-                    'filename': first.original_filename,
-                    'size': first.file_size,
-                    'type': first.media_type,
-                    'language': first.language
-                }
+            if items:
+                return self._media_item(items[0])
             return None
+
+    def _media_item(self, media):
+        # ?image_size=thumbnail|medium|large&image_format=webp|jpeg picks a resized variant
+        request = self.context.get('request')
+        params = request.query_params if request is not None and hasattr(request, 'query_params') else {}
+        return {
+            'id': str(media.id),
+            'url': media.variant_url(params.get('image_size'), params.get('image_format', 'webp')),
+            'filename': media.original_filename,
+            'size': media.file_size,
+            'type': media.media_type,
+            'language': media.language,
+            'width': media.width,
+            'height': media.height,
+        }
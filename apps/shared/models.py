@@ -4,6 +4,10 @@ from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.utils import timezone
+
+from apps.shared.utils.media_access import PRIVATE_PREFIX, is_private, signed_url
+from apps.shared.utils.uploads import sniff_file
 
 User = get_user_model()
 
@@ -31,6 +35,13 @@ class BaseModel(models.Model):
         ordering = ['-created_at']
 
 
+def media_upload_to(instance, filename):
+    """Private files go under ``private/``, which nginx only serves through signed URLs"""
+    if not instance.is_public:
+        return f'{PRIVATE_PREFIX}{filename}'
+    return f"{timezone.now():%Y/%m/%d}/{filename}"
+
+
 class Media(BaseModel):
     MEDIA_TYPES = [
         ('image', 'Image'),
@@ -40,9 +51,11 @@ class Media(BaseModel):
         ('other', 'Other'),
     ]
 
-    file = models.FileField(upload_to='%Y/%m/%d/')
+    # Stored once per content by the default ContentAddressedStorage; rows sharing
+    # a blob are its references, so the file is indexed
+    file = models.FileField(upload_to=media_upload_to, db_index=True)
     media_type = models.CharField(max_length=20, choices=MEDIA_TYPES)
-    file_size = models.PositiveIntegerField(help_text="Size in bytes")
+    file_size = models.PositiveBigIntegerField(help_text="Size in bytes")
     mime_type = models.CharField(max_length=100)
     original_filename = models.CharField(max_length=255)
 
@@ -66,6 +79,11 @@ class Media(BaseModel):
         null=True, blank=True
     )
 
+    # Filled by apps.shared.utils.image_variants after upload
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    variants = models.JSONField(default=dict, blank=True)
+
     class Meta:
         db_table = 'media'
         ordering = ['-created_at']
@@ -81,9 +99,64 @@ class Media(BaseModel):
         if self.file:
             self.file_size = self.file.size
 
-            if hasattr(self.file.file, 'content_type'):
-                self.mime_type = self.file.file.content_type
-            else:
-                self.mime_type = 'application/octet-stream'
+            if not self.file._committed:
+                # Sniffed from the content, the client-supplied content type is not trusted
+                self.mime_type = sniff_file(self.file.file)
 
         super().save(*args, **kwargs)
+
+    def variant_url(self, size=None, image_format='webp'):
+        """
+        URL of the resized ``size`` variant in ``image_format``, or of the original file;
+        a signed, expiring URL for private media.
+        """
+        variant = self.variants.get(size) if size else None
+        name = variant.get(image_format) if variant else None
+        name = name or self.file.name
+        if not name:
+            return None
+        if is_private(name):
+            return signed_url(name)
+        return self.file.storage.url(name)
+
+
+class UploadSession(BaseModel):
+    """
+    A resumable upload in progress; ``offset`` bytes are stored in its partial file
+    (see apps.shared.utils.uploads). Identified by ``uuid`` in the API.
+    """
+    filename = models.CharField(max_length=255)
+    media_type = models.CharField(max_length=20, choices=Media.MEDIA_TYPES)
+    mime_type = models.CharField(max_length=100, blank=True)
+    total_size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+
+    # Where the finished Media is attached
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE,
+        null=True, blank=True
+    )
+    object_id = models.PositiveIntegerField(null=True, blank=True)
+    language = models.CharField(
+        max_length=3,
+        choices=Language.choices,
+        null=True, blank=True
+    )
+    uploaded_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL,
+        null=True, blank=True,
+    )
+    # Visibility of the finished Media
+    is_public = models.BooleanField(default=True)
+    media = models.OneToOneField(Media, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+
+    class Meta:
+        db_table = 'upload_sessions'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.total_size})"
+
+    @property
+    def is_complete(self):
+        return self.offset >= self.total_size
@@ -11,7 +11,10 @@ class IsMobileUser(BasePermission):
         if not token:
             raise CustomException(message_key="TOKEN_IS_NOT_PROVIDED")
 
-        device = Device.objects.filter(device_token=token).first()
+        # DeviceLanguageMiddleware already looked the device up
+        device = getattr(request, 'device', None)
+        if device is None or str(device.device_token) != token:
+            device = Device.objects.filter(device_token=token).first()
         if not device:
             raise CustomException(message_key="DEVICE_NOT_FOUND")
 
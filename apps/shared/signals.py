@@ -0,0 +1,18 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Media
+from .utils.db_connections import record_connection
+from .utils.image_variants import schedule_variants
+
+
+@receiver(post_save, sender=Media)
+def generate_image_variants(sender, instance, created, **kwargs):
+    if created and instance.media_type == 'image':
+        schedule_variants([instance.pk])
+
+
+@receiver(connection_created)
+def count_db_connection(sender, connection, **kwargs):
+    record_connection(connection.alias)
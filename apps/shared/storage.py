@@ -0,0 +1,111 @@
+"""
+Content-addressed file storage.
+
+Every file is stored once under the SHA-256 of its content
+(``cas/ab/cd/abcd...ef.jpg``, or ``private/cas/...`` for private media): the digest is computed while the upload is streamed
+to a temporary file, which is then moved into place, or dropped if a blob with
+the same digest already exists. Blob names never change meaning, so nginx can
+serve ``cas/`` with immutable cache headers.
+
+A blob is referenced by the ``Media`` rows whose ``file`` (or one of whose
+``variants``) is its name. Blobs are not deleted with their last reference, a
+concurrent upload of the same content may be about to reuse them: the
+``sweep_media_blobs`` command deletes unreferenced blobs nobody stored for a while,
+every upload of a blob refreshes its modification time.
+"""
+import hashlib
+import os
+import tempfile
+import time
+import uuid
+
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+
+from apps.shared.utils.media_access import PRIVATE_PREFIX
+
+CAS_PREFIX = 'cas'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+
+    def get_available_name(self, name, max_length=None):
+        # The final name depends on the content, duplicates are handled in _save()
+        return name
+
+    def blob_name(self, digest, extension):
+        return '/'.join([CAS_PREFIX, digest[:2], digest[2:4], f'{digest}{extension.lower()}'])
+
+    def _save(self, name, content):
+        os.makedirs(self.location, exist_ok=True)
+        sha256 = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(prefix='.upload-', dir=self.location)
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    sha256.update(chunk)
+                    temp_file.write(chunk)
+
+            blob = self.blob_name(sha256.hexdigest(), os.path.splitext(name)[1])
+            if name.startswith(PRIVATE_PREFIX):
+                # Private blobs stay out of the publicly served tree
+                blob = PRIVATE_PREFIX + blob
+            path = self.path(blob)
+            try:
+                # Keeps the blob from the sweep while the new reference is being saved
+                os.utime(path)
+                return blob
+            except FileNotFoundError:
+                pass
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if self.directory_permissions_mode is not None:
+                os.chmod(os.path.dirname(path), self.directory_permissions_mode)
+            try:
+                # Fails if a concurrent upload of the same content got there first
+                file_move_safe(temp_path, path, allow_overwrite=False)
+            except FileExistsError:
+                return blob
+            if self.file_permissions_mode is not None:
+                os.chmod(path, self.file_permissions_mode)
+            return blob
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def blob_names(self):
+        """Names of every stored blob, public and private"""
+        for prefix in (CAS_PREFIX, PRIVATE_PREFIX + CAS_PREFIX):
+            root = self.path(prefix)
+            for directory, _, filenames in os.walk(root):
+                for filename in filenames:
+                    if not filename.startswith('.'):
+                        path = os.path.join(directory, filename)
+                        yield os.path.relpath(path, self.location).replace(os.sep, '/')
+
+    def delete_idle(self, name, idle_seconds) -> bool:
+        """
+        Delete blob ``name`` unless it was stored in the last ``idle_seconds``.
+
+        The blob is first renamed out of the way, so an upload that finds it after
+        that stores its own copy; one that found it before has refreshed its
+        modification time, and the blob is put back.
+        """
+        path = self.path(name)
+        tombstone = os.path.join(os.path.dirname(path), f'.deleting-{uuid.uuid4().hex}')
+        try:
+            os.rename(path, tombstone)
+        except FileNotFoundError:
+            return False
+        if time.time() - os.stat(tombstone).st_mtime < idle_seconds:
+            try:
+                os.link(tombstone, path)
+            except FileExistsError:
+                # A concurrent upload stored the same content again
+                pass
+            os.remove(tombstone)
+            return False
+        os.remove(tombstone)
+        return True
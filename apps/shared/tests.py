@@ -1,3 +1,665 @@
-from django.test import TestCase
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from PIL import Image
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.utils import OperationalError
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone, translation
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APITestCase
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.products.models import Product
+from core.middleware import ReplicaRoutingMiddleware
+from apps.shared.exceptions.translator import get_message_detail
+from apps.shared.mixins.throttle_mixins import ThrottleFirstMixin
+from apps.shared.models import Media
+from apps.shared.utils.language import DEFAULT_LANGUAGE, language_context, negotiate, parse_accept_language
+from apps.shared.utils.media_access import signed_url
+from apps.shared.utils import db_router
+from apps.shared.utils.custom_response import CustomResponse
+from apps.shared.utils.db_connections import connection_stats
+from apps.shared.utils.projection import project_queryset, serializer_columns
+from apps.shared.utils.throttling import UserThrottle, hit
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def tearDownModule():
+    shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+
+def make_image(width, height, image_format='PNG', mode='RGBA'):
+    buffer = io.BytesIO()
+    Image.new(mode, (width, height), (200, 30, 30, 128) if mode == 'RGBA' else (200, 30, 30)).save(buffer, image_format)
+    return buffer.getvalue()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, IMAGE_VARIANT_WORKERS=0)
+class ImageVariantsTestCase(TestCase):
+    """Test cases for the image variant pipeline"""
+
+    def create_media(self, content, name='photo.png', media_type='image'):
+        with self.captureOnCommitCallbacks(execute=True):
+            media = Media.objects.create(
+                file=SimpleUploadedFile(name, content, 'image/png'),
+                media_type=media_type,
+                original_filename=name,
+                is_public=True,
+            )
+        media.refresh_from_db()
+        return media
+
+    def test_variants_are_generated(self):
+        """Yuklangandan keyin WebP va JPEG variantlar yaratiladi"""
+        media = self.create_media(make_image(1600, 800))
+
+        self.assertEqual((media.width, media.height), (1600, 800))
+        self.assertEqual(set(media.variants), {'thumbnail', 'medium', 'large'})
+        thumbnail = media.variants['thumbnail']
+        self.assertEqual((thumbnail['width'], thumbnail['height']), (200, 100))
+        with media.file.storage.open(thumbnail['webp']) as file:
+            self.assertEqual(Image.open(file).format, 'WEBP')
+        with media.file.storage.open(thumbnail['jpeg']) as file:
+            self.assertEqual(Image.open(file).format, 'JPEG')
+
+    def test_small_images_are_not_upscaled(self):
+        """Kichik rasmlar kattalashtirilmaydi"""
+        media = self.create_media(make_image(150, 100, 'JPEG', 'RGB'), name='small.jpg')
+
+        self.assertEqual(media.variants['large']['width'], 150)
+
+    def test_variant_url(self):
+        """So'ralgan o'lcham bo'lmasa asl fayl qaytadi"""
+        media = self.create_media(make_image(800, 800))
+
+        self.assertTrue(media.variant_url('thumbnail').endswith(media.variants['thumbnail']['webp']))
+        self.assertTrue(media.variant_url('thumbnail', 'jpeg').endswith(media.variants['thumbnail']['jpeg']))
+        self.assertEqual(media.variant_url('huge'), media.file.url)
+        self.assertEqual(media.variant_url(), media.file.url)
+
+    def test_broken_image_is_skipped(self):
+        """Buzilgan rasm yuklashni to'xtatmaydi"""
+        with self.assertLogs('apps.shared.utils.image_variants', 'WARNING'):
+            media = self.create_media(b'not an image')
+
+        self.assertEqual(media.variants, {})
+        self.assertIsNone(media.width)
+
+    def test_non_image_media_is_ignored(self):
+        """Rasm bo'lmagan fayllar qayta ishlanmaydi"""
+        media = self.create_media(make_image(300, 300), name='doc.png', media_type='document')
+
+        self.assertEqual(media.variants, {})
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, IMAGE_VARIANT_WORKERS=0)
+class MediaVariantSerializationTestCase(APITestCase):
+    """Test cases for picking image variants in API responses"""
+
+    def test_product_images_by_size(self):
+        """Mahsulot rasmlari so'ralgan o'lchamda qaytadi"""
+        admin = User.objects.create_user(
+            phone='+998901234500', username='admin_user', password='AdminPass123!', is_staff=True
+        )
+        product = Product.objects.create(title_en='Green apple', description='Fresh', price=1000, quantity=5)
+        with self.captureOnCommitCallbacks(execute=True):
+            media = Media.objects.create(
+                file=SimpleUploadedFile('apple.png', make_image(1000, 1000), 'image/png'),
+                media_type='image',
+                original_filename='apple.png',
+                content_type=ContentType.objects.get_for_model(Product),
+                object_id=product.pk,
+                language='en',
+                is_public=True,
+            )
+        self.client.force_authenticate(admin)
+
+        response = self.client.get(f'/api/v1/admins/products/{product.id}/', {'image_size': 'thumbnail'})
+
+        image = response.data['data']['images'][0]
+        media.refresh_from_db()
+        self.assertTrue(image['url'].endswith(media.variants['thumbnail']['webp']))
+        self.assertEqual((image['width'], image['height']), (1000, 1000))
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, IMAGE_VARIANT_WORKERS=0)
+class ContentAddressedStorageTestCase(TestCase):
+    """Test cases for deduplicated media storage"""
+
+    def create_media(self, content, name='photo.png'):
+        with self.captureOnCommitCallbacks(execute=True):
+            media = Media.objects.create(
+                file=SimpleUploadedFile(name, content, 'image/png'),
+                media_type='image',
+                original_filename=name,
+                is_public=True,
+            )
+        media.refresh_from_db()
+        return media
+
+    def test_identical_uploads_share_one_blob(self):
+        """Bir xil fayl bir marta saqlanadi"""
+        content = make_image(400, 300)
+        first = self.create_media(content, 'apple_en.png')
+        second = self.create_media(content, 'apple_uz.png')
+        other = self.create_media(make_image(300, 300), 'pear.png')
+
+        digest = hashlib.sha256(content).hexdigest()
+        self.assertEqual(first.file.name, f'cas/{digest[:2]}/{digest[2:4]}/{digest}.png')
+        self.assertEqual(second.file.name, first.file.name)
+        self.assertNotEqual(other.file.name, first.file.name)
+        self.assertEqual(second.original_filename, 'apple_uz.png')
+        # The duplicate reuses the variants of the first upload
+        self.assertEqual(second.variants, first.variants)
+
+    def test_unreferenced_blobs_are_swept(self):
+        """Havolasi qolmagan fayl tozalash buyrug'i bilan o'chiriladi"""
+        content = make_image(400, 300)
+        first = self.create_media(content)
+        second = self.create_media(content)
+        storage = first.file.storage
+        thumbnail = first.variants['thumbnail']['webp']
+
+        first.delete()
+        call_command('sweep_media_blobs', hours=0, stdout=io.StringIO())
+        self.assertTrue(storage.exists(second.file.name))
+        self.assertTrue(storage.exists(thumbnail))
+
+        second.delete()
+        call_command('sweep_media_blobs', stdout=io.StringIO())
+        # Recently stored: a concurrent upload of the same content may be reusing it
+        self.assertTrue(storage.exists(second.file.name))
+
+        call_command('sweep_media_blobs', hours=0, stdout=io.StringIO())
+        self.assertFalse(storage.exists(second.file.name))
+        self.assertFalse(storage.exists(thumbnail))
+
+    def test_reupload_refreshes_blob(self):
+        """Qayta yuklangan fayl tozalashdan himoyalanadi"""
+        content = make_image(400, 300)
+        media = self.create_media(content)
+        path = media.file.path
+        os.utime(path, (0, 0))
+
+        media.delete()
+        again = self.create_media(content)
+
+        self.assertEqual(again.file.name, media.file.name)
+        self.assertFalse(media.file.storage.delete_idle(again.file.name, 60 * 60))
+        self.assertTrue(os.path.exists(path))
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, IMAGE_VARIANT_WORKERS=0, MEDIA_ACCEL_REDIRECT=True)
+class PrivateMediaTestCase(TestCase):
+    """Test cases for signed private media URLs"""
+
+    def setUp(self):
+        self.content = b'%PDF-1.4 ' + bytes(range(256)) * 4
+        self.media = Media.objects.create(
+            file=SimpleUploadedFile('contract.pdf', self.content),
+            media_type='document',
+            original_filename='contract.pdf',
+        )
+
+    def test_private_file_is_stored_outside_public_tree(self):
+        """Yopiq fayl private/ ichida saqlanadi va imzolangan URL oladi"""
+        self.assertTrue(self.media.file.name.startswith('private/cas/'))
+        url = self.media.variant_url()
+        self.assertTrue(url.startswith(f'/private-media/{self.media.file.name}?'))
+        self.assertIn('signature=', url)
+
+    def test_signed_url_redirects_to_nginx(self):
+        """Imzo to'g'ri bo'lsa nginx'ga X-Accel-Redirect qaytadi"""
+        response = self.client.get(self.media.variant_url())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.media.file.name}')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+
+    def test_invalid_or_expired_signature(self):
+        """Noto'g'ri yoki muddati o'tgan imzo rad etiladi"""
+        url = self.media.variant_url()
+        self.assertEqual(self.client.get(url.replace('signature=', 'signature=0')).status_code, 404)
+        self.assertEqual(self.client.get(f'/private-media/{self.media.file.name}').status_code, 404)
+
+        expired = signed_url(self.media.file.name, ttl=-3600)
+        self.assertEqual(self.client.get(expired).status_code, 404)
+
+    @override_settings(MEDIA_ACCEL_REDIRECT=False)
+    def test_range_requests_without_nginx(self):
+        """nginx bo'lmasa fayl Range bilan qismlab yuboriladi"""
+        url = self.media.variant_url()
+
+        response = self.client.get(url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), self.content[10:20])
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(self.content)}')
+
+        response = self.client.get(url, HTTP_RANGE='bytes=-5')
+        self.assertEqual(b''.join(response.streaming_content), self.content[-5:])
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+
+        response = self.client.get(url, HTTP_RANGE=f'bytes={len(self.content)}-')
+        self.assertEqual(response.status_code, 416)
+
+
+class QuerysetProjectionTestCase(TestCase):
+    """Test cases for serializer-driven column projection"""
+
+    def test_product_list_columns(self):
+        from apps.products.serializers import ProductListSerializer
+
+        columns = serializer_columns(ProductListSerializer, 'uz')
+        self.assertIn('title_uz', columns)
+        self.assertIn('title_en', columns)
+        self.assertIn('discount', columns)
+        self.assertFalse({'title', 'description', 'description_en', 'description_uz'} & columns)
+
+    def test_unhinted_method_field_is_not_projected(self):
+        from rest_framework import serializers
+
+        class PriceSerializer(serializers.ModelSerializer):
+            total = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Product
+                fields = ['id', 'total']
+
+            def get_total(self, obj):
+                return obj.discount_price
+
+        queryset = Product.objects.all()
+        self.assertIsNone(serializer_columns(PriceSerializer, 'en'))
+        self.assertIs(project_queryset(queryset, PriceSerializer, 'en'), queryset)
+
+
+class LanguageContextTestCase(APITestCase):
+    """Test cases for per-request language negotiation"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_query_beats_header_beats_device(self):
+        device = SimpleNamespace(language='CRL')
+
+        request = self.factory.get('/', {'lang': 'en'}, HTTP_ACCEPT_LANGUAGE='uz')
+        request.device = device
+        self.assertEqual(negotiate(request).code, 'en')
+
+        request = self.factory.get('/', HTTP_ACCEPT_LANGUAGE='uz')
+        request.device = device
+        self.assertEqual(negotiate(request).code, 'uz')
+
+        request = self.factory.get('/')
+        request.device = device
+        self.assertEqual(negotiate(request).code, 'crl')
+
+        # Same default as before negotiation, and as LANGUAGE_CODE
+        self.assertEqual(negotiate(self.factory.get('/')).code, DEFAULT_LANGUAGE)
+        self.assertEqual(DEFAULT_LANGUAGE, 'en')
+
+    def test_accept_language_quality(self):
+        self.assertEqual(parse_accept_language('fr;q=1.0, en;q=0.5, uz-UZ;q=0.8'), 'uz')
+        self.assertEqual(parse_accept_language('de, fr'), None)
+        self.assertEqual(parse_accept_language('uz-Cyrl'), 'crl')
+
+    def test_cyrillic_falls_back_to_latin_uzbek(self):
+        context = language_context('crl')
+        self.assertEqual(context.chain, ('crl', 'uz', 'en'))
+        self.assertEqual(context.content, 'uz')
+        self.assertEqual(get_message_detail('SUCCESS_MESSAGE', lang='crl')['message'],
+                         get_message_detail('SUCCESS_MESSAGE', lang='uz')['message'])
+
+    def test_language_does_not_leak_between_requests(self):
+        """So'rov tili keyingi so'rovlarga o'tmaydi"""
+        product = Product.objects.create(title_en='Apple', title_uz='Olma', price=1000, quantity=5)
+        admin = User.objects.create_user(
+            phone='+998901234501', username='admin_lang', password='AdminPass123!', is_staff=True
+        )
+        self.client.force_authenticate(admin)
+
+        response = self.client.get(f'/api/v1/admins/products/{product.id}/', {'lang': 'uz'})
+        self.assertEqual(response['Content-Language'], 'uz')
+        self.assertEqual(response.json()['data']['title'], 'Olma')
+        self.assertEqual(translation.get_language(), settings.LANGUAGE_CODE)
+
+        response = self.client.get(f'/api/v1/admins/products/{product.id}/')
+        self.assertEqual(response.json()['data']['title'], 'Apple')
+
+
+class CompiledTranslatedFieldsTestCase(TestCase):
+    """Test cases for the per-class field map of TranslatedFieldsWriteMixin"""
+
+    def test_fields_are_built_once_per_class(self):
+        from rest_framework import serializers
+
+        from apps.admins.serializers.histories import HistorySerializer
+
+        HistorySerializer().fields
+        with mock.patch.object(serializers.ModelSerializer, 'get_fields') as get_fields:
+            first, second = HistorySerializer(), HistorySerializer()
+            self.assertIn('title_uz', first.fields)
+            self.assertIn('title_en', second.fields)
+        get_fields.assert_not_called()
+
+        # Each instance binds its own field objects
+        self.assertIsNot(first.fields['title_uz'], second.fields['title_uz'])
+        self.assertIs(first.fields['title_uz'].parent, first)
+        self.assertIs(second.fields['title_uz'].parent, second)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, IMAGE_VARIANT_WORKERS=0)
+class ValuesSerializerTestCase(APITestCase):
+    """Test cases for the compiled .values() fast path of list endpoints"""
+
+    def setUp(self):
+        from apps.history.models import History
+        from apps.products.models import ProductRating
+        from apps.recipes.models import Recipe, RecipesCategory
+        from apps.users.models.device import AppVersion, Device, DeviceType
+
+        app_version = AppVersion.objects.create(version='1.0.0', is_active=True, device_type=DeviceType.ANDROID)
+        self.device = Device.objects.create(
+            device_model='Pixel 8', operation_version='Android 14', device_type=DeviceType.ANDROID,
+            device_id='values_device_001', ip_address='192.168.1.1', app_version=app_version
+        )
+
+        apple = Product.objects.create(
+            title_en='Apple', title_uz='Olma', description='Fresh', price='999.99', discount=15, quantity=3, weight=500
+        )
+        Product.objects.create(title_en='Pear', title_uz='', description='Ripe', price='10.00', quantity=0)
+        ProductRating.objects.create(device=self.device, product=apple, rating=4)
+        category = RecipesCategory.objects.create(title_en='Soups', title_uz="Sho'rvalar")
+        soup = Recipe.objects.create(title_en='Borscht', title_uz='Borsh', category=category, calories=300, cooking_time=60)
+        History.objects.create(
+            title_en='Story', title_uz='Hikoya', short_description_en='Short', short_description_uz='',
+            long_description_en='Long', button_text_en='More', button_text_uz='', button_link=None,
+            start_date=timezone.now(), end_date=timezone.now()
+        )
+        for obj, language in ((apple, 'en'), (apple, 'uz'), (soup, 'en')):
+            Media.objects.create(
+                file=SimpleUploadedFile('photo.png', make_image(10, 10), 'image/png'),
+                media_type='image',
+                original_filename=f'{language}.png',
+                content_type=ContentType.objects.get_for_model(obj),
+                object_id=obj.pk,
+                language=language,
+                is_public=True,
+            )
+
+    def get_both(self, view, url, params):
+        headers = {'HTTP_TOKEN': str(self.device.device_token)}
+        fast = self.client.get(url, params, **headers)
+        with mock.patch.object(view, 'values_fast_path', False):
+            regular = self.client.get(url, params, **headers)
+        self.assertEqual(fast.status_code, status.HTTP_200_OK)
+        return fast, regular
+
+    def test_payloads_match_serializers(self):
+        """Tezkor yo'l oddiy serializer bilan bir xil javob qaytaradi"""
+        from apps.history.views import HistoryListAPIView
+        from apps.products.views import ProductListAPIView
+        from apps.recipes.views import RecipesListAPI
+
+        for view, url in ((ProductListAPIView, '/api/v1/products/'), (RecipesListAPI, '/api/v1/recipes/'),
+                          (HistoryListAPIView, '/api/v1/history/')):
+            for params in ({'lang': 'en'}, {'lang': 'uz'}, {'lang': 'crl', 'image_size': 'thumbnail'}):
+                with self.subTest(url=url, **params):
+                    fast, regular = self.get_both(view, url, params)
+                    self.assertEqual(fast.content, regular.content)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """Sahifa uchun so'rovlar soni qatorlar soniga bog'liq emas"""
+        headers = {'HTTP_TOKEN': str(self.device.device_token)}
+        with CaptureQueriesContext(connection) as few:
+            self.client.get('/api/v1/products/', **headers)
+        for i in range(10):
+            Product.objects.create(title_en=f'Product {i}', description='-', price='1.00', quantity=1)
+        with CaptureQueriesContext(connection) as many:
+            self.client.get('/api/v1/products/', **headers)
+        self.assertEqual(len(few), len(many))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ThrottlingTestCase(TestCase):
+    """Test cases for sliding-window throttling"""
+
+    class ThrottledView(ThrottleFirstMixin, APIView):
+        throttle_scope = 'test'
+        throttle_rates = {'test': '2/min', 'test_ip': '3/min'}
+        permission_checks = 0
+
+        def check_permissions(self, request):
+            type(self).permission_checks += 1
+            super().check_permissions(request)
+
+        def get(self, request):
+            return CustomResponse.success()
+
+    def setUp(self):
+        from apps.users.models.device import AppVersion, Device, DeviceType
+
+        cache.clear()
+        self.factory = RequestFactory()
+        self.ThrottledView.permission_checks = 0
+        app_version = AppVersion.objects.create(version='1.0.0', is_active=True, device_type=DeviceType.ANDROID)
+        self.tokens = [
+            str(Device.objects.create(
+                device_model='Pixel 8', operation_version='Android 14', device_type=DeviceType.ANDROID,
+                device_id=f'throttled_device_{i}', ip_address='192.168.1.1', app_version=app_version
+            ).device_token) for i in range(3)
+        ]
+
+    def test_sliding_window(self):
+        """Oldingi oyna o'tgan vaqtga qarab kamayadi"""
+        start = 6000.0
+        self.assertEqual([hit('key', 3, 60, now=start + i) for i in range(3)], [0, 0, 0])
+        self.assertEqual(hit('key', 3, 60, now=start + 3), 57)
+
+        # Yarim oyna o'tgach oldingi 3 ta so'rov 1.5 ta hisoblanadi
+        self.assertEqual(hit('key', 3, 60, now=start + 60 + 30), 0)
+        self.assertGreater(hit('key', 3, 60, now=start + 60 + 30), 0)
+
+    def test_throttled_before_permissions(self):
+        """Cheklovdan oshgan so'rov ruxsat tekshiruvigacha rad etiladi"""
+        view = self.ThrottledView.as_view()
+
+        for _ in range(2):
+            self.assertEqual(view(self.factory.get('/', HTTP_TOKEN=self.tokens[0])).status_code, status.HTTP_200_OK)
+        response = view(self.factory.get('/', HTTP_TOKEN=self.tokens[0]))
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(self.ThrottledView.permission_checks, 2)
+
+        # Boshqa qurilma, lekin IP bo'yicha limit 3 ta
+        self.assertEqual(view(self.factory.get('/', HTTP_TOKEN=self.tokens[1])).status_code, status.HTTP_200_OK)
+        response = view(self.factory.get('/', HTTP_TOKEN=self.tokens[2]))
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_spoofed_identities_are_not_trusted(self):
+        """X-Forwarded-For va o'ylab topilgan tokenlar yangi limit bermaydi"""
+        view = self.ThrottledView.as_view()
+
+        # Ro'yxatdan o'tmagan tokenlar IP bo'yicha qurilma limitiga tushadi
+        for token in ('made-up-1', str(uuid.uuid4())):
+            self.assertEqual(view(self.factory.get('/', HTTP_TOKEN=token)).status_code, status.HTTP_200_OK)
+        response = view(self.factory.get('/', HTTP_TOKEN=str(uuid.uuid4())))
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        cache.clear()
+        for i in range(3):
+            request = self.factory.get('/', HTTP_X_FORWARDED_FOR=f'10.0.0.{i}')
+            self.assertEqual(view(request).status_code, status.HTTP_200_OK)
+        response = view(self.factory.get('/', HTTP_X_FORWARDED_FOR='10.0.0.9'))
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_user_ident_without_queries(self):
+        """Foydalanuvchi JWT dan bazaga murojaatsiz aniqlanadi"""
+        user = User.objects.create_user(phone='+998901234502', username='throttled', password='Pass123!')
+        token = str(RefreshToken.for_user(user).access_token)
+        request = Request(self.factory.get('/', HTTP_AUTHORIZATION=f'Bearer {token}'))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(UserThrottle().get_ident(request), str(user.id))
+        self.assertIsNone(UserThrottle().get_ident(Request(self.factory.get('/', HTTP_AUTHORIZATION='Bearer x'))))
+
+    def test_cache_failure_fails_open(self):
+        """Kesh ishlamasa so'rovlar o'tkaziladi"""
+        view = self.ThrottledView.as_view()
+        with mock.patch.object(cache, 'incr', side_effect=ConnectionError):
+            for _ in range(5):
+                self.assertEqual(view(self.factory.get('/', HTTP_TOKEN=self.tokens[0])).status_code, status.HTTP_200_OK)
+
+    def test_file_cache_keeps_concurrent_hits(self):
+        """Fayl keshida parallel so'rovlar hisobi yo'qolmaydi"""
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        file_cache = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': cache_dir}}
+
+        with override_settings(CACHES=file_cache), ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: hit('key', 20, 60, now=6000.0), range(40)))
+            self.assertEqual(cache.get('key:100'), 20)
+
+        self.assertEqual(results.count(0), 20)
+
+
+class DatabaseConnectionsTestCase(APITestCase):
+    """Test cases for wait_for_db and connection metrics"""
+
+    def test_wait_for_db_retries(self):
+        """Baza tayyor bo'lguncha kutadi"""
+        with mock.patch('django.db.backends.base.base.BaseDatabaseWrapper.ensure_connection',
+                        side_effect=[OperationalError, OperationalError, None]) as ensure_connection, \
+                mock.patch('apps.shared.management.commands.wait_for_db.time.sleep') as sleep:
+            call_command('wait_for_db', stdout=io.StringIO())
+
+        self.assertEqual(ensure_connection.call_count, 3)
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [0.5, 1])
+
+    def test_wait_for_db_timeout(self):
+        """Muddat tugasa xato beradi"""
+        with mock.patch('django.db.backends.base.base.BaseDatabaseWrapper.ensure_connection',
+                        side_effect=OperationalError), \
+                mock.patch('apps.shared.management.commands.wait_for_db.time.sleep'):
+            with self.assertRaises(CommandError):
+                call_command('wait_for_db', timeout=0, stdout=io.StringIO())
+
+    def test_connection_stats(self):
+        """Admin ulanishlar statistikasini ko'radi"""
+        admin = User.objects.create_user(
+            phone='+998901234503', username='admin_db', password='AdminPass123!', is_staff=True
+        )
+        self.client.force_authenticate(admin)
+
+        response = self.client.get('/api/v1/admins/system/database/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()['data']
+        self.assertEqual(data['alias'], 'default')
+        self.assertGreaterEqual(data['opened'], 1)
+        self.assertIsNone(data['pool'])
+
+    def test_connection_stats_with_pool(self):
+        """Pool statistikasi (psycopg_pool.get_stats) o'qiladi"""
+        pool = SimpleNamespace(get_stats=lambda: {
+            'pool_min': 1, 'pool_max': 4, 'pool_size': 3, 'pool_available': 1,
+            'requests_waiting': 2, 'requests_queued': 7, 'requests_wait_ms': 120,
+            'requests_errors': 1, 'connections_errors': 2,
+        })
+
+        with mock.patch.object(connection, 'pool', pool, create=True):
+            stats = connection_stats('default')
+
+        self.assertEqual(stats['pool'], {
+            'size': 3, 'available': 1, 'checked_out': 2, 'min_size': 1, 'max_size': 4,
+            'waiting': 2, 'waits': 7, 'wait_ms': 120, 'errors': 3,
+        })
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    DATABASE_REPLICAS=['replica'],
+)
+class ReplicaRoutingTestCase(SimpleTestCase):
+    """Test cases for read-replica routing"""
+
+    def setUp(self):
+        cache.clear()
+        db_router._health.clear()
+        self.router = db_router.ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def route(self, request):
+        """So'rov ichida o'qish qaysi bazaga yuborilishi"""
+        routed = []
+
+        def get_response(request):
+            routed.append(self.router.db_for_read(Product))
+            return HttpResponse(status=201 if request.method == 'POST' else 200)
+
+        ReplicaRoutingMiddleware(get_response)(request)
+        return routed[0]
+
+    @mock.patch('apps.shared.utils.db_router.is_healthy', return_value=True)
+    def test_reads_outside_requests_use_primary(self, is_healthy):
+        """So'rovdan tashqarida va yozishda asosiy baza"""
+        self.assertIsNone(self.router.db_for_read(Product))
+        self.assertEqual(self.router.db_for_write(Product), 'default')
+        with db_router.replica_reads():
+            self.assertEqual(self.router.db_for_read(Product), 'replica')
+        self.assertFalse(self.router.allow_migrate('replica', 'products'))
+
+    @mock.patch('apps.shared.utils.db_router.is_healthy', return_value=True)
+    def test_read_your_writes(self, is_healthy):
+        """Yozgan qurilma qisqa vaqt asosiy bazadan o'qiydi"""
+        self.assertEqual(self.route(self.factory.get('/', HTTP_TOKEN='device-1')), 'replica')
+        self.assertIsNone(self.route(self.factory.post('/', HTTP_TOKEN='device-1')))
+
+        self.assertIsNone(self.route(self.factory.get('/', HTTP_TOKEN='device-1')))
+        self.assertEqual(self.route(self.factory.get('/', HTTP_TOKEN='device-2')), 'replica')
+
+        with mock.patch('apps.shared.utils.db_router.cache.get_many', return_value={}):
+            self.assertEqual(self.route(self.factory.get('/', HTTP_TOKEN='device-1')), 'replica')
+
+    def test_unhealthy_replica_falls_back(self):
+        """Ishlamayotgan yoki orqada qolgan replika ishlatilmaydi"""
+        with db_router.replica_reads():
+            with mock.patch('apps.shared.utils.db_router._replica_lag', return_value=60):
+                self.assertIsNone(self.router.db_for_read(Product))
+
+            # Holat HEALTH_CHECK_INTERVAL davomida saqlanadi
+            with mock.patch('apps.shared.utils.db_router._replica_lag', return_value=0):
+                self.assertIsNone(self.router.db_for_read(Product))
+                db_router._health.clear()
+                self.assertEqual(self.router.db_for_read(Product), 'replica')
+
+        db_router._health.clear()
+        with mock.patch('apps.shared.utils.db_router._replica_lag', side_effect=OperationalError), \
+                mock.patch('apps.shared.utils.db_router.connections') as connections:
+            self.assertFalse(db_router.is_healthy('replica'))
+        connections['replica'].close.assert_called_once()
@@ -0,0 +1,305 @@
+"""
+Bulk import of serializer-validated rows from CSV / NDJSON / JSON uploads.
+
+Rows are read lazily (a JSON array item by item) and handled in chunks: every
+row is validated with the model's regular admin serializer (one serializer
+instance, so fields are built once), valid rows of a chunk are inserted with a single ``bulk_create`` and
+their media files, taken from an optional zip archive, with another one.
+Invalid rows are skipped and reported with their line number.
+"""
+import csv
+import io
+import json
+import os
+import zipfile
+from typing import Dict, Iterator, List, Tuple
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.base import ContentFile
+from django.db import transaction
+from rest_framework import serializers
+
+from apps.shared.exceptions.custom_exceptions import CustomException
+from apps.shared.utils.image_variants import schedule_variants
+from apps.shared.utils.uploads import SNIFF_BYTES, check_upload, media_type_for, sniff_mime
+
+IMPORT_FORMATS = ('csv', 'ndjson', 'json')
+MEDIA_SEPARATOR = ';'
+JSON_READ_SIZE = 64 * 1024
+MAX_JSON_ROW_CHARS = 1024 * 1024
+JSON_WHITESPACE = ' \t\n\r'
+
+
+def iter_json_array(text) -> Iterator[object]:
+    """
+    Yield the items of the top-level JSON array of ``text`` one by one, reading it
+    JSON_READ_SIZE characters at a time: only the item being decoded is held in
+    memory, never the whole array. Raises ValueError for invalid JSON.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = '', 0, False
+    state = 'start'  # start -> first -> (separator -> item)*
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in JSON_WHITESPACE:
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                raise ValueError('Unexpected end of JSON array')
+            chunk = text.read(JSON_READ_SIZE)
+            buffer, pos, eof = chunk, 0, not chunk
+            continue
+
+        char = buffer[pos]
+        if state == 'start':
+            if char != '[':
+                raise ValueError('File must contain a JSON array')
+            pos, state = pos + 1, 'first'
+        elif state == 'separator':
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError(f"Expecting ',' or ']' after row, got {char!r}")
+            pos, state = pos + 1, 'item'
+        elif char == ']' and state == 'first':
+            return
+        else:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                item, end = None, None
+            # An item touching the end of the buffer may be cut (a number, or an object not read yet)
+            if end is None or (end == len(buffer) and not eof):
+                if eof:
+                    raise ValueError('Invalid JSON row')
+                if len(buffer) - pos > MAX_JSON_ROW_CHARS:
+                    raise ValueError(f'Invalid JSON row or row longer than {MAX_JSON_ROW_CHARS} characters')
+                chunk = text.read(JSON_READ_SIZE)
+                buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+                continue
+            yield item
+            pos, state = end, 'separator'
+
+
+def read_rows(uploaded_file, file_type: str) -> Iterator[Tuple[int, object]]:
+    """Yield (line number, row) pairs; a row that can't be parsed is yielded as an exception"""
+    text = io.TextIOWrapper(uploaded_file, encoding='utf-8-sig', newline='')
+    if file_type == 'json':
+        # A JSON array has no useful line numbers, rows are numbered from 1
+        number = 0
+        try:
+            for number, row in enumerate(iter_json_array(text), start=1):
+                yield number, row if isinstance(row, dict) else ValueError('Row must be a JSON object')
+        except ValueError as exc:
+            # The rest of the file can't be parsed, the rows before it are imported
+            yield number + 1, exc
+    elif file_type == 'ndjson':
+        for line_no, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield line_no, exc
+                continue
+            yield line_no, row if isinstance(row, dict) else ValueError('Row must be a JSON object')
+    else:
+        # Header is line 1
+        for line_no, row in enumerate(csv.DictReader(text), start=2):
+            yield line_no, row
+
+
+def _memoized(to_internal_value):
+    cache = {}
+
+    def wrapper(data):
+        key = str(data)
+        if key not in cache:
+            cache[key] = to_internal_value(data)
+        return cache[key]
+    return wrapper
+
+
+class BulkImporter:
+    """
+    Validate rows with ``serializer_class`` and insert them in chunks.
+
+    Media columns hold file names inside ``archive`` separated by ';', e.g.
+    ``images_en: "apple.jpg;apple-2.jpg"`` (or a JSON list). Subclasses can override
+    ``check_chunk``, ``build_instance``, ``after_insert`` and ``result_for`` for models
+    with nested rows.
+    """
+    chunk_size = 1000
+
+    def __init__(self, serializer_class, context=None, archive=None, chunk_size=None):
+        self.validator = serializer_class(context=context or {})
+        self.model = self.validator.Meta.model
+        self.archive = zipfile.ZipFile(archive) if archive else None
+        self.archive_names = set(self.archive.namelist()) if self.archive else set()
+        self.chunk_size = chunk_size or self.chunk_size
+        request = (context or {}).get('request')
+        self.user = request.user if request and request.user.is_authenticated else None
+        self.media_columns = self._media_columns()
+        self._memoize_related_fields()
+        self.results = []
+        self.errors = []
+
+    def _memoize_related_fields(self):
+        """Look every referenced object up once per import instead of once per row"""
+        for field in self.validator.fields.values():
+            if isinstance(field, serializers.PrimaryKeyRelatedField) and not field.read_only:
+                field.to_internal_value = _memoized(field.to_internal_value)
+
+    def _media_columns(self) -> Dict[str, Tuple[str, object]]:
+        """Map media column name -> (media type, language code or None)"""
+        media_fields = getattr(self.validator, 'media_fields', [])
+        translatable_fields = getattr(self.validator, 'translatable_fields', [])
+        columns = {}
+        for field_name in media_fields:
+            media_type = media_type_for(field_name)
+            if field_name in translatable_fields:
+                for lang_code, _ in settings.LANGUAGES:
+                    columns[f'{field_name}_{lang_code.lower()}'] = (media_type, lang_code)
+            else:
+                columns[field_name] = (media_type, None)
+        return columns
+
+    def run(self, rows) -> dict:
+        chunk = []
+        for line_no, row in rows:
+            chunk.append((line_no, row))
+            if len(chunk) >= self.chunk_size:
+                self._import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk)
+
+        return {
+            'created': len(self.results),
+            'failed': len(self.errors),
+            'results': self.results,
+            'errors': self.errors,
+        }
+
+    def _clean_row(self, row):
+        # Empty CSV cells mean "not provided" except for text fields
+        fields = self.validator.fields
+        return {
+            key: value for key, value in row.items()
+            if key and (value != '' or isinstance(fields.get(key), serializers.CharField))
+        }
+
+    def _validate(self, row):
+        if isinstance(row, Exception):
+            raise serializers.ValidationError({'row': str(row)})
+
+        row = self._clean_row(row)
+        media = {}
+        for column in self.media_columns:
+            value = row.pop(column, None) or ''
+            names = value if isinstance(value, list) else value.split(MEDIA_SEPARATOR)
+            names = [name.strip() for name in names if name and name.strip()]
+            missing = [name for name in names if name not in self.archive_names]
+            if missing:
+                raise serializers.ValidationError({column: f'Files not found in archive: {missing}'})
+            for name in names:
+                try:
+                    check_upload(self.media_columns[column][0], self.archive.getinfo(name).file_size)
+                except CustomException as exc:
+                    raise serializers.ValidationError({column: f'{name}: {exc.message_key}'})
+            media[column] = names
+
+        return self.validator.run_validation(row), media
+
+    def _import_chunk(self, chunk):
+        valid: List[Tuple[int, dict, dict]] = []
+        for line_no, row in chunk:
+            try:
+                valid.append((line_no, *self._validate(row)))
+            except serializers.ValidationError as exc:
+                self.add_error(line_no, exc.detail)
+
+        valid = self.check_chunk(valid)
+        if not valid:
+            return
+
+        attrs_list = [attrs for _, attrs, _ in valid]
+        with transaction.atomic():
+            instances = self.model.objects.bulk_create([self.build_instance(attrs) for attrs in attrs_list])
+            self._attach_media(instances, [media for _, _, media in valid])
+            self.after_insert(instances, attrs_list)
+        self.results.extend(
+            self.result_for(line_no, instance, attrs)
+            for (line_no, attrs, _), instance in zip(valid, instances)
+        )
+
+    def add_error(self, line_no, errors):
+        self.errors.append({'line': line_no, 'errors': errors})
+
+    def check_chunk(self, rows):
+        """Hook for checks that need the whole chunk (one query instead of one per row)"""
+        return rows
+
+    def build_instance(self, attrs):
+        return self.model(**attrs)
+
+    def after_insert(self, instances, attrs_list):
+        """Hook for inserting related rows of the chunk"""
+
+    def result_for(self, line_no, instance, attrs):
+        return {'line': line_no, 'id': instance.pk}
+
+    def _attach_media(self, instances, media_list):
+        from apps.shared.models import Media
+
+        content_type = ContentType.objects.get_for_model(self.model)
+        media_objects = []
+        for instance, media in zip(instances, media_list):
+            for column, names in media.items():
+                media_type, language = self.media_columns[column]
+                for name in names:
+                    data = self.archive.read(name)
+                    filename = os.path.basename(name)
+                    media_objects.append(Media(
+                        content_type=content_type,
+                        object_id=instance.pk,
+                        file=ContentFile(data, name=filename),
+                        media_type=media_type,
+                        file_size=len(data),
+                        mime_type=sniff_mime(data[:SNIFF_BYTES]),
+                        original_filename=filename,
+                        uploaded_by=self.user,
+                        language=language,
+                        is_public=True,
+                    ))
+        if media_objects:
+            # FileField.pre_save stores every file during the bulk insert
+            Media.objects.bulk_create(media_objects)
+            # bulk_create sends no post_save
+            schedule_variants(media.pk for media in media_objects if media.media_type == 'image')
+
+
+def import_from_request(request, serializer_class, importer_class=BulkImporter, formats=IMPORT_FORMATS) -> dict:
+    """
+    Run an import from a multipart request: ``file`` (one of ``formats``, detected from
+    ``file_type`` or the file extension) and an optional ``images`` zip archive.
+    """
+    from apps.shared.exceptions.custom_exceptions import CustomException
+
+    uploaded = request.FILES.get('file')
+    if uploaded is None:
+        raise CustomException(message_key='VALIDATION_ERROR', context={'file': 'This field is required.'})
+
+    file_type = request.data.get('file_type') or os.path.splitext(uploaded.name)[1].lstrip('.').lower()
+    if file_type == 'jsonl':
+        file_type = 'ndjson'
+    if file_type not in formats:
+        raise CustomException(message_key='VALIDATION_ERROR', context={'file_type': file_type})
+
+    archive = request.FILES.get('images')
+    if archive is not None and not zipfile.is_zipfile(archive):
+        raise CustomException(message_key='VALIDATION_ERROR', context={'images': 'Must be a zip archive.'})
+
+    importer = importer_class(serializer_class, context={'request': request}, archive=archive)
+    return importer.run(read_rows(uploaded, file_type))
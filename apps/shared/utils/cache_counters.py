@@ -0,0 +1,66 @@
+"""
+Counters in the default cache that concurrent uwsgi workers can't overshoot.
+
+Redis, memcached and LocMemCache (one process only) increment atomically and keep
+the key's timeout. Other backends implement ``incr`` as get-then-set, which loses
+increments between workers and resets the timeout to the default: on the file
+cache (``CACHE_URL`` default) counters are updated under an exclusive ``flock`` on
+a file of the cache directory instead, shared by every worker of the volume. Other
+backends can't hold counters.
+"""
+import fcntl
+import os
+from contextlib import contextmanager
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.memcached import BaseMemcachedCache
+from django.core.cache.backends.redis import RedisCache
+
+# Backends whose incr() and add() are atomic and keep the key's timeout
+ATOMIC_CACHE_BACKENDS = (RedisCache, BaseMemcachedCache, LocMemCache)
+LOCK_FILENAME = '.counters.lock'
+
+
+def has_atomic_counters() -> bool:
+    return isinstance(caches[DEFAULT_CACHE_ALIAS], ATOMIC_CACHE_BACKENDS)
+
+
+def supports_counters() -> bool:
+    """Atomic backends, and the file cache through counter_lock()"""
+    return has_atomic_counters() or isinstance(caches[DEFAULT_CACHE_ALIAS], FileBasedCache)
+
+
+@contextmanager
+def counter_lock():
+    """Serialize counter updates across processes, a no-op on atomic backends"""
+    backend = caches[DEFAULT_CACHE_ALIAS]
+    if not isinstance(backend, FileBasedCache):
+        yield
+        return
+    os.makedirs(backend._dir, exist_ok=True)
+    with open(os.path.join(backend._dir, LOCK_FILENAME), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def incr(key, timeout, delta=1) -> int:
+    """
+    Add ``delta`` to the counter ``key`` living for ``timeout`` seconds and return it;
+    on a non-atomic backend the caller holds counter_lock().
+    """
+    if not has_atomic_counters():
+        value = cache.get(key, 0) + delta
+        cache.set(key, value, timeout=timeout)
+        return value
+    cache.add(key, 0, timeout=timeout)
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        # Expired between add() and incr()
+        cache.set(key, delta, timeout=timeout)
+        return delta
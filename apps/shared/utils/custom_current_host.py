@@ -49,3 +49,19 @@ def get_client_ip(request: HttpRequest) -> Optional[str]:
 
     # Fallback to direct connection IP
     return request.META.get('REMOTE_ADDR')
+
+
+def get_remote_ip(request: HttpRequest) -> Optional[str]:
+    """
+    IP address of the connection the request came from (``REMOTE_ADDR``).
+
+    nginx sets it from ``$remote_addr`` but passes X-Forwarded-For through from the
+    client, so unlike ``get_client_ip`` it can't be spoofed: use it for rate limits.
+    Args:
+        request: Django HttpRequest object
+    Returns:
+        Client IP address as string, or None if not found
+    """
+    if not request:
+        return None
+    return request.META.get('REMOTE_ADDR')
@@ -6,6 +6,7 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 
 from apps.shared.exceptions.translator import get_message_detail
+from apps.shared.utils.language import get_language_context
 
 logger = logging.getLogger(__name__)
 
@@ -18,20 +19,8 @@ class ResponseBody:
     context: Optional[Dict[str, Any]] = None
 
     def get_language(self) -> str:
-        """
-        Extract language from request headers.
-        Supports Accept-Language header with quality values.
-
-        Examples:
-            'en-US,en;q=0.9' -> 'en-US'
-            'uz' -> 'uz'
-        """
-        if self.request and hasattr(self.request, 'headers'):
-            accept_lang = self.request.headers.get('Accept-Language', 'en')
-            # Parse Accept-Language header (remove quality values)
-            lang = accept_lang.split(';')[0].split(',')[0].strip()
-            return lang
-        return 'en'
+        """Language negotiated for the request (see apps.shared.utils.language)"""
+        return get_language_context(self.request).code
 
     def to_dict(self, **kwargs) -> Dict[str, Any]:
         """
@@ -0,0 +1,50 @@
+"""
+Database connection metrics of the current process (one uwsgi worker).
+
+With a psycopg pool (``DB_POOL``) the pool's own statistics are reported:
+connections checked out, requests waiting / that had to wait, and errors.
+Either way the process counts the connections Django opened: with persistent
+connections (``CONN_MAX_AGE``) each of them paid the TCP/TLS/auth handshake, with
+a pool they are checkouts and only ``pool.size`` were really established.
+"""
+import threading
+from typing import Any, Dict
+
+from django.db import connections
+
+_lock = threading.Lock()
+_opened: Dict[str, int] = {}
+
+
+def record_connection(alias: str):
+    """Count a new database connection (connection_created, see apps.shared.signals)"""
+    with _lock:
+        _opened[alias] = _opened.get(alias, 0) + 1
+
+
+def connection_stats(alias: str = 'default') -> Dict[str, Any]:
+    connection = connections[alias]
+    settings_dict = connection.settings_dict
+    stats = {
+        'alias': alias,
+        'vendor': connection.vendor,
+        'opened': _opened.get(alias, 0),
+        'conn_max_age': settings_dict['CONN_MAX_AGE'],
+        'health_checks': settings_dict['CONN_HEALTH_CHECKS'],
+        'pool': None,
+    }
+    pool = getattr(connection, 'pool', None)
+    if pool is not None:
+        raw = pool.get_stats()
+        stats['pool'] = {
+            'size': raw.get('pool_size', 0),
+            'available': raw.get('pool_available', 0),
+            'checked_out': raw.get('pool_size', 0) - raw.get('pool_available', 0),
+            'min_size': raw.get('pool_min'),
+            'max_size': raw.get('pool_max'),
+            'waiting': raw.get('requests_waiting', 0),
+            'waits': raw.get('requests_queued', 0),
+            'wait_ms': raw.get('requests_wait_ms', 0),
+            'errors': raw.get('requests_errors', 0) + raw.get('connections_errors', 0),
+        }
+    return stats
@@ -0,0 +1,146 @@
+"""
+Read-replica routing with read-your-writes stickiness.
+
+Replicas are the ``DATABASES`` aliases listed in ``DATABASE_REPLICAS``. Reads go
+to a replica only inside a request that ``ReplicaRoutingMiddleware`` marked as
+replica-safe:
+
+* a GET/HEAD/OPTIONS request whose device, user or IP hasn't written in the last
+  ``READ_YOUR_WRITES_SECONDS`` (a write request pins its device and user, or its
+  IP when it has neither, to the primary in the shared cache);
+* outside of a transaction on the primary.
+
+Everything else (writes, management commands, background threads) uses the primary.
+
+A replica is used while it answers and its replay lag is under ``REPLICA_MAX_LAG``
+seconds; each process checks that at most once per ``HEALTH_CHECK_INTERVAL``, and
+with no usable replica reads fall back to the primary.
+"""
+import contextvars
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_INTERVAL = 5  # seconds
+PIN_KEY = 'db:primary:{}'
+
+# True while the current request may read from replicas
+_replica_reads = contextvars.ContextVar('replica_reads', default=False)
+
+_lock = threading.Lock()
+_health: Dict[str, Tuple[float, bool]] = {}
+
+# Replay lag, 0 when the replica has replayed everything it received (idle primary)
+LAG_SQL = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+def replicas() -> List[str]:
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def _replica_lag(alias) -> float:
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        connection.ensure_connection()
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(LAG_SQL)
+        return float(cursor.fetchone()[0] or 0)
+
+
+def is_healthy(alias: str) -> bool:
+    """Whether ``alias`` answers and lags less than REPLICA_MAX_LAG, rechecked every HEALTH_CHECK_INTERVAL"""
+    now = time.monotonic()
+    checked_at, healthy = _health.get(alias, (None, False))
+    if checked_at is not None and now - checked_at < HEALTH_CHECK_INTERVAL:
+        return healthy
+
+    with _lock:
+        # Only one thread checks, the others keep the previous state
+        checked_at, healthy = _health.get(alias, (None, False))
+        if checked_at is not None and now - checked_at < HEALTH_CHECK_INTERVAL:
+            return healthy
+        _health[alias] = (now, healthy)
+
+    try:
+        lag = _replica_lag(alias)
+        healthy = lag <= getattr(settings, 'REPLICA_MAX_LAG', 5)
+        if not healthy:
+            logger.warning('Replica %s lags %.1f seconds, reading from the primary', alias, lag)
+    except Exception:
+        logger.warning('Replica %s unavailable, reading from the primary', alias, exc_info=True)
+        connections[alias].close()
+        healthy = False
+    _health[alias] = (time.monotonic(), healthy)
+    return healthy
+
+
+def pin(identities: Iterable[str]):
+    """Keep ``identities`` on the primary for READ_YOUR_WRITES_SECONDS"""
+    timeout = getattr(settings, 'READ_YOUR_WRITES_SECONDS', 15)
+    keys = {PIN_KEY.format(identity): 1 for identity in identities if identity}
+    if not keys:
+        return
+    try:
+        cache.set_many(keys, timeout=timeout)
+    except Exception:
+        logger.warning('Could not pin %s to the primary', list(keys), exc_info=True)
+
+
+def is_pinned(identities: Iterable[str]) -> bool:
+    keys = [PIN_KEY.format(identity) for identity in identities if identity]
+    if not keys:
+        return False
+    try:
+        return bool(cache.get_many(keys))
+    except Exception:
+        # Can't tell, the primary is always up to date
+        logger.warning('Read-your-writes pins unavailable', exc_info=True)
+        return True
+
+
+@contextmanager
+def replica_reads(enabled: bool = True):
+    """Let (or, with enabled=False, stop) the reads of the block go to replicas"""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    """Database router sending replica-safe reads to a healthy replica"""
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        healthy = [alias for alias in replicas() if is_healthy(alias)]
+        return random.choice(healthy) if healthy else None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema through replication
+        return db not in replicas()
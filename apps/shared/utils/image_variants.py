@@ -0,0 +1,142 @@
+"""
+Responsive image variants for uploaded ``Media``.
+
+After an image upload commits, its id is handed to a small per-process thread pool
+(Pillow releases the GIL while decoding, resizing and encoding) that writes a
+WebP and a JPEG copy for every size in ``VARIANT_SIZES`` to the media storage and
+records them, with the original dimensions, on the ``Media`` row. Clients then ask
+for ``?image_size=thumbnail`` instead of downloading the full-resolution photo.
+"""
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+# Longest side in pixels; images are never upscaled
+VARIANT_SIZES = {
+    'thumbnail': 200,
+    'medium': 600,
+    'large': 1200,
+}
+# format key -> (Pillow format, extension)
+VARIANT_FORMATS = {
+    'webp': ('WEBP', 'webp'),
+    'jpeg': ('JPEG', 'jpg'),
+}
+QUALITY = 82
+
+
+def _encode(image, pil_format):
+    if pil_format == 'JPEG' and image.mode != 'RGB':
+        # JPEG has no alpha channel
+        image = image.convert('RGB')
+    buffer = io.BytesIO()
+    image.save(buffer, pil_format, quality=QUALITY)
+    return buffer.getvalue()
+
+
+def generate_variants(media):
+    """Write every size/format variant of ``media`` to its storage and record them on the row"""
+    from apps.shared.models import Media
+
+    # Deduplicated uploads share the blob, and so its variants
+    shared = (
+        Media.objects.filter(file=media.file.name).exclude(pk=media.pk).exclude(variants={})
+        .values('width', 'height', 'variants').first()
+    )
+    if shared:
+        Media.objects.filter(pk=media.pk).update(**shared)
+        media.width, media.height, media.variants = shared['width'], shared['height'], shared['variants']
+        return
+
+    with media.file.open('rb') as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+
+    storage = media.file.storage
+    stem = os.path.splitext(media.file.name)[0]
+    variants = {}
+    for size_name, size in VARIANT_SIZES.items():
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+        variant = {'width': resized.width, 'height': resized.height}
+        for format_key, (pil_format, extension) in VARIANT_FORMATS.items():
+            variant[format_key] = storage.save(
+                f'{stem}_{size_name}.{extension}', ContentFile(_encode(resized, pil_format))
+            )
+        variants[size_name] = variant
+
+    Media.objects.filter(pk=media.pk).update(width=image.width, height=image.height, variants=variants)
+    media.width, media.height, media.variants = image.width, image.height, variants
+
+
+def process_media(media_ids: Iterable[int]):
+    from apps.shared.models import Media
+
+    for media in Media.objects.filter(pk__in=list(media_ids), media_type='image'):
+        try:
+            generate_variants(media)
+        except (UnidentifiedImageError, OSError):
+            logger.warning('Could not generate variants for media %s', media.pk, exc_info=True)
+
+
+class VariantPipeline:
+    """
+    Fork-aware thread pool running ``process_media``; with ``IMAGE_VARIANT_WORKERS = 0``
+    images are processed inline instead.
+    """
+
+    def __init__(self):
+        self._pid = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                # Forked uwsgi workers must not share the parent's threads
+                self._pid = os.getpid()
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.IMAGE_VARIANT_WORKERS, thread_name_prefix='image-variants'
+                )
+            return self._executor
+
+    def submit(self, media_ids):
+        media_ids = list(media_ids)
+        if not media_ids:
+            return
+        if settings.IMAGE_VARIANT_WORKERS <= 0:
+            process_media(media_ids)
+            return
+        self._get_executor().submit(self._run, media_ids)
+
+    @staticmethod
+    def _run(media_ids):
+        try:
+            process_media(media_ids)
+        except Exception:
+            logger.exception('Image variant generation failed')
+        finally:
+            # Pool threads own their connections; don't keep them open while idle
+            close_old_connections()
+
+
+pipeline = VariantPipeline()
+
+
+def schedule_variants(media_ids):
+    """Generate variants for ``media_ids`` once the current transaction commits"""
+    media_ids = list(media_ids)
+    transaction.on_commit(lambda: pipeline.submit(media_ids))
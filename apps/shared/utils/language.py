@@ -0,0 +1,124 @@
+"""
+Per-request language negotiation.
+
+The language of a request is resolved once, by ``DeviceLanguageMiddleware``, from
+(in order) the ``?lang=`` query parameter, the ``Accept-Language`` header and the
+calling device's language, and kept on the request as a ``LanguageContext``.
+
+Every supported language has a precompiled fallback chain (``crl`` -> ``uz`` -> ``en``).
+Messages are looked up along the whole chain; translated model content only exists
+in ``settings.LANGUAGES``, so it uses ``content_chain``, the part of the chain that
+has columns.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.utils import translation
+
+DEFAULT_LANGUAGE = 'en'
+FINAL_FALLBACK = 'en'
+# language -> languages tried before FINAL_FALLBACK
+FALLBACKS = {
+    'en': (),
+    'uz': (),
+    'crl': ('uz',),
+    'ru': (),
+}
+# Other spellings clients send
+ALIASES = {
+    'cyrl': 'crl',
+    'uz-cyrl': 'crl',
+    'uz-latn': 'uz',
+}
+
+
+@dataclass(frozen=True)
+class LanguageContext:
+    code: str
+    chain: Tuple[str, ...]
+    content_chain: Tuple[str, ...]
+
+    @property
+    def content(self) -> str:
+        """Language translated model fields are rendered in"""
+        return self.content_chain[0]
+
+    def pick(self, available: Iterable[str]) -> Optional[str]:
+        """First language of the chain in ``available``"""
+        for code in self.chain:
+            if code in available:
+                return code
+        return None
+
+
+def _compile(code):
+    chain = tuple(dict.fromkeys((code, *FALLBACKS[code], FINAL_FALLBACK)))
+    content_languages = {lang for lang, _ in settings.LANGUAGES}
+    content_chain = tuple(lang for lang in chain if lang in content_languages) or (FINAL_FALLBACK,)
+    return LanguageContext(code=code, chain=chain, content_chain=content_chain)
+
+
+CONTEXTS = {code: _compile(code) for code in FALLBACKS}
+
+
+def normalize(value: Optional[str]) -> Optional[str]:
+    """Supported language code for ``value`` ('uz-UZ' -> 'uz', 'CRL' -> 'crl'), or None"""
+    if not value:
+        return None
+    value = value.strip().lower().replace('_', '-')
+    value = ALIASES.get(value, value)
+    if value in CONTEXTS:
+        return value
+    base = value.split('-')[0]
+    return base if base in CONTEXTS else None
+
+
+def language_context(code: Optional[str]) -> LanguageContext:
+    return CONTEXTS[normalize(code) or DEFAULT_LANGUAGE]
+
+
+@lru_cache(maxsize=256)
+def parse_accept_language(header: str) -> Optional[str]:
+    """Best supported language of an Accept-Language header, honouring q-values"""
+    choices = []
+    for position, item in enumerate(header.split(',')):
+        lang, _, params = item.partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                continue
+        code = normalize(lang)
+        if code and quality > 0:
+            choices.append((-quality, position, code))
+    return min(choices)[2] if choices else None
+
+
+def negotiate(request) -> LanguageContext:
+    """Language of ``request``: ?lang= > Accept-Language > device > DEFAULT_LANGUAGE"""
+    code = normalize(request.GET.get('lang'))
+    if code is None:
+        code = parse_accept_language(request.headers.get('Accept-Language', ''))
+    if code is None:
+        device = getattr(request, 'device', None)
+        code = normalize(device.language) if device is not None else None
+    return CONTEXTS[code or DEFAULT_LANGUAGE]
+
+
+def get_language_context(request=None) -> LanguageContext:
+    """
+    Language context of ``request``, negotiated once and kept on the request.
+    Without a request, the context of the active language.
+    """
+    if request is None:
+        return language_context(translation.get_language())
+    context = getattr(request, 'language', None)
+    if isinstance(context, LanguageContext):
+        return context
+    context = negotiate(request)
+    # DRF's Request proxies attribute reads to the HttpRequest
+    getattr(request, '_request', request).language = context
+    return context
@@ -0,0 +1,104 @@
+"""
+Column projection for read endpoints.
+
+modeltranslation adds a ``<field>_<lang>`` column per language to every translated
+field, and list serializers rarely output every column of a model. ``project_queryset``
+looks at the fields a serializer renders and the active language and loads only
+those columns with ``.only()``:
+
+* plain model fields (and foreign keys behind nested serializers) by their source;
+* translated fields only in the active language and its fallbacks (modeltranslation's
+  for the field descriptor, the language context's for ``TranslatedFieldsReadMixin``);
+  the ``_<lang>`` copies the mixin pops are dropped;
+* ``SerializerMethodField`` / ``source='*'`` fields can read anything, so a serializer
+  with such fields is only projected when it lists what they read in ``source_fields``.
+
+A column that is needed but not loaded would cost a query per row, so anything the
+projection can't account for (an unhinted method field, a property source) leaves
+the queryset unchanged.
+"""
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from django.conf import settings
+from django.db import models
+from modeltranslation.manager import MultilingualQuerySet
+from modeltranslation.translator import NotRegistered, translator
+from modeltranslation.utils import build_localized_fieldname, get_language, resolution_order
+from rest_framework import serializers
+
+from apps.shared.utils.language import language_context
+
+_cache: Dict[Tuple[type, str], Optional[FrozenSet[str]]] = {}
+
+
+def translated_fields(model) -> Dict[str, object]:
+    """Translated field name -> its fallback languages override"""
+    try:
+        opts = translator.get_options_for_model(model)
+    except NotRegistered:
+        return {}
+    return {name: getattr(model, name).fallback_languages for name in opts.all_fields}
+
+
+def serializer_columns(serializer_class, language: str) -> Optional[FrozenSet[str]]:
+    """
+    Model field names ``serializer_class`` reads when rendering in ``language``,
+    or None when they can't be determined.
+    """
+    key = (serializer_class, language)
+    if key not in _cache:
+        _cache[key] = _serializer_columns(serializer_class, language)
+    return _cache[key]
+
+
+def _serializer_columns(serializer_class, language):
+    model = serializer_class.Meta.model
+    serializer = serializer_class()
+    translated = translated_fields(model)
+    hinted = set(getattr(serializer, 'source_fields', ()))
+    concrete = {field.name for field in model._meta.concrete_fields}
+    model_fields = {field.name for field in model._meta.get_fields()}
+
+    # TranslatedFieldsReadMixin replaces these with <name>_<lang> and drops the copies
+    mixin_fields = set(getattr(serializer, 'translatable_fields', [])) - set(getattr(serializer, 'media_fields', []))
+    popped = {f'{name}_{code.lower()}' for name in mixin_fields for code, _ in settings.LANGUAGES}
+    mixin_languages = language_context(language).content_chain
+
+    columns = {model._meta.pk.name} | hinted
+    rendered = set(mixin_fields)
+    for name, field in serializer.fields.items():
+        if field.write_only or name in popped:
+            continue
+        if isinstance(field, serializers.SerializerMethodField) or field.source == '*':
+            if not hinted:
+                return None
+            continue
+        source = field.source.split('.')[0]
+        if source not in model_fields and source not in hinted:
+            # A property or method could read any column
+            return None
+        rendered.add(source)
+
+    for name in rendered:
+        if name in translated:
+            languages = set(resolution_order(language, translated[name]))
+            if name in mixin_fields:
+                languages.update(mixin_languages)
+            columns.update(build_localized_fieldname(name, lang) for lang in languages)
+        elif name in concrete:
+            columns.add(name)
+    return frozenset(columns)
+
+
+def project_queryset(queryset: models.QuerySet, serializer_class, language: str = None) -> models.QuerySet:
+    """Load only the columns ``serializer_class`` renders in ``language`` (default: the active one)"""
+    model = getattr(getattr(serializer_class, 'Meta', None), 'model', None)
+    if model is not queryset.model:
+        return queryset
+    columns = serializer_columns(serializer_class, language or get_language())
+    if columns is None:
+        return queryset
+    if isinstance(queryset, MultilingualQuerySet):
+        # Don't let modeltranslation expand the names back to every language
+        return queryset.rewrite(False).only(*columns).rewrite(True)
+    return queryset.only(*columns)
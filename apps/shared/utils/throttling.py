@@ -0,0 +1,175 @@
+"""
+Sliding-window request throttling.
+
+Views opt in with ``throttle_scope`` (as with DRF's ScopedRateThrottle); the rate of
+a scope comes from the view's ``throttle_rates`` or ``DEFAULT_THROTTLE_RATES``, looked
+up as ``<scope>_<kind>`` first and then ``<scope>``, so e.g. an IP can be allowed more
+than a single device behind it.
+
+Each throttle counts requests per identity in two fixed windows of the default cache
+(which every uwsgi worker shares) and weighs the previous window by how much of it
+still overlaps the sliding window:
+
+    estimate = previous * (1 - elapsed / window) + current
+
+Counters are kept with apps.shared.utils.cache_counters: atomically on Redis or
+memcached, under a file lock on the file cache, so no hit is lost between workers
+(throttling is off on backends that can't hold counters). Identities are taken from the request before
+authentication: the connection's IP (not X-Forwarded-For, which clients can set),
+the JWT's user id claim, and the ``Token`` header of a registered device (as looked
+up by DeviceLanguageMiddleware); an unknown token is counted against its IP.
+"""
+import logging
+import math
+import time
+from typing import Optional
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.state import token_backend
+
+from apps.shared.utils.cache_counters import counter_lock, incr, supports_counters
+from apps.shared.utils.custom_current_host import get_remote_ip
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def parse_rate(rate: Optional[str]):
+    """'10/min' -> (10, 60), None -> (None, None)"""
+    if rate is None:
+        return None, None
+    num, period = rate.split('/')
+    return int(num), PERIODS[period[0]]
+
+
+def hit(key: str, limit: int, window: int, now: float = None) -> float:
+    """
+    Count a request under ``key``; returns 0 if it's within ``limit`` requests per
+    sliding ``window`` seconds, else the seconds until it would be.
+    """
+    now = time.time() if now is None else now
+    index, elapsed = divmod(now, window)
+    current_key = f'{key}:{int(index)}'
+
+    with counter_lock():
+        current = incr(current_key, timeout=2 * window)
+        previous = cache.get(f'{key}:{int(index) - 1}', 0)
+        weight = 1 - elapsed / window
+        if previous * weight + current <= limit:
+            return 0
+
+        # Denied requests don't count against the client
+        incr(current_key, timeout=2 * window, delta=-1)
+    current -= 1
+    if current >= limit or not previous:
+        return window - elapsed
+    # The previous window's weight drops until previous * weight + current + 1 <= limit
+    return max(window * (1 - (limit - current - 1) / previous) - elapsed, 1)
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """Base class, subclasses tell which identity of a request is counted"""
+    kind = None
+
+    def __init__(self):
+        self.duration = None
+
+    def get_ident(self, request) -> Optional[str]:
+        raise NotImplementedError('.get_ident() must be overridden')
+
+    def get_rate(self, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if not scope:
+            return None
+        rates = {**api_settings.DEFAULT_THROTTLE_RATES, **getattr(view, 'throttle_rates', {})}
+        return rates.get(f'{scope}_{self.kind}', rates.get(scope))
+
+    def allow_request(self, request, view):
+        limit, window = parse_rate(self.get_rate(view))
+        if limit is None or not supports_counters():
+            return True
+        ident = self.get_ident(request)
+        if ident is None:
+            return True
+        try:
+            self.duration = hit(f'throttle:{view.throttle_scope}:{self.kind}:{ident}', limit, window)
+        except Exception:
+            # Fail open, a broken cache must not take the API down
+            logger.warning('Throttle cache unavailable', exc_info=True)
+            return True
+        return not self.duration
+
+    def wait(self):
+        return math.ceil(self.duration) if self.duration else None
+
+
+def device_ident(request) -> Optional[str]:
+    """Device token of the ``Token`` header"""
+    return request.headers.get('Token') or None
+
+
+def user_ident(request) -> Optional[str]:
+    """User id claim of the request's JWT (signature checked, no query)"""
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        payload = token_backend.decode(raw_token, verify=True)
+    except TokenBackendError:
+        return None
+    user_id = payload.get(jwt_settings.USER_ID_CLAIM)
+    return None if user_id is None else str(user_id)
+
+
+def is_registered_device(request, token) -> bool:
+    """Whether ``token`` belongs to a device, reusing the lookup of DeviceLanguageMiddleware"""
+    from apps.users.models.device import Device
+
+    device = getattr(request, 'device', None)
+    if device is not None and str(device.device_token) == token:
+        return True
+    if hasattr(request, 'device'):
+        # The middleware found no device for this token
+        return False
+    try:
+        return Device.objects.filter(device_token=token).exists()
+    except (ValueError, ValidationError):
+        return False
+
+
+class DeviceThrottle(SlidingWindowThrottle):
+    """Per device, by the ``Token`` header; a made-up token is counted against the IP instead"""
+    kind = 'device'
+
+    def get_ident(self, request):
+        token = device_ident(request)
+        if token is None:
+            return None
+        if is_registered_device(request, token):
+            return token
+        return f'ip:{get_remote_ip(request)}'
+
+
+class UserThrottle(SlidingWindowThrottle):
+    """Per user, by the user id claim of the JWT"""
+    kind = 'user'
+
+    def get_ident(self, request):
+        return user_ident(request)
+
+
+class IPThrottle(SlidingWindowThrottle):
+    """Per client IP, the connection's and not X-Forwarded-For"""
+    kind = 'ip'
+
+    def get_ident(self, request):
+        return get_remote_ip(request)
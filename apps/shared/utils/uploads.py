@@ -0,0 +1,192 @@
+"""
+Upload checks and resumable (chunked) uploads for ``Media``.
+
+The MIME type of an upload is sniffed from its first bytes instead of trusting
+the client, and every media type has a hard size limit (``MEDIA_UPLOAD_LIMITS``).
+
+Resumable uploads append each chunk, streamed from the request in small reads,
+to a partial file under ``CHUNKED_UPLOAD_DIR``; the offset is kept on the
+``UploadSession`` row, so a client can resume from another worker after a dropped
+connection. The finished file goes to the media storage, which hashes it while
+copying it into place.
+"""
+import os
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.shared.exceptions.custom_exceptions import CustomException
+
+SNIFF_BYTES = 64
+READ_SIZE = 64 * 1024
+
+# MIME type prefix -> media type
+MEDIA_FAMILIES = {
+    'image/': 'image',
+    'video/': 'video',
+    'audio/': 'audio',
+    'application/pdf': 'document',
+    'application/zip': 'document',
+}
+
+
+def sniff_mime(head: bytes) -> str:
+    """MIME type detected from the magic bytes at the start of a file"""
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png'
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        return 'image/gif'
+    if head[:4] == b'RIFF':
+        return {b'WEBP': 'image/webp', b'WAVE': 'audio/wav', b'AVI ': 'video/x-msvideo'}.get(
+            head[8:12], 'application/octet-stream'
+        )
+    if head[4:8] == b'ftyp':
+        brand = head[8:12]
+        if brand == b'qt  ':
+            return 'video/quicktime'
+        if brand in (b'M4A ', b'M4B '):
+            return 'audio/mp4'
+        if brand in (b'heic', b'heix', b'mif1'):
+            return 'image/heic'
+        return 'video/mp4'
+    if head.startswith(b'\x1a\x45\xdf\xa3'):
+        return 'video/webm'
+    if head.startswith(b'ID3') or head[:2] in (b'\xff\xfb', b'\xff\xf3', b'\xff\xf2'):
+        return 'audio/mpeg'
+    if head.startswith(b'OggS'):
+        return 'audio/ogg'
+    if head.startswith(b'fLaC'):
+        return 'audio/flac'
+    if head.startswith(b'%PDF-'):
+        return 'application/pdf'
+    if head.startswith(b'PK\x03\x04'):
+        return 'application/zip'
+    return 'application/octet-stream'
+
+
+def sniff_file(file) -> str:
+    """Sniff a file-like object without moving its position"""
+    position = file.tell()
+    file.seek(0)
+    head = file.read(SNIFF_BYTES)
+    file.seek(position)
+    return sniff_mime(head)
+
+
+def media_type_for(field_name: str) -> str:
+    """Media type detected from a serializer field name, same as TranslatedFieldsWriteMixin"""
+    name = field_name.lower()
+    for media_type, hints in (('image', ('image',)), ('video', ('video',)), ('audio', ('audio',)),
+                              ('document', ('document', 'file'))):
+        if any(hint in name for hint in hints):
+            return media_type
+    return 'other'
+
+
+def media_family(mime_type: str) -> str:
+    for prefix, media_type in MEDIA_FAMILIES.items():
+        if mime_type.startswith(prefix):
+            return media_type
+    return 'other'
+
+
+def upload_limit(media_type: str) -> int:
+    limits = settings.MEDIA_UPLOAD_LIMITS
+    return limits.get(media_type, limits['other'])
+
+
+def check_upload(media_type: str, size: int, mime_type: str = None):
+    """Raise CustomException if the upload is too large or its content isn't a ``media_type``"""
+    limit = upload_limit(media_type)
+    if size > limit:
+        raise CustomException(message_key='FILE_TOO_LARGE', context={'media_type': media_type, 'limit': limit})
+    if mime_type and media_type != 'other' and media_family(mime_type) != media_type:
+        raise CustomException(
+            message_key='UNSUPPORTED_FILE_TYPE', context={'media_type': media_type, 'mime_type': mime_type}
+        )
+
+
+class MediaFileValidator:
+    """Serializer field validator applying ``check_upload`` to an uploaded file"""
+
+    def __init__(self, media_type):
+        self.media_type = media_type
+
+    def __call__(self, file):
+        try:
+            check_upload(self.media_type, file.size, sniff_file(file))
+        except CustomException as exc:
+            raise serializers.ValidationError(
+                f'{exc.message_key}: {", ".join(f"{k}={v}" for k, v in exc.context.items())}'
+            )
+
+
+def part_path(session) -> str:
+    return os.path.join(settings.CHUNKED_UPLOAD_DIR, f'{session.uuid}.part')
+
+
+def append_chunk(session, stream, length: int):
+    """
+    Append ``length`` bytes read from ``stream`` to the session's partial file.
+    The caller holds a row lock on ``session`` and has checked the offset.
+    """
+    if session.offset + length > session.total_size:
+        raise CustomException(message_key='VALIDATION_ERROR', context={'size': session.total_size})
+
+    os.makedirs(settings.CHUNKED_UPLOAD_DIR, exist_ok=True)
+    path = part_path(session)
+    written = 0
+    head = b''
+    with open(path, 'ab') as part:
+        # Drop bytes left behind by a chunk that failed half-way
+        part.truncate(session.offset)
+        while written < length:
+            data = stream.read(min(READ_SIZE, length - written))
+            if not data:
+                break
+            if session.offset == 0 and written < SNIFF_BYTES:
+                head += data[:SNIFF_BYTES - written]
+            part.write(data)
+            written += len(data)
+
+    if session.offset == 0 and head:
+        session.mime_type = sniff_mime(head)
+        try:
+            check_upload(session.media_type, session.total_size, session.mime_type)
+        except CustomException:
+            os.remove(path)
+            raise
+
+    session.offset += written
+    return written
+
+
+def complete_upload(session):
+    """
+    Move the finished partial file into media storage, create its ``Media`` row and
+    attach it to ``session``. Called once the chunk's transaction has committed, so
+    no row lock is held while the file is copied and hashed.
+    """
+    from apps.shared.models import Media, UploadSession
+
+    path = part_path(session)
+    with open(path, 'rb') as part:
+        media = Media(
+            media_type=session.media_type,
+            original_filename=session.filename,
+            content_type=session.content_type,
+            object_id=session.object_id,
+            language=session.language,
+            uploaded_by=session.uploaded_by,
+            is_public=session.is_public,
+        )
+        media.file = File(part, name=session.filename)
+        media.save()
+    UploadSession.objects.filter(pk=session.pk).update(media=media, updated_at=timezone.now())
+    session.media = media
+    os.remove(path)
+    return media
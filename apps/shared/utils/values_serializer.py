@@ -0,0 +1,206 @@
+"""
+Fast path for hot list endpoints: a read serializer compiled into plain functions
+over ``.values()`` rows.
+
+``compile_serializer(serializer_class, language)`` walks the fields of a
+``TranslatedFieldsReadMixin`` model serializer once and turns each into the
+``.values()`` columns it needs and a function of the row:
+
+* plain model fields reuse the DRF field's ``to_representation``, so decimals,
+  dates and choices are formatted exactly as by the serializer itself;
+* primary key related fields read the foreign key column;
+* nested serializers whose source is a foreign key are compiled over ``<fk>__<column>``;
+* ``SerializerMethodField``s are computed in SQL, from the expression registered
+  under their name in the serializer's ``values_expressions``;
+* ``translatable_fields`` text reads ``<field>_<lang>`` along the language context's
+  content chain, and the media of a whole page is fetched in one query per field.
+
+``CompiledSerializer.render(rows)`` returns what ``serializer_class(rows, many=True).data``
+would for the same objects. A serializer with a field that can't be compiled raises
+ImproperlyConfigured the first time it's compiled.
+"""
+from collections import defaultdict
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import relations, serializers
+
+from apps.shared.utils.language import language_context
+from apps.shared.utils.projection import translated_fields
+from apps.shared.utils.uploads import media_type_for
+
+_compiled: Dict[Tuple[type, str], 'CompiledSerializer'] = {}
+
+MEDIA_KEY = '__media_{}'
+
+
+class Step:
+    """One output key: the columns and annotations it reads and how it renders a row"""
+
+    def __init__(self, render, columns=(), expressions=None, media=None):
+        self.render = render
+        self.columns = tuple(columns)
+        self.expressions = expressions or {}
+        # (field name, translated) for media fetched per page
+        self.media = media
+
+
+def _column_step(column, field):
+    to_representation = field.to_representation
+    return Step(lambda row: None if row[column] is None else to_representation(row[column]), [column])
+
+
+def _text_step(columns):
+    def render(row):
+        return next((row[column] for column in columns if row[column]), '')
+    return Step(render, columns)
+
+
+def _media_step(field_name, translated):
+    key = MEDIA_KEY.format(field_name)
+    return Step(lambda row: row[key], media=(field_name, translated))
+
+
+def _compile_steps(serializer, language, prefix=''):
+    model = serializer.Meta.model
+    model_fields = {field.name: field for field in model._meta.get_fields()}
+    expressions = getattr(serializer, 'values_expressions', {})
+    translated = translated_fields(model)
+    steps = {}
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        where = f'{type(serializer).__name__}.{name}'
+
+        if isinstance(field, serializers.SerializerMethodField):
+            if prefix or name not in expressions:
+                raise ImproperlyConfigured(f'{where} needs a SQL expression in values_expressions')
+            steps[name] = Step(lambda row, key=name: row[key], expressions={name: expressions[name]})
+            continue
+
+        source = field.source
+        model_field = model_fields.get(source)
+        if model_field is None or '.' in source:
+            raise ImproperlyConfigured(f'{where}: source {source!r} is not a model field')
+
+        if isinstance(field, serializers.ListSerializer) or model_field.many_to_many or model_field.one_to_many:
+            raise ImproperlyConfigured(f'{where}: to-many relations are not supported')
+        if isinstance(field, serializers.BaseSerializer):
+            # Nested object through a foreign key, None when the key is null
+            fk = f'{prefix}{source}'
+            nested = _compile_steps(field, language, prefix=f'{fk}__')
+            if any(step.media or step.expressions for step in nested.values()):
+                raise ImproperlyConfigured(f'{where}: nested media and expressions are not supported')
+            steps[name] = Step(
+                lambda row, fk=fk, nested=nested: None if row[fk] is None else {
+                    key: step.render(row) for key, step in nested.items()
+                },
+                [fk, *(column for step in nested.values() for column in step.columns)],
+            )
+        elif isinstance(field, relations.PrimaryKeyRelatedField):
+            column = f'{prefix}{source}'
+            steps[name] = Step(
+                lambda row, column=column, pk_field=field.pk_field: row[column]
+                if row[column] is None or pk_field is None else pk_field.to_representation(row[column]),
+                [column],
+            )
+        elif isinstance(field, relations.RelatedField) or model_field.is_relation:
+            raise ImproperlyConfigured(f'{where}: only primary key relations are supported')
+        else:
+            steps[name] = _column_step(f'{prefix}{source}', field)
+
+    # Same as TranslatedFieldsReadMixin.to_representation
+    translatable_fields = getattr(serializer, 'translatable_fields', [])
+    media_fields = getattr(serializer, 'media_fields', [])
+    for field_name in translatable_fields:
+        if field_name in media_fields:
+            steps[field_name] = _media_step(field_name, translated=True)
+        elif f'{field_name}_{language.content}' in model_fields:
+            steps[field_name] = _text_step([f'{prefix}{field_name}_{code}' for code in language.content_chain])
+        for lc, _ in settings.LANGUAGES:
+            steps.pop(f'{field_name}_{lc.lower()}', None)
+    for field_name in media_fields:
+        if field_name not in translatable_fields:
+            steps[field_name] = _media_step(field_name, translated=False)
+
+    # modeltranslation only resolves fallbacks of the queried model's own fields in .values()
+    unresolved = [name for name, step in steps.items() if prefix and f'{prefix}{name}' in step.columns
+                  and name in translated]
+    if unresolved:
+        raise ImproperlyConfigured(
+            f'{type(serializer).__name__}: translated fields {unresolved} of a related model must be in translatable_fields'
+        )
+    return steps
+
+
+class CompiledSerializer:
+
+    def __init__(self, serializer_class, language):
+        self.serializer_class = serializer_class
+        self.model = serializer_class.Meta.model
+        self.language = language_context(language)
+        self.steps = _compile_steps(serializer_class(), self.language)
+        try:
+            self.model._meta.get_field('media_files')
+        except FieldDoesNotExist:
+            if any(step.media for step in self.steps.values()):
+                raise ImproperlyConfigured(f'{self.model.__name__} has no media_files relation')
+
+        self.pk = self.model._meta.pk.attname
+        self.columns = list(dict.fromkeys(
+            [self.pk, *(column for step in self.steps.values() for column in step.columns)]
+        ))
+        self.expressions = {key: value for step in self.steps.values() for key, value in step.expressions.items()}
+        self.media = [step.media for step in self.steps.values() if step.media]
+        self.items = list(self.steps.items())
+
+    def values(self, queryset):
+        """``queryset`` as the ``.values()`` rows ``render`` takes"""
+        return queryset.values(*self.columns, **self.expressions)
+
+    def render(self, rows, request=None):
+        rows = list(rows)
+        if self.media and rows:
+            self._attach_media(rows, request)
+        return [{key: step.render(row) for key, step in self.items} for row in rows]
+
+    def _attach_media(self, rows, request):
+        from apps.shared.models import Media
+
+        # _media_item() reads ?image_size= from the request
+        serializer = self.serializer_class(context={'request': request})
+        content_type = ContentType.objects.get_for_model(self.model)
+        ids = [row[self.pk] for row in rows]
+
+        for field_name, translated in self.media:
+            queryset = Media.objects.filter(
+                content_type=content_type, object_id__in=ids, media_type=media_type_for(field_name)
+            )
+            if translated:
+                queryset = queryset.filter(language__in=self.language.content_chain)
+            else:
+                queryset = queryset.filter(language__isnull=True)
+
+            by_object = defaultdict(list)
+            for media in queryset:
+                by_object[media.object_id].append(media)
+
+            key = MEDIA_KEY.format(field_name)
+            for row in rows:
+                items = by_object.get(row[self.pk], [])
+                if translated:
+                    # Media in the first language of the chain that has any
+                    picked = self.language.pick({media.language for media in items})
+                    items = [media for media in items if media.language == picked]
+                items = [serializer._media_item(media) for media in items]
+                row[key] = items if field_name.endswith('s') else (items[0] if items else None)
+
+
+def compile_serializer(serializer_class, language: str) -> CompiledSerializer:
+    key = (serializer_class, language)
+    if key not in _compiled:
+        _compiled[key] = CompiledSerializer(serializer_class, language)
+    return _compiled[key]
@@ -0,0 +1,109 @@
+"""
+Per-process write-behind buffer for hot request-path writes.
+
+Requests add keyed records to an in-memory buffer and a single bulk statement
+is issued per flush, either when the buffer grows past ``max_size`` or when
+``flush_interval`` seconds have passed since the last flush.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """
+    Collects records keyed by ``key`` and hands them to ``flush_callback`` in batches.
+
+    Records with the same key are merged (last write wins unless ``merge`` is given),
+    so the callback receives at most one record per key per flush.
+
+    The buffer is fork-aware: uwsgi loads the application in the master process and
+    forks workers afterwards, so every worker starts with its own empty buffer and,
+    if requested, its own flusher thread.
+    """
+
+    def __init__(
+            self,
+            flush_callback: Callable[[Dict[Hashable, Any]], None],
+            max_size: int = 500,
+            flush_interval: float = 5.0,
+            merge: Optional[Callable[[Any, Any], Any]] = None,
+            background: bool = False,
+            name: str = 'write-behind',
+    ):
+        self.flush_callback = flush_callback
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self.merge = merge
+        self.background = background
+        self.name = name
+        self._reset()
+        atexit.register(self.flush)
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._items: Dict[Hashable, Any] = {}
+        self._last_flush = time.monotonic()
+        self._thread = None
+
+    def _ensure_process(self):
+        if self._pid != os.getpid():
+            # Forked: records and locks inherited from the parent belong to it
+            self._reset()
+        if self.background and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+            # The flusher thread owns its own connection; don't keep it open between flushes
+            close_old_connections()
+
+    def add(self, key: Hashable, value: Any):
+        """Buffer a record, flushing inline when the buffer is full or stale."""
+        self._ensure_process()
+        with self._lock:
+            if self.merge is not None and key in self._items:
+                value = self.merge(self._items[key], value)
+            self._items[key] = value
+            due = (
+                    len(self._items) >= self.max_size
+                    or (not self.background and time.monotonic() - self._last_flush >= self.flush_interval)
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write out everything buffered so far. Returns the number of flushed records."""
+        with self._lock:
+            items, self._items = self._items, {}
+            self._last_flush = time.monotonic()
+
+        if not items:
+            return 0
+
+        try:
+            self.flush_callback(items)
+        except Exception:
+            logger.exception(f"{self.name}: failed to flush {len(items)} buffered records")
+            return 0
+        return len(items)
+
+    def clear(self):
+        """Drop buffered records without writing them."""
+        with self._lock:
+            self._items = {}
+            self._last_flush = time.monotonic()
+
+    def __len__(self):
+        return len(self._items)
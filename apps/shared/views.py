@@ -1,3 +1,15 @@
-from django.shortcuts import render
+from django.core.files.storage import default_storage
+from django.http import Http404
+from django.views.decorators.http import require_GET
 
-# Create your views here.
+from apps.shared.utils.media_access import is_private, serve, verify
+
+
+@require_GET
+def private_media(request, name):
+    """Send a private media file for a valid signed URL (see apps.shared.utils.media_access)"""
+    if not is_private(name) or not verify(name, request.GET.get('expires'), request.GET.get('signature')):
+        raise Http404
+    if not default_storage.exists(name):
+        raise Http404
+    return serve(request, default_storage, name)
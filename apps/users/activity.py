@@ -0,0 +1,79 @@
+"""
+Request-path recording of device activity.
+
+Every request made with a known device adds a (device, day) record and a
+last-seen timestamp to per-process buffers; the buffers are written out in
+batches so no request pays for a write of its own.
+"""
+from django.utils import timezone
+
+from apps.shared.utils.write_behind import WriteBehindBuffer
+from apps.users.models.device import Device, DeviceActivity
+
+try:
+    import uwsgi  # noqa: F401
+    RUNNING_UNDER_UWSGI = True
+except ImportError:
+    RUNNING_UNDER_UWSGI = False
+
+ACTIVITY_FLUSH_SIZE = 500
+ACTIVITY_FLUSH_INTERVAL = 10  # seconds
+LAST_SEEN_FLUSH_SIZE = 1000
+LAST_SEEN_FLUSH_INTERVAL = 5  # seconds
+
+
+def _merge_activity(old, new):
+    # A day keeps the dimensions of its first record (see DeviceActivity.objects.record_batch)
+    old['last_seen_at'] = max(old['last_seen_at'], new['last_seen_at'])
+    return old
+
+
+def _flush_activity(records):
+    DeviceActivity.objects.record_batch(records)
+
+
+# Under uwsgi every worker runs its own flusher thread (requires --enable-threads);
+# elsewhere (runserver, tests, management commands) the buffers flush inline.
+activity_buffer = WriteBehindBuffer(
+    _flush_activity,
+    max_size=ACTIVITY_FLUSH_SIZE,
+    flush_interval=ACTIVITY_FLUSH_INTERVAL,
+    merge=_merge_activity,
+    background=RUNNING_UNDER_UWSGI,
+    name='device-activity',
+)
+
+
+def record_device_activity(device, seen_at=None):
+    """Buffer one activity hit for ``device``; no query is issued here."""
+    seen_at = seen_at or timezone.now()
+    app_version = device.app_version.version if device.app_version_id else ''
+    activity_buffer.add(
+        (device.pk, timezone.localdate(seen_at)),
+        {
+            'device_type': device.device_type,
+            'app_version': app_version,
+            'language': device.language,
+            'first_seen_at': seen_at,
+            'last_seen_at': seen_at,
+        }
+    )
+
+
+def _flush_last_seen(last_seen):
+    Device.objects.touch_last_seen(last_seen)
+
+
+last_seen_buffer = WriteBehindBuffer(
+    _flush_last_seen,
+    max_size=LAST_SEEN_FLUSH_SIZE,
+    flush_interval=LAST_SEEN_FLUSH_INTERVAL,
+    merge=max,
+    background=RUNNING_UNDER_UWSGI,
+    name='device-last-seen',
+)
+
+
+def record_device_seen(device, seen_at=None):
+    """Buffer a last-seen timestamp for ``device``; no query is issued here."""
+    last_seen_buffer.add(device.pk, seen_at or timezone.now())
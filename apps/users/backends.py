@@ -0,0 +1,28 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+User = get_user_model()
+
+
+class PhoneBackend(ModelBackend):
+    """
+    Authenticates mobile users by phone and password in one query on the unique
+    ``phone`` index; without a phone, by username as ModelBackend does (admin).
+
+    The password is checked with the first of PASSWORD_HASHERS; a hash made with
+    another hasher or a lower cost is upgraded in place (an UPDATE of ``password``
+    only), so raising the cost rehashes users as they log in.
+    """
+
+    def authenticate(self, request, username=None, password=None, phone=None, **kwargs):
+        if phone is None:
+            return super().authenticate(request, username=username, password=password, **kwargs)
+        if password is None:
+            return None
+        try:
+            user = User._default_manager.get(phone=phone)
+        except User.DoesNotExist:
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
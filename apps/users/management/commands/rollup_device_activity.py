@@ -0,0 +1,34 @@
+"""
+Django command to rebuild DAU/WAU/MAU rollups from the device activity log.
+
+Meant to be scheduled (e.g. every few minutes for today, nightly for yesterday).
+"""
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.users.activity import activity_buffer
+from apps.users.models.device import DeviceActivityRollup
+
+
+class Command(BaseCommand):
+    """Django command to roll up device activity."""
+
+    help = 'Recompute device activity rollups for the given day(s).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=date.fromisoformat, help='Last day to roll up (YYYY-MM-DD), default today')
+        parser.add_argument('--days', type=int, default=1, help='Number of days to roll up, ending on --date')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        activity_buffer.flush()
+        end = options['date'] or timezone.localdate()
+
+        for offset in range(options['days'] - 1, -1, -1):
+            day = end - timedelta(days=offset)
+            count = DeviceActivityRollup.objects.rollup(day)
+            self.stdout.write(f'{day}: {count} rollup rows')
+
+        self.stdout.write(self.style.SUCCESS('Device activity rolled up!'))
@@ -0,0 +1,138 @@
+from collections import defaultdict
+from datetime import timedelta
+from functools import reduce
+from itertools import combinations
+from operator import or_
+
+from django.db import connections, models, transaction
+from django.db.models import Case, Count, F, Q, Value, When
+from django.db.models.functions import Greatest
+
+
+class DeviceActivityManager(models.Manager):
+    """Custom manager for the append-only device activity log"""
+
+    def record_batch(self, records):
+        """
+        Upsert a batch of buffered activity records, in one statement on PostgreSQL.
+
+        The dimensions of a day are the ones its first record had, so days
+        already rolled up keep matching the log; later records only move
+        last_seen_at, and only forward: buffers of several processes may be
+        flushed out of order.
+
+        Args:
+            records: Dict keyed by (device_id, day) with device_type, app_version,
+                     language, first_seen_at and last_seen_at values
+
+        Returns:
+            Number of records written
+        """
+        # Devices deleted since they were buffered would fail the whole batch on the FK
+        device_ids = {device_id for device_id, _ in records}
+        existing = set(
+            self.model._meta.get_field('device').related_model.objects
+            .filter(pk__in=device_ids)
+            .values_list('pk', flat=True)
+        )
+        rows = [
+            self.model(device_id=device_id, day=day, **values)
+            for (device_id, day), values in records.items()
+            if device_id in existing
+        ]
+        if not rows:
+            return 0
+
+        connection = connections[self.db]
+        if connection.vendor != 'postgresql':
+            with transaction.atomic(using=self.db):
+                self.bulk_create(rows, ignore_conflicts=True)
+                self.filter(reduce(or_, (Q(device_id=row.device_id, day=row.day) for row in rows))).update(
+                    last_seen_at=Greatest(F('last_seen_at'), Case(
+                        *[When(device_id=row.device_id, day=row.day, then=Value(row.last_seen_at)) for row in rows],
+                        default=F('last_seen_at'),
+                        output_field=models.DateTimeField(),
+                    ))
+                )
+            return len(rows)
+
+        meta = self.model._meta
+        fields = [meta.get_field(name) for name in (
+            'device', 'day', 'device_type', 'app_version', 'language', 'first_seen_at', 'last_seen_at'
+        )]
+        table = connection.ops.quote_name(meta.db_table)
+        columns = {field.name: connection.ops.quote_name(field.column) for field in fields}
+        values = ', '.join(['(%s)' % ', '.join(['%s'] * len(fields))] * len(rows))
+        params = [field.get_db_prep_save(getattr(row, field.attname), connection) for row in rows for field in fields]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} ({', '.join(columns.values())}) VALUES {values} "
+                f"ON CONFLICT ({columns['device']}, {columns['day']}) DO UPDATE SET "
+                f"{columns['last_seen_at']} = GREATEST({table}.{columns['last_seen_at']}, "
+                f"EXCLUDED.{columns['last_seen_at']})",
+                params
+            )
+        return len(rows)
+
+
+class DeviceActivityRollupManager(models.Manager):
+    """Custom manager for pre-aggregated DAU/WAU/MAU rows"""
+
+    WINDOWS = {
+        'dau': 1,
+        'wau': 7,
+        'mau': 30,
+    }
+    DIMENSIONS = ('device_type', 'app_version', 'language')
+    # Dimension value of rows counted over all its values
+    ALL = '*'
+
+    def groupings(self):
+        """Every subset of DIMENSIONS, from none to all of them"""
+        return [
+            grouped for size in range(len(self.DIMENSIONS) + 1)
+            for grouped in combinations(self.DIMENSIONS, size)
+        ]
+
+    def rollup(self, day):
+        """
+        (Re)compute the rollup rows ending on ``day`` from the activity log.
+
+        Distinct device counts can't be added up (a device seen under two app
+        versions in a week is one weekly active device), so rows are stored for
+        every grouping of the dimensions, the others set to ALL. Each window of a
+        grouping is one grouped COUNT(DISTINCT device) over the compact activity
+        log, so the devices table is never touched.
+
+        Returns:
+            Number of rollup rows written
+        """
+        from apps.users.models.device import DeviceActivity
+
+        buckets = defaultdict(lambda: dict.fromkeys(self.WINDOWS, 0))
+        for grouped in self.groupings():
+            for field, days in self.WINDOWS.items():
+                activity = DeviceActivity.objects.filter(day__gt=day - timedelta(days=days), day__lte=day)
+                if grouped:
+                    rows = activity.values(*grouped).annotate(total=Count('device', distinct=True)).order_by()
+                else:
+                    rows = [activity.aggregate(total=Count('device', distinct=True))]
+                for row in rows:
+                    if not row['total']:
+                        continue
+                    key = tuple(row[dimension] if dimension in grouped else self.ALL
+                                for dimension in self.DIMENSIONS)
+                    buckets[key][field] = row['total']
+
+        objs = [
+            self.model(day=day, **dict(zip(self.DIMENSIONS, key)), **counts)
+            for key, counts in buckets.items()
+        ]
+        self.bulk_create(
+            objs,
+            update_conflicts=True,
+            unique_fields=['day', *self.DIMENSIONS],
+            update_fields=[*self.WINDOWS, 'updated_at'],
+        )
+        return len(objs)
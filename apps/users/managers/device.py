@@ -1,11 +1,16 @@
 
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import Case, DateTimeField, F, Value, When
+from django.db.models.functions import Greatest
 from django.utils import timezone
 
 
 class DeviceManager(models.Manager):
     """Custom manager for Device model with business logic methods"""
 
+    # Columns refreshed when an already registered device_id registers again
+    UPSERT_FIELDS = ['firebase_token', 'app_version', 'ip_address', 'language']
+
     # Filter methods
     def active(self):
         """Get only active devices"""
@@ -47,6 +52,93 @@ class DeviceManager(models.Manager):
             logged_out_at=timezone.now()
         )
 
+    def upsert_devices(self, devices_data):
+        """
+        Register devices idempotently, keyed on device_id.
+
+        All devices are written with a single INSERT ... ON CONFLICT (device_id) DO UPDATE;
+        re-registered devices keep their device_token and get the UPSERT_FIELDS
+        that were sent refreshed.
+
+        Args:
+            devices_data: List of dicts with Device field values
+
+        Returns:
+            List of dicts with device_id, device_token and created, one per unique device_id
+        """
+        by_device_id = {data['device_id']: data for data in devices_data}
+        if not by_device_id:
+            return []
+
+        update_fields = [
+            field for field in self.UPSERT_FIELDS
+            if all(field in data for data in by_device_id.values())
+        ]
+        devices = [self.model(**data) for data in by_device_id.values()]
+        firebase_tokens = [device.firebase_token for device in devices if device.firebase_token]
+
+        with transaction.atomic(using=self.db):
+            if firebase_tokens:
+                # A push token belongs to one install; release it from stale device rows
+                self.filter(firebase_token__in=firebase_tokens).exclude(
+                    device_id__in=by_device_id
+                ).update(firebase_token=None)
+
+            self.bulk_create(
+                devices,
+                update_conflicts=True,
+                unique_fields=['device_id'],
+                update_fields=[*update_fields, 'last_login'],
+            )
+            stored_tokens = dict(
+                self.filter(device_id__in=by_device_id).values_list('device_id', 'device_token')
+            )
+
+        return [
+            {
+                'device_id': device.device_id,
+                'device_token': stored_tokens[device.device_id],
+                'created': stored_tokens[device.device_id] == device.device_token,
+            }
+            for device in devices
+        ]
+
+    def touch_last_seen(self, last_seen):
+        """
+        Bulk-update last_login for many devices in a single statement.
+
+        Args:
+            last_seen: Dict mapping device pk to the time it was last seen
+
+        Returns:
+            Number of updated devices
+        """
+        if not last_seen:
+            return 0
+
+        connection = connections[self.db]
+        if connection.vendor != 'postgresql':
+            return self.filter(pk__in=last_seen).update(last_login=Greatest(F('last_login'), Case(
+                *[When(pk=pk, then=Value(seen_at)) for pk, seen_at in last_seen.items()],
+                output_field=DateTimeField(),
+            )))
+
+        meta = self.model._meta
+        table = connection.ops.quote_name(meta.db_table)
+        pk_column = connection.ops.quote_name(meta.pk.column)
+        last_login_column = connection.ops.quote_name(meta.get_field('last_login').column)
+        values = ', '.join(['(%s, %s::timestamptz)'] * len(last_seen))
+        params = [param for row in last_seen.items() for param in row]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET {last_login_column} = v.seen_at "
+                f"FROM (VALUES {values}) AS v(id, seen_at) "
+                f"WHERE {table}.{pk_column} = v.id AND {table}.{last_login_column} < v.seen_at",
+                params
+            )
+            return cursor.rowcount
+
     def is_token_valid(self, refresh_token_jti):
         """Check if refresh token JTI is valid (device is active)"""
         return self.filter(
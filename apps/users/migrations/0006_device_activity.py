@@ -0,0 +1,55 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_alter_user_is_staff'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeviceActivityRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('device_type', models.CharField(choices=[('IOS', 'iOS'), ('ANDROID', 'Android'), ('ALL', 'ALL')], max_length=7)),
+                ('app_version', models.CharField(max_length=100)),
+                ('language', models.CharField(choices=[('RU', 'Russian'), ('EN', 'English'), ('CRL', 'Cyrillic'), ('UZ', 'Uzbek')], max_length=3)),
+                ('dau', models.PositiveIntegerField(default=0)),
+                ('wau', models.PositiveIntegerField(default=0)),
+                ('mau', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Device activity rollup',
+                'verbose_name_plural': 'Device activity rollups',
+                'db_table': 'device_activity_rollup',
+                'ordering': ['-day'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'device_type', 'app_version', 'language'), name='device_activity_rollup_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DeviceActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('device_type', models.CharField(choices=[('IOS', 'iOS'), ('ANDROID', 'Android'), ('ALL', 'ALL')], max_length=7)),
+                ('app_version', models.CharField(max_length=100)),
+                ('language', models.CharField(choices=[('RU', 'Russian'), ('EN', 'English'), ('CRL', 'Cyrillic'), ('UZ', 'Uzbek')], max_length=3)),
+                ('first_seen_at', models.DateTimeField()),
+                ('last_seen_at', models.DateTimeField()),
+                ('device', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activities', to='users.device')),
+            ],
+            options={
+                'verbose_name': 'Device activity',
+                'verbose_name_plural': 'Device activities',
+                'db_table': 'device_activity',
+                'indexes': [models.Index(fields=['day'], name='device_activity_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('device', 'day'), name='device_activity_device_day_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:35
+
+from django.db import migrations, models
+from django.db.models import Q
+from django.utils import timezone
+
+
+def delete_stale_codes(apps, schema_editor):
+    # Codes now live in the cache; rows used or expired before that are never read again
+    PhoneOTP = apps.get_model('users', 'PhoneOTP')
+    PhoneOTP.objects.filter(Q(used=True) | Q(expires_at__lt=timezone.now())).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_device_activity'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='phoneotp',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.RunPython(delete_stale_codes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_phoneotp_expires_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='phoneotp',
+            name='ip_address',
+            field=models.GenericIPAddressField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -7,6 +7,7 @@ from django.utils import timezone
 
 from apps.shared.exceptions.custom_exceptions import CustomException
 from apps.shared.models import BaseModel, Language
+from apps.users.managers.activity import DeviceActivityManager, DeviceActivityRollupManager
 from apps.users.managers.device import DeviceManager
 
 User = get_user_model()
@@ -254,4 +255,69 @@ class Device(BaseModel):
     @property
     def display_name(self):
         """Friendly display name for the device"""
-        return f"{self.get_device_type_display()} - {self.device_model}"
\ No newline at end of file
+        return f"{self.get_device_type_display()} - {self.device_model}"
+
+
+class DeviceActivity(models.Model):
+    """
+    Append-only activity log: one row per device per day.
+
+    Dimensions are copied from the device at the time of activity so rollups
+    never have to join (or scan) the devices table.
+    """
+    device = models.ForeignKey(Device, on_delete=models.CASCADE, related_name='activities')
+    day = models.DateField()
+    device_type = models.CharField(max_length=7, choices=DeviceType.choices)
+    app_version = models.CharField(max_length=100)
+    language = models.CharField(max_length=3, choices=Language.choices)
+    first_seen_at = models.DateTimeField()
+    last_seen_at = models.DateTimeField()
+
+    objects = DeviceActivityManager()
+
+    def __str__(self):
+        return f"{self.device_id} - {self.day}"
+
+    class Meta:
+        db_table = 'device_activity'
+        verbose_name = 'Device activity'
+        verbose_name_plural = 'Device activities'
+        constraints = [
+            models.UniqueConstraint(fields=['device', 'day'], name='device_activity_device_day_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['day'], name='device_activity_day_idx'),
+        ]
+
+
+class DeviceActivityRollup(models.Model):
+    """
+    Daily active/weekly active/monthly active device counts per
+    (device_type, app_version, language) bucket, ending on ``day``.
+    A dimension set to '*' was counted over all its values.
+    """
+    day = models.DateField()
+    device_type = models.CharField(max_length=7, choices=DeviceType.choices)
+    app_version = models.CharField(max_length=100)
+    language = models.CharField(max_length=3, choices=Language.choices)
+    dau = models.PositiveIntegerField(default=0)
+    wau = models.PositiveIntegerField(default=0)
+    mau = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = DeviceActivityRollupManager()
+
+    def __str__(self):
+        return f"{self.day} {self.device_type} {self.app_version} {self.language}"
+
+    class Meta:
+        db_table = 'device_activity_rollup'
+        verbose_name = 'Device activity rollup'
+        verbose_name_plural = 'Device activity rollups'
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'device_type', 'app_version', 'language'],
+                name='device_activity_rollup_uniq'
+            ),
+        ]
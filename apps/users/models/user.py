@@ -1,7 +1,9 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
 
 
 class User(AbstractUser):
@@ -11,7 +13,13 @@ class User(AbstractUser):
     surname = models.CharField(max_length=20, null=True, blank=True)
 
     def generate_jwt_tokens(self):
-        refresh = RefreshToken.for_user(self)
+        # The claims Token.for_user sets, without RefreshToken.for_user: with the
+        # token_blacklist app installed it inserts an OutstandingToken row on every
+        # login, and blacklisting a refresh token (logout, rotation) creates it anyway
+        refresh = RefreshToken()
+        refresh[jwt_settings.USER_ID_CLAIM] = str(getattr(self, jwt_settings.USER_ID_FIELD))
+        if jwt_settings.CHECK_REVOKE_TOKEN:
+            refresh[jwt_settings.REVOKE_TOKEN_CLAIM] = get_md5_hash_password(self.password)
         return {
             "refresh": str(refresh),
             "access": str(refresh.access_token),
@@ -29,9 +37,11 @@ class PhoneOTP(models.Model):
     phone = models.CharField(max_length=20, db_index=True)
     code = models.CharField(max_length=6)
     created_at = models.DateTimeField(auto_now_add=True)
-    expires_at = models.DateTimeField()
+    expires_at = models.DateTimeField(db_index=True)
     attempts = models.IntegerField(default=0)
     used = models.BooleanField(default=False)
+    # Client IP that asked for the code, counted by the per-IP issue limit
+    ip_address = models.GenericIPAddressField(null=True, blank=True, db_index=True)
 
     def is_expired(self):
         return timezone.now() > self.expires_at
@@ -0,0 +1,211 @@
+"""
+One-time phone verification codes.
+
+Codes, their attempts and the issue rate limits need counters concurrent requests
+can't overshoot. On a cache backend with atomic ``incr``/``add`` (Redis, memcached,
+or the per-process LocMemCache) they live in the cache: a code under ``otp:<phone>``
+expires on its own, its attempts are bumped with ``cache.incr``, and a per-code
+nonce (``cache.add``) lets only one request use a correct code. Issuing and
+verifying then touch no database rows.
+
+Other backends, such as the default file cache, read-modify-write on ``incr`` and
+``add`` and reset the key's timeout on ``incr``. With them, and as the fallback
+when the cache is down, codes are kept in ``PhoneOTP``:
+
+* attempts are bumped with F() and a code is used under ``select_for_update``;
+* the rate limits count the phone's and IP's rows of the window, which are kept
+  that long and purged afterwards as codes are issued.
+
+Issuing is rate limited per phone and per client IP.
+"""
+import logging
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+
+from apps.shared.exceptions.custom_exceptions import CustomException
+from apps.shared.utils.cache_counters import has_atomic_counters
+from apps.users.models.user import PhoneOTP
+from apps.users.utils import expiry_in_minutes, generate_6_digit_code
+
+logger = logging.getLogger(__name__)
+
+EXPIRATION_MINUTES = 2
+MAX_ATTEMPTS = 10
+# (codes, window in seconds)
+PHONE_RATE_LIMIT = (5, 60 * 60)
+IP_RATE_LIMIT = (30, 60 * 60)
+# Expired codes are kept a little longer to answer CODE_EXPIRED rather than CODE_NOT_FOUND
+EXPIRED_GRACE_SECONDS = 10 * 60
+PURGE_INTERVAL = 60  # seconds between purges of old PhoneOTP rows
+# PhoneOTP rows are counted by the rate limits until their window has passed
+RETENTION_SECONDS = max(PHONE_RATE_LIMIT[1], IP_RATE_LIMIT[1], EXPIRED_GRACE_SECONDS)
+
+
+def uses_cache() -> bool:
+    """Whether codes are kept in the default cache, see the module docstring"""
+    return has_atomic_counters()
+
+
+def _key(phone, suffix=''):
+    return f'otp:{phone}{suffix}'
+
+
+def _count(key, window):
+    """Increment a counter living for ``window`` seconds"""
+    cache.add(key, 0, timeout=window)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Expired between add() and incr()
+        cache.set(key, 1, timeout=window)
+        return 1
+
+
+def _rate_limits(phone, ip):
+    return [
+        (scope, value, limit)
+        for scope, value, limit in (('phone', phone, PHONE_RATE_LIMIT), ('ip', ip, IP_RATE_LIMIT))
+        if value
+    ]
+
+
+def check_rate_limit(phone, ip=None):
+    """Raise CustomException if ``phone`` or ``ip`` asked for too many codes in the current cache window"""
+    now = time.time()
+    for scope, value, (limit, window) in _rate_limits(phone, ip):
+        window_index = int(now // window)
+        try:
+            count = _count(f'otp:rate:{scope}:{value}:{window_index}', window)
+        except Exception:
+            # Fail open, a broken cache must not lock everybody out
+            logger.warning('OTP rate limit unavailable', exc_info=True)
+            return
+        if count > limit:
+            raise CustomException(
+                message_key='OTP_RATE_LIMITED',
+                context={'retry_after': int((window_index + 1) * window - now) + 1}
+            )
+
+
+def issue_code(phone, ip=None) -> str:
+    """Create a new code for ``phone``, replacing the previous one"""
+    code = generate_6_digit_code()
+    if not uses_cache():
+        _issue_in_database(phone, ip, code)
+        return code
+
+    check_rate_limit(phone, ip)
+    entry = {'code': code, 'expires_at': time.time() + EXPIRATION_MINUTES * 60, 'nonce': uuid.uuid4().hex}
+    try:
+        cache.set_many(
+            {_key(phone): entry, _key(phone, ':attempts'): 0},
+            timeout=EXPIRATION_MINUTES * 60 + EXPIRED_GRACE_SECONDS
+        )
+    except Exception:
+        logger.warning('OTP cache unavailable, storing the code for %s in the database', phone, exc_info=True)
+        _issue_in_database(phone, ip, code)
+    return code
+
+
+def verify_code(phone, code):
+    """Consume the code of ``phone``; raises CustomException if it's missing, expired, wrong or exhausted"""
+    code = str(code).zfill(6)
+    if not uses_cache():
+        return _verify_in_database(phone, code)
+    try:
+        entry = cache.get(_key(phone))
+    except Exception:
+        logger.warning('OTP cache unavailable, verifying %s in the database', phone, exc_info=True)
+        entry = None
+    if entry is None:
+        return _verify_in_database(phone, code)
+
+    if time.time() > entry['expires_at']:
+        cache.delete_many([_key(phone), _key(phone, ':attempts')])
+        raise CustomException(message_key='CODE_EXPIRED', context={'phone': phone})
+
+    try:
+        attempts = cache.incr(_key(phone, ':attempts'))
+    except ValueError:
+        raise CustomException(message_key='CODE_NOT_FOUND', context={'phone': phone})
+    if attempts > MAX_ATTEMPTS:
+        raise CustomException(message_key='TOO_MANY_ATTEMPTS', context={'phone': phone})
+    if not constant_time_compare(entry['code'], code):
+        raise CustomException(message_key='INVALID_CODE', context={'remaining_attempts': MAX_ATTEMPTS - attempts})
+
+    # Two requests with the right code may race, only one of them gets it
+    if not cache.add(_key(phone, f':used:{entry["nonce"]}'), 1, timeout=EXPIRED_GRACE_SECONDS):
+        raise CustomException(message_key='CODE_NOT_FOUND', context={'phone': phone})
+    cache.delete_many([_key(phone), _key(phone, ':attempts')])
+
+
+def _issue_in_database(phone, ip, code):
+    now = timezone.now()
+    limits = _rate_limits(phone, ip)
+    since = now - timedelta(seconds=max(window for _, _, (_, window) in limits))
+    scope_filter = Q(phone=phone) | Q(ip_address=ip) if ip else Q(phone=phone)
+
+    with transaction.atomic():
+        # Locking the window's rows serializes concurrent requests of the same phone or IP
+        recent = list(
+            PhoneOTP.objects.select_for_update().filter(scope_filter, created_at__gte=since)
+            .order_by('pk').values_list('phone', 'ip_address', 'created_at')
+        )
+        for scope, value, (limit, window) in limits:
+            start = now - timedelta(seconds=window)
+            issued = sorted(
+                created_at for row_phone, row_ip, created_at in recent
+                if created_at >= start and (row_phone if scope == 'phone' else row_ip) == value
+            )
+            if len(issued) >= limit:
+                retry_after = issued[-limit] + timedelta(seconds=window) - now
+                raise CustomException(
+                    message_key='OTP_RATE_LIMITED',
+                    context={'retry_after': int(retry_after.total_seconds()) + 1}
+                )
+
+        # Replaced codes stay until their window has passed, the rate limits count them
+        PhoneOTP.objects.filter(phone=phone, used=False).update(used=True)
+        PhoneOTP.objects.create(
+            phone=phone, code=code, ip_address=ip, expires_at=expiry_in_minutes(EXPIRATION_MINUTES)
+        )
+    purge_expired()
+
+
+def _verify_in_database(phone, code):
+    error = None
+    with transaction.atomic():
+        otp = PhoneOTP.objects.select_for_update().filter(phone=phone, used=False).order_by('-created_at').first()
+        if otp is None:
+            error = ('CODE_NOT_FOUND', {'phone': phone})
+        elif otp.is_expired():
+            PhoneOTP.objects.filter(pk=otp.pk).update(used=True)
+            error = ('CODE_EXPIRED', {'phone': phone})
+        elif otp.attempts >= MAX_ATTEMPTS:
+            error = ('TOO_MANY_ATTEMPTS', {'phone': phone})
+        elif constant_time_compare(otp.code, code):
+            PhoneOTP.objects.filter(pk=otp.pk).update(used=True)
+        else:
+            PhoneOTP.objects.filter(pk=otp.pk).update(attempts=F('attempts') + 1)
+            error = ('INVALID_CODE', {'remaining_attempts': MAX_ATTEMPTS - otp.attempts - 1})
+    if error:
+        raise CustomException(message_key=error[0], context=error[1])
+
+
+def purge_expired(force=False):
+    """Delete ``PhoneOTP`` rows older than RETENTION_SECONDS, at most once per PURGE_INTERVAL"""
+    try:
+        if not force and not cache.add('otp:purge', 1, timeout=PURGE_INTERVAL):
+            return 0
+    except Exception:
+        pass
+    cutoff = timezone.now() - timedelta(seconds=RETENTION_SECONDS)
+    deleted, _ = PhoneOTP.objects.filter(expires_at__lt=cutoff).delete()
+    return deleted
@@ -1,4 +1,5 @@
 import datetime
+from collections import defaultdict
 
 from django.contrib.auth import get_user_model
 from apps.users.models.user import PhoneOTP
@@ -6,7 +7,7 @@ from apps.users.models.device import Device
 from rest_framework import serializers
 
 from apps.shared.exceptions.custom_exceptions import CustomException
-from apps.users.models.device import AppVersion
+from apps.users.models.device import AppVersion, DeviceType
 
 
 User = get_user_model()
@@ -134,6 +135,9 @@ class DeviceRegisterSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             'created_at': {'read_only': True},
             'updated_at': {'read_only': True},
+            # Registration is an upsert keyed on device_id; uniqueness is resolved in the database
+            'device_id': {'validators': []},
+            'firebase_token': {'validators': []},
         }
 
     def validate_device_model(self, device_model):
@@ -143,6 +147,36 @@ class DeviceRegisterSerializer(serializers.ModelSerializer):
         return device_model
 
 
+class DeviceBulkItemSerializer(DeviceRegisterSerializer):
+    """Single device of a bulk registration; app versions are checked once for the whole batch"""
+    app_version = serializers.IntegerField(source='app_version_id')
+
+
+class DeviceBulkRegisterSerializer(serializers.Serializer):
+    """Serializer for registering a fleet of devices in one request"""
+    MAX_DEVICES = 5000
+
+    devices = DeviceBulkItemSerializer(many=True, allow_empty=False, max_length=MAX_DEVICES)
+
+    def validate_devices(self, devices):
+        app_version_ids = {device['app_version_id'] for device in devices}
+        existing = set(AppVersion.objects.filter(pk__in=app_version_ids).values_list('pk', flat=True))
+        if app_version_ids - existing:
+            raise CustomException(message_key='VALIDATION_ERROR', context={
+                'app_version': sorted(app_version_ids - existing)
+            })
+
+        # firebase_token is unique, two installs can't share one
+        device_ids_by_token = defaultdict(set)
+        for device in devices:
+            if device.get('firebase_token'):
+                device_ids_by_token[device['firebase_token']].add(device['device_id'])
+        shared = sorted(token for token, device_ids in device_ids_by_token.items() if len(device_ids) > 1)
+        if shared:
+            raise CustomException(message_key='VALIDATION_ERROR', context={'firebase_token': shared})
+        return devices
+
+
 class AppVersionSerializer(serializers.ModelSerializer):
     """Serializer for AppVersion model"""
 
@@ -218,3 +252,9 @@ class ActiveVersionSerializer(serializers.ModelSerializer):
     class Meta:
         model = AppVersion
         fields = ['id', 'version', 'device_type', 'force_update']
+
+
+class AppVersionCheckSerializer(serializers.Serializer):
+    """Query parameters of the version-check endpoint"""
+    device_type = serializers.ChoiceField(choices=DeviceType.choices)
+    version = serializers.CharField(max_length=100)
@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models.device import AppVersion
+from .versions import app_version_snapshot
+
+
+@receiver(post_save, sender=AppVersion)
+@receiver(post_delete, sender=AppVersion)
+def invalidate_app_version_snapshot(sender, instance, **kwargs):
+    # AppVersion.save runs in a transaction; workers must not reload before it commits
+    transaction.on_commit(app_version_snapshot.invalidate)
@@ -1,15 +1,24 @@
-from django.test import TestCase
-from django.contrib.auth import get_user_model
+import time
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.hashers import make_password
 from django.utils import timezone
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
 from rest_framework_simplejwt.tokens import RefreshToken
 from datetime import timedelta
 from unittest.mock import patch
 
+from apps.shared.exceptions.custom_exceptions import CustomException
+from apps.users import otp
 from apps.users.models.user import PhoneOTP
-from apps.users.models.device import Device, AppVersion, DeviceType
+from apps.users.activity import activity_buffer, record_device_activity, last_seen_buffer, record_device_seen
+from apps.users.models.device import Device, AppVersion, DeviceType, DeviceActivity, DeviceActivityRollup
 from apps.users.utils import generate_6_digit_code, expiry_in_minutes
+from apps.users.versions import parse_version
 
 User = get_user_model()
 
@@ -590,17 +599,26 @@ class DeviceRegisterCreateAPIViewTestCase(APITestCase):
             'operation_version': 'Android 12',
             'device_id': 'unique_device_id_789',
             'ip_address': '192.168.1.3',
-            'app_version': self.app_version.id
+            'app_version': self.app_version.id,
+            'firebase_token': 'fcm_token_old'
         }
 
         # Birinchi marta
         response1 = self.client.post(self.url, data)
         if response1.status_code == status.HTTP_404_NOT_FOUND:
             self.skipTest("URL topilmadi")
+        self.assertEqual(response1.status_code, status.HTTP_201_CREATED)
 
-        # Ikkinchi marta (xato bo'lishi kerak)
+        # Ikkinchi marta (qayta o'rnatish) - mavjud device_token qaytadi
+        data.update(ip_address='192.168.1.4', firebase_token='fcm_token_new')
         response2 = self.client.post(self.url, data)
-        self.assertEqual(response2.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response2.status_code, status.HTTP_200_OK)
+        self.assertEqual(response2.data['data']['device_token'], response1.data['data']['device_token'])
+
+        device = Device.objects.get(device_id='unique_device_id_789')
+        self.assertEqual(device.ip_address, '192.168.1.4')
+        self.assertEqual(device.firebase_token, 'fcm_token_new')
+        self.assertEqual(Device.objects.filter(device_id='unique_device_id_789').count(), 1)
 
     def test_register_device_invalid_ip(self):
         """Noto'g'ri IP address"""
@@ -934,6 +952,166 @@ class PhoneOTPModelTestCase(TestCase):
         self.assertEqual(otp.attempts, 1)
 
 
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class OTPStoreTestCase(TestCase):
+    """Test cases for the cache-backed OTP store"""
+
+    def setUp(self):
+        cache.clear()
+        self.phone = '+998901234567'
+
+    def assertOTPError(self, message_key, func, *args):
+        with self.assertRaises(CustomException) as raised:
+            func(*args)
+        self.assertEqual(raised.exception.message_key, message_key)
+        return raised.exception
+
+    def test_issue_and_verify(self):
+        """Kod keshda saqlanadi va faqat bir marta ishlatiladi"""
+        code = otp.issue_code(self.phone, '127.0.0.1')
+
+        self.assertFalse(PhoneOTP.objects.exists())
+        otp.verify_code(self.phone, code)
+        self.assertOTPError('CODE_NOT_FOUND', otp.verify_code, self.phone, code)
+
+    def test_new_code_replaces_previous(self):
+        """Yangi kod eskisini bekor qiladi"""
+        with patch('apps.users.otp.generate_6_digit_code', side_effect=['111111', '222222']):
+            otp.issue_code(self.phone)
+            otp.issue_code(self.phone)
+
+        self.assertOTPError('INVALID_CODE', otp.verify_code, self.phone, '111111')
+        otp.verify_code(self.phone, '222222')
+
+    def test_too_many_attempts(self):
+        """Urinishlar tugagach to'g'ri kod ham qabul qilinmaydi"""
+        code = otp.issue_code(self.phone)
+        wrong = '000000' if code != '000000' else '111111'
+
+        for attempt in range(otp.MAX_ATTEMPTS):
+            error = self.assertOTPError('INVALID_CODE', otp.verify_code, self.phone, wrong)
+            self.assertEqual(error.context['remaining_attempts'], otp.MAX_ATTEMPTS - attempt - 1)
+        self.assertOTPError('TOO_MANY_ATTEMPTS', otp.verify_code, self.phone, code)
+
+    def test_expired_code(self):
+        """Muddati tugagan kod"""
+        code = otp.issue_code(self.phone)
+
+        with patch('apps.users.otp.time.time', return_value=time.time() + otp.EXPIRATION_MINUTES * 60 + 1):
+            self.assertOTPError('CODE_EXPIRED', otp.verify_code, self.phone, code)
+        self.assertOTPError('CODE_NOT_FOUND', otp.verify_code, self.phone, code)
+
+    def test_phone_rate_limit(self):
+        """Bitta raqamga soatiga cheklangan miqdorda kod yuboriladi"""
+        limit, _ = otp.PHONE_RATE_LIMIT
+        for _ in range(limit):
+            otp.issue_code(self.phone)
+
+        error = self.assertOTPError('OTP_RATE_LIMITED', otp.issue_code, self.phone)
+        self.assertGreater(error.context['retry_after'], 0)
+        otp.issue_code('+998901234568')
+
+    def test_ip_rate_limit(self):
+        """Bitta IP manzildan cheklangan miqdorda kod so'raladi"""
+        limit, _ = otp.IP_RATE_LIMIT
+        for i in range(limit):
+            otp.issue_code(f'+9989000{i:05d}', '10.0.0.1')
+
+        self.assertOTPError('OTP_RATE_LIMITED', otp.issue_code, self.phone, '10.0.0.1')
+        otp.issue_code(self.phone, '10.0.0.2')
+
+    def test_database_fallback(self):
+        """Kesh ishlamasa kod bazada saqlanadi"""
+        with patch.object(cache, 'set_many', side_effect=ConnectionError):
+            code = otp.issue_code(self.phone)
+
+        self.assertTrue(PhoneOTP.objects.filter(phone=self.phone, used=False).exists())
+        otp.verify_code(self.phone, code)
+        self.assertFalse(PhoneOTP.objects.filter(phone=self.phone, used=False).exists())
+        self.assertOTPError('CODE_NOT_FOUND', otp.verify_code, self.phone, code)
+
+    def test_database_fallback_attempts(self):
+        """Bazadagi kod uchun ham urinishlar hisoblanadi"""
+        PhoneOTP.objects.create(
+            phone=self.phone, code='123456', expires_at=timezone.now() + timedelta(minutes=2)
+        )
+
+        self.assertOTPError('INVALID_CODE', otp.verify_code, self.phone, '654321')
+        self.assertEqual(PhoneOTP.objects.get(phone=self.phone).attempts, 1)
+
+    def test_purge_expired(self):
+        """Rate limit oynasi o'tgan kodlar o'chiriladi"""
+        old = timezone.now() - timedelta(seconds=otp.RETENTION_SECONDS + 60)
+        PhoneOTP.objects.create(phone='+998901111111', code='111111', expires_at=old)
+        PhoneOTP.objects.create(phone='+998902222222', code='222222', expires_at=old, used=True)
+        PhoneOTP.objects.create(
+            phone='+998903333333', code='333333', expires_at=timezone.now() - timedelta(minutes=30), used=True
+        )
+
+        self.assertEqual(otp.purge_expired(force=True), 2)
+        self.assertEqual(list(PhoneOTP.objects.values_list('phone', flat=True)), ['+998903333333'])
+
+
+class OTPDatabaseStoreTestCase(TestCase):
+    """Test cases for OTP codes on the configured (non-atomic file) cache backend"""
+
+    def setUp(self):
+        cache.clear()
+        self.phone = '+998901234567'
+
+    def assertOTPError(self, message_key, func, *args):
+        with self.assertRaises(CustomException) as raised:
+            func(*args)
+        self.assertEqual(raised.exception.message_key, message_key)
+        return raised.exception
+
+    def test_codes_kept_in_database(self):
+        """Fayl keshida kodlar bazada saqlanadi va faqat bir marta ishlatiladi"""
+        self.assertFalse(otp.uses_cache())
+
+        with patch('apps.users.otp.generate_6_digit_code', side_effect=['111111', '222222']):
+            otp.issue_code(self.phone, '10.0.0.1')
+            otp.issue_code(self.phone, '10.0.0.1')
+
+        self.assertFalse(cache.get(f'otp:{self.phone}'))
+        self.assertOTPError('INVALID_CODE', otp.verify_code, self.phone, '111111')
+        otp.verify_code(self.phone, '222222')
+        self.assertOTPError('CODE_NOT_FOUND', otp.verify_code, self.phone, '222222')
+
+    def test_attempts_are_counted_in_database(self):
+        """Urinishlar bazada hisoblanadi va limitdan oshmaydi"""
+        code = otp.issue_code(self.phone)
+        wrong = '000000' if code != '000000' else '111111'
+
+        for attempt in range(otp.MAX_ATTEMPTS):
+            error = self.assertOTPError('INVALID_CODE', otp.verify_code, self.phone, wrong)
+            self.assertEqual(error.context['remaining_attempts'], otp.MAX_ATTEMPTS - attempt - 1)
+        self.assertOTPError('TOO_MANY_ATTEMPTS', otp.verify_code, self.phone, code)
+        self.assertEqual(PhoneOTP.objects.get(phone=self.phone).attempts, otp.MAX_ATTEMPTS)
+
+    def test_rate_limits_last_the_whole_window(self):
+        """Cheklov butun oyna davomida amal qiladi, keshdagi 5 daqiqalik muddat bilan tiklanmaydi"""
+        limit, window = otp.PHONE_RATE_LIMIT
+        for _ in range(limit):
+            otp.issue_code(self.phone, '10.0.0.1')
+
+        PhoneOTP.objects.update(created_at=timezone.now() - timedelta(minutes=30))
+        error = self.assertOTPError('OTP_RATE_LIMITED', otp.issue_code, self.phone, '10.0.0.2')
+        self.assertAlmostEqual(error.context['retry_after'], window - 30 * 60, delta=5)
+
+        PhoneOTP.objects.update(created_at=timezone.now() - timedelta(seconds=window + 1))
+        otp.issue_code(self.phone, '10.0.0.2')
+
+    def test_ip_rate_limit(self):
+        """Bitta IP manzildan cheklangan miqdorda kod so'raladi"""
+        limit, _ = otp.IP_RATE_LIMIT
+        for i in range(limit):
+            otp.issue_code(f'+9989000{i:05d}', '10.0.0.1')
+
+        self.assertOTPError('OTP_RATE_LIMITED', otp.issue_code, self.phone, '10.0.0.1')
+        otp.issue_code(self.phone, '10.0.0.2')
+
+
 class UserModelTestCase(TestCase):
     """Test cases for User model"""
 
@@ -964,6 +1142,8 @@ class UserModelTestCase(TestCase):
         self.assertIn('refresh', tokens)
         self.assertIsInstance(tokens['access'], str)
         self.assertIsInstance(tokens['refresh'], str)
+        self.assertEqual(RefreshToken(tokens['refresh'])['user_id'], str(user.id))
+        self.assertFalse(OutstandingToken.objects.exists())
 
     def test_user_str_method(self):
         """User __str__ method"""
@@ -1129,6 +1309,430 @@ class IntegrationTestCase(APITestCase):
             self.assertIn('device_token', register_response.data['data'])
 
 
+class DeviceActivityTestCase(APITestCase):
+    """Test cases for device activity log and rollups"""
+
+    def setUp(self):
+        self.app_version = AppVersion.objects.create(
+            version='1.0.0',
+            is_active=True,
+            device_type=DeviceType.ANDROID
+        )
+        self.device = Device.objects.create(
+            device_model='Samsung Galaxy S21',
+            operation_version='Android 12',
+            device_type=DeviceType.ANDROID,
+            device_id='activity_device_001',
+            ip_address='192.168.1.1',
+            app_version=self.app_version
+        )
+        activity_buffer.clear()
+
+    def test_requests_are_deduplicated_per_day(self):
+        """Bir kunda bir nechta so'rov - bitta activity qatori"""
+        for _ in range(3):
+            self.client.get('/api/v1/history/', HTTP_TOKEN=str(self.device.device_token))
+
+        self.assertEqual(DeviceActivity.objects.count(), 0)
+        activity_buffer.flush()
+
+        self.assertEqual(DeviceActivity.objects.count(), 1)
+        activity = DeviceActivity.objects.get()
+        self.assertEqual(activity.device, self.device)
+        self.assertEqual(activity.app_version, '1.0.0')
+
+        record_device_activity(self.device)
+        activity_buffer.flush()
+        self.assertEqual(DeviceActivity.objects.count(), 1)
+
+    def test_last_seen_never_moves_backwards(self):
+        """Kechikib yozilgan eski yozuv last_seen_at ni orqaga surmaydi"""
+        now = timezone.localtime().replace(hour=12, minute=0, second=0, microsecond=0)
+        record_device_activity(self.device, seen_at=now)
+        activity_buffer.flush()
+
+        record_device_activity(self.device, seen_at=now - timedelta(minutes=5))
+        activity_buffer.flush()
+        self.assertEqual(DeviceActivity.objects.get().last_seen_at, now)
+
+        record_device_activity(self.device, seen_at=now + timedelta(minutes=5))
+        activity_buffer.flush()
+        self.assertEqual(DeviceActivity.objects.get().last_seen_at, now + timedelta(minutes=5))
+
+    def test_rollup_counts_windows(self):
+        """DAU/WAU/MAU hisoblanishi"""
+        today = timezone.localdate()
+        record_device_activity(self.device, seen_at=timezone.now() - timedelta(days=3))
+        activity_buffer.flush()
+
+        DeviceActivityRollup.objects.rollup(today)
+        rollup = DeviceActivityRollup.objects.get(day=today, device_type='*', app_version='*', language='*')
+        self.assertEqual((rollup.dau, rollup.wau, rollup.mau), (0, 1, 1))
+
+        record_device_activity(self.device)
+        activity_buffer.flush()
+        DeviceActivityRollup.objects.rollup(today)
+        rollup.refresh_from_db()
+        self.assertEqual((rollup.dau, rollup.wau, rollup.mau), (1, 1, 1))
+        # Har bir dimension guruhlanishi uchun bitta qator
+        self.assertEqual(DeviceActivityRollup.objects.count(), 8)
+
+    def test_distinct_devices_not_added_up(self):
+        """Hafta ichida versiyasini o'zgartirgan qurilma bir marta sanaladi"""
+        record_device_activity(self.device, seen_at=timezone.now() - timedelta(days=2))
+        activity_buffer.flush()
+        self.device.app_version = AppVersion.objects.create(
+            version='2.0.0', is_active=True, device_type=DeviceType.ANDROID
+        )
+        record_device_activity(self.device)
+        activity_buffer.flush()
+        DeviceActivityRollup.objects.rollup(timezone.localdate())
+
+        admin = User.objects.create_user(
+            phone='+998900000001', username='admin', password='TestPass123!', is_staff=True
+        )
+        self.client.force_authenticate(admin)
+        results = self.client.get(
+            '/api/v1/admins/users/activity/', {'group_by': 'device_type'}
+        ).data['data']['results']
+        self.assertEqual([(row['wau'], row['mau']) for row in results if row['day'] == timezone.localdate()],
+                         [(1, 1)])
+
+        results = self.client.get(
+            '/api/v1/admins/users/activity/', {'group_by': 'app_version'}
+        ).data['data']['results']
+        self.assertEqual(
+            {row['app_version']: row['wau'] for row in results if row['day'] == timezone.localdate()},
+            {'1.0.0': 1, '2.0.0': 1}
+        )
+
+    def test_day_keeps_first_dimensions(self):
+        """Kun davomida o'lchovlar birinchi yozuvdagidek qoladi"""
+        record_device_activity(self.device)
+        activity_buffer.flush()
+        self.device.language = 'EN'
+        record_device_activity(self.device)
+        activity_buffer.flush()
+
+        activity = DeviceActivity.objects.get()
+        self.assertNotEqual(activity.language, 'EN')
+
+    def test_admin_activity_endpoint_reads_rollups(self):
+        """Admin statistikasi rollup jadvalidan o'qiladi"""
+        admin = User.objects.create_user(
+            phone='+998900000001',
+            username='admin',
+            password='TestPass123!',
+            is_staff=True
+        )
+        self.client.force_authenticate(admin)
+        record_device_activity(self.device)
+        activity_buffer.flush()
+        DeviceActivityRollup.objects.rollup(timezone.localdate())
+
+        response = self.client.get('/api/v1/admins/users/activity/', {'group_by': 'device_type'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['data']['results']
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['device_type'], DeviceType.ANDROID)
+        self.assertEqual(results[0]['dau'], 1)
+
+    def test_admin_activity_endpoint_invalid_group_by(self):
+        """Noto'g'ri group_by"""
+        admin = User.objects.create_user(
+            phone='+998900000001',
+            username='admin',
+            password='TestPass123!',
+            is_staff=True
+        )
+        self.client.force_authenticate(admin)
+        response = self.client.get('/api/v1/admins/users/activity/', {'group_by': 'ip_address'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class DeviceLastSeenTestCase(APITestCase):
+    """Test cases for deferred last-seen updates"""
+
+    def setUp(self):
+        self.app_version = AppVersion.objects.create(
+            version='1.0.0',
+            is_active=True,
+            device_type=DeviceType.ANDROID
+        )
+        self.device = Device.objects.create(
+            device_model='Samsung Galaxy S21',
+            operation_version='Android 12',
+            device_type=DeviceType.ANDROID,
+            device_id='last_seen_device_001',
+            ip_address='192.168.1.1',
+            app_version=self.app_version
+        )
+        last_seen_buffer.clear()
+
+    def test_request_does_not_write_last_login(self):
+        """So'rov vaqtida last_login yozilmaydi, flush'da yoziladi"""
+        before = self.device.last_login
+        self.client.get('/api/v1/history/', HTTP_TOKEN=str(self.device.device_token))
+
+        self.device.refresh_from_db()
+        self.assertEqual(self.device.last_login, before)
+
+        last_seen_buffer.flush()
+        self.device.refresh_from_db()
+        self.assertGreater(self.device.last_login, before)
+
+    def test_touch_last_seen_never_moves_backwards(self):
+        """Eski vaqt last_login'ni orqaga surmaydi"""
+        current = self.device.last_login
+        Device.objects.touch_last_seen({self.device.pk: current - timedelta(hours=1)})
+        self.device.refresh_from_db()
+        self.assertEqual(self.device.last_login, current)
+
+        record_device_seen(self.device, current + timedelta(minutes=1))
+        record_device_seen(self.device, current + timedelta(minutes=5))
+        record_device_seen(self.device, current + timedelta(minutes=2))
+        self.assertEqual(last_seen_buffer.flush(), 1)
+        self.device.refresh_from_db()
+        self.assertEqual(self.device.last_login, current + timedelta(minutes=5))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class PhoneBackendTestCase(APITestCase):
+    """Test cases for phone authentication"""
+
+    def setUp(self):
+        cache.clear()
+        self.url = '/api/v1/users/login/'
+        self.phone = '+998901234567'
+        self.password = 'TestPass123!'
+        self.user = User.objects.create_user(
+            phone=self.phone, username='phone_user', password=self.password, is_active=True
+        )
+        app_version = AppVersion.objects.create(version='1.0.0', is_active=True, device_type=DeviceType.ANDROID)
+        self.device = Device.objects.create(
+            device_model='Samsung Galaxy S21',
+            operation_version='Android 12',
+            device_type=DeviceType.ANDROID,
+            device_id='phone-backend-device',
+            ip_address='127.0.0.1',
+            app_version=app_version
+        )
+        self.headers = {'HTTP_TOKEN': str(self.device.device_token)}
+
+    def test_login_queries(self):
+        """Login: qurilma, foydalanuvchi va qurilmani bog'lash - 3 ta so'rov"""
+        with self.assertNumQueries(3):
+            response = self.client.post(self.url, {'phone': self.phone, 'password': self.password}, **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data['data']['tokens'])
+        self.device.refresh_from_db()
+        self.assertEqual(self.device.user, self.user)
+
+    def test_login_errors(self):
+        """Noto'g'ri parol va topilmagan raqam farqlanadi"""
+        response = self.client.post(self.url, {'phone': self.phone, 'password': 'WrongPass1!'}, **self.headers)
+        self.assertEqual(response.data['id'], 'INVALID_USER')
+
+        response = self.client.post(self.url, {'phone': '+998909999999', 'password': self.password}, **self.headers)
+        self.assertEqual(response.data['id'], 'USER_NOT_FOUND')
+
+    @override_settings(PASSWORD_HASHERS=[
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ])
+    def test_password_rehashed(self):
+        """Eski xesh login paytida yangilanadi"""
+        User.objects.filter(pk=self.user.pk).update(password=make_password(self.password, hasher='md5'))
+
+        self.assertEqual(authenticate(phone=self.phone, password=self.password), self.user)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$'))
+
+    def test_username_and_inactive(self):
+        """Admin username bilan kiradi, aktiv bo'lmagan foydalanuvchi kira olmaydi"""
+        self.assertEqual(authenticate(username='phone_user', password=self.password), self.user)
+        self.assertIsNone(authenticate(phone='+998909999999', password=self.password))
+
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertIsNone(authenticate(phone=self.phone, password=self.password))
+
+
+class AppVersionCheckAPIViewTestCase(APITestCase):
+    """Test cases for snapshot-backed version check"""
+
+    def setUp(self):
+        self.url = '/api/v1/users/app-version/check/'
+        with self.captureOnCommitCallbacks(execute=True):
+            AppVersion.objects.create(version='1.4.0', is_active=True, device_type=DeviceType.ALL)
+            AppVersion.objects.create(
+                version='1.10.0', is_active=True, force_update=True, device_type=DeviceType.IOS
+            )
+
+    def test_parse_version_ordering(self):
+        """Semantik versiyalarni solishtirish"""
+        self.assertLess(parse_version('1.9.0'), parse_version('1.10.0'))
+        self.assertLess(parse_version('1.0.0-rc.1'), parse_version('1.0.0'))
+        self.assertLess(parse_version('1.0.0-alpha.2'), parse_version('1.0.0-alpha.10'))
+        self.assertEqual(parse_version('v1.2'), parse_version('1.2.0+build.5'))
+        self.assertIsNone(parse_version('latest'))
+
+    def test_check_outdated_ios_client(self):
+        """Eski iOS versiya - majburiy yangilanish"""
+        response = self.client.get(self.url, {'device_type': 'IOS', 'version': '1.9.3'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data['data']
+        self.assertEqual(data['latest_version'], '1.10.0')
+        self.assertTrue(data['update_available'])
+        self.assertTrue(data['force_update'])
+
+    def test_check_falls_back_to_all_devices(self):
+        """Android uchun ALL versiyasi ishlatiladi"""
+        response = self.client.get(self.url, {'device_type': 'ANDROID', 'version': '1.4.0'})
+
+        data = response.data['data']
+        self.assertEqual(data['latest_version'], '1.4.0')
+        self.assertFalse(data['update_available'])
+        self.assertFalse(data['force_update'])
+
+    def test_check_is_served_without_queries(self):
+        """Snapshot yuklangandan keyin DB so'rovlari yo'q"""
+        self.client.get(self.url, {'device_type': 'IOS', 'version': '1.0.0'})
+        with self.assertNumQueries(0):
+            self.client.get(self.url, {'device_type': 'IOS', 'version': '1.0.0'})
+
+    def test_snapshot_refreshes_after_save(self):
+        """Yangi versiya saqlanganda snapshot yangilanadi"""
+        self.client.get(self.url, {'device_type': 'IOS', 'version': '1.0.0'})
+        with self.captureOnCommitCallbacks(execute=True):
+            AppVersion.objects.create(version='2.0.0', is_active=True, device_type=DeviceType.IOS)
+
+        response = self.client.get(self.url, {'device_type': 'IOS', 'version': '1.10.0'})
+        data = response.data['data']
+        self.assertEqual(data['latest_version'], '2.0.0')
+        self.assertTrue(data['update_available'])
+        self.assertFalse(data['force_update'])
+
+    def test_check_invalid_device_type(self):
+        """Noto'g'ri device_type"""
+        response = self.client.get(self.url, {'device_type': 'WINDOWS', 'version': '1.0.0'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class DeviceBulkRegisterAPIViewTestCase(APITestCase):
+    """Test cases for bulk (MDM) device registration"""
+
+    def setUp(self):
+        self.url = '/api/v1/users/devices/bulk/'
+        self.app_version = AppVersion.objects.create(
+            version='1.0.0',
+            is_active=True,
+            device_type=DeviceType.ALL
+        )
+        self.admin = User.objects.create_user(
+            phone='+998901111111',
+            username='fleet_admin',
+            password='TestPass123!',
+            is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+
+    def _device(self, index, **extra):
+        return {
+            'device_type': 'ANDROID',
+            'device_model': 'Zebra TC52',
+            'operation_version': 'Android 11',
+            'device_id': f'fleet_{index}',
+            'ip_address': '10.0.0.1',
+            'app_version': self.app_version.id,
+            **extra
+        }
+
+    def test_bulk_register_creates_and_refreshes(self):
+        """Yangi qurilmalar yaratiladi, mavjudlari yangilanadi"""
+        existing = Device.objects.create(
+            device_model='Zebra TC52',
+            operation_version='Android 11',
+            device_type=DeviceType.ANDROID,
+            device_id='fleet_0',
+            ip_address='10.0.0.9',
+            app_version=self.app_version,
+            firebase_token='fcm_old'
+        )
+        devices = [self._device(i, firebase_token=f'fcm_{i}') for i in range(3)]
+
+        response = self.client.post(self.url, {'devices': devices}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        data = response.data['data']
+        self.assertEqual(data['created'], 2)
+        self.assertEqual(data['updated'], 1)
+        tokens = {item['device_id']: item['device_token'] for item in data['devices']}
+        self.assertEqual(tokens['fleet_0'], str(existing.device_token))
+
+        existing.refresh_from_db()
+        self.assertEqual(existing.firebase_token, 'fcm_0')
+        self.assertEqual(existing.ip_address, '10.0.0.1')
+        self.assertEqual(Device.objects.count(), 3)
+
+    def test_bulk_register_releases_reused_firebase_token(self):
+        """Boshqa qurilmadagi firebase token bo'shatiladi"""
+        stale = Device.objects.create(
+            device_model='Zebra TC52',
+            operation_version='Android 11',
+            device_type=DeviceType.ANDROID,
+            device_id='retired',
+            ip_address='10.0.0.9',
+            app_version=self.app_version,
+            firebase_token='fcm_shared'
+        )
+
+        response = self.client.post(
+            self.url, {'devices': [self._device(1, firebase_token='fcm_shared')]}, format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        stale.refresh_from_db()
+        self.assertIsNone(stale.firebase_token)
+        self.assertEqual(Device.objects.get(device_id='fleet_1').firebase_token, 'fcm_shared')
+
+    def test_bulk_register_unknown_app_version(self):
+        """Mavjud bo'lmagan app_version"""
+        response = self.client.post(
+            self.url, {'devices': [self._device(1, app_version=999999)]}, format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Device.objects.exists())
+
+    def test_bulk_register_rejects_shared_firebase_token(self):
+        """Ikki qurilmada bir xil firebase_token bo'lishi mumkin emas"""
+        response = self.client.post(
+            self.url,
+            {'devices': [self._device(1, firebase_token='fcm_same'), self._device(2, firebase_token='fcm_same')]},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Device.objects.exists())
+
+    def test_bulk_register_requires_admin(self):
+        """Oddiy foydalanuvchi uchun ruxsat yo'q"""
+        regular_user = User.objects.create_user(
+            phone='+998902222222',
+            username='regular_user',
+            password='TestPass123!'
+        )
+        self.client.force_authenticate(regular_user)
+
+        response = self.client.post(self.url, {'devices': [self._device(1)]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Device.objects.exists())
+
+
 # Test ishga tushirish
 if __name__ == '__main__':
     import django
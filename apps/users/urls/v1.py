@@ -1,7 +1,8 @@
 from django.urls import path
 
 from apps.users import views
-from apps.users.views import DeviceRegisterCreateAPIView, DeviceListApiView
+from apps.users.views import DeviceRegisterCreateAPIView, DeviceListApiView, AppVersionCheckAPIView, \
+    DeviceBulkRegisterAPIView
 
 app_name = 'users'
 
@@ -18,5 +19,7 @@ urlpatterns = [
 
 urlpatterns +=[
     path('devices/', DeviceRegisterCreateAPIView.as_view(), name='device-register'),
+    path('devices/bulk/', DeviceBulkRegisterAPIView.as_view(), name='device-bulk-register'),
     path('devices/list/', DeviceListApiView.as_view(), name='device-list'),
+    path('app-version/check/', AppVersionCheckAPIView.as_view(), name='app-version-check'),
 ]
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+Per-process snapshot of active app versions for the version-check endpoint.
+
+Every worker keeps the active ``AppVersion`` rows in memory. Writers bump a
+generation token in the shared cache; workers compare their token with the
+shared one at most once per ``CHECK_INTERVAL`` seconds and reload on change,
+so a version check normally costs no database access at all.
+"""
+import re
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from django.core.cache import cache
+
+from apps.users.models.device import AppVersion, DeviceType
+
+GENERATION_CACHE_KEY = 'users:app_versions:generation'
+CHECK_INTERVAL = 1.0  # seconds
+
+_VERSION_RE = re.compile(
+    r'^v?(?P<core>\d+(?:\.\d+)*)(?:-(?P<pre>[0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$'
+)
+
+
+def parse_version(version: str) -> Optional[Tuple]:
+    """
+    Build a sort key for a semantic version string.
+
+    '1.2' == '1.2.0', pre-releases sort before the release ('1.0.0-rc.1' < '1.0.0'),
+    numeric pre-release identifiers sort numerically and below alphanumeric ones,
+    build metadata is ignored. Returns None for strings that are not versions.
+    """
+    match = _VERSION_RE.match((version or '').strip())
+    if not match:
+        return None
+
+    core = [int(part) for part in match.group('core').split('.')]
+    core += [0] * (3 - len(core))
+    while len(core) > 3 and core[-1] == 0:
+        core.pop()
+
+    pre = match.group('pre')
+    if pre is None:
+        return tuple(core), (1,)
+
+    identifiers = tuple(
+        (0, int(part), '') if part.isdigit() else (1, 0, part)
+        for part in pre.split('.')
+    )
+    return tuple(core), (0, identifiers)
+
+
+class AppVersionSnapshot:
+    """In-memory view of active app versions keyed by device type"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: Dict[str, List[dict]] = {}
+        self._generation = None
+        self._checked_at = 0.0
+
+    def _shared_generation(self):
+        generation = cache.get(GENERATION_CACHE_KEY)
+        if generation is None:
+            cache.add(GENERATION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+            generation = cache.get(GENERATION_CACHE_KEY)
+        return generation
+
+    def _load(self):
+        versions: Dict[str, List[dict]] = {}
+        rows = AppVersion.objects.filter(is_active=True).values(
+            'id', 'version', 'device_type', 'force_update', 'description'
+        )
+        for row in rows:
+            row['key'] = parse_version(row['version'])
+            if row['key'] is not None:
+                versions.setdefault(row['device_type'], []).append(row)
+        return versions
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if self._generation is not None and now - self._checked_at < CHECK_INTERVAL:
+            return
+
+        with self._lock:
+            if self._generation is not None and now - self._checked_at < CHECK_INTERVAL:
+                return
+            generation = self._shared_generation()
+            if self._generation is None or generation != self._generation:
+                self._versions = self._load()
+                self._generation = generation
+            self._checked_at = now
+
+    def latest(self, device_type: str) -> Optional[dict]:
+        """Highest active version for ``device_type`` (versions for ALL devices included)."""
+        self._ensure_fresh()
+        versions = self._versions
+        candidates = versions.get(device_type, [])
+        if device_type != DeviceType.ALL:
+            candidates = candidates + versions.get(DeviceType.ALL, [])
+        if not candidates:
+            return None
+        return max(candidates, key=lambda row: row['key'])
+
+    def check(self, device_type: str, current_version: str) -> dict:
+        """Compare the client's version with the latest active one."""
+        latest = self.latest(device_type)
+        current_key = parse_version(current_version)
+
+        if latest is None:
+            return {
+                'current_version': current_version,
+                'latest_version': None,
+                'update_available': False,
+                'force_update': False,
+                'description': '',
+            }
+
+        update_available = current_key is None or current_key < latest['key']
+        return {
+            'current_version': current_version,
+            'latest_version': latest['version'],
+            'update_available': update_available,
+            'force_update': update_available and latest['force_update'],
+            'description': latest['description'],
+        }
+
+    def invalidate(self):
+        """Make every worker reload on its next check."""
+        cache.set(GENERATION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        self._checked_at = 0.0
+
+
+app_version_snapshot = AppVersionSnapshot()
@@ -1,31 +1,31 @@
-from typing import Any
-
 from rest_framework.generics import CreateAPIView, get_object_or_404, RetrieveUpdateAPIView, UpdateAPIView
 from rest_framework import status, generics, permissions
-from rest_framework.permissions import AllowAny, IsAuthenticated, IsAuthenticatedOrReadOnly
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from .models.user import PhoneOTP
 from .models.device import Device
 from .serializers import VerifySerializer, RegisterSerializer, ProfileRetrieveUpdateSerializer, LoginSerializer, \
-    ForgotPasswordSerializer, SetPasswordSerializer, UpdatePasswordSerializer, DeviceRegisterSerializer
-from .utils import generate_password, generate_6_digit_code, expiry_in_minutes, generate_username
+    ForgotPasswordSerializer, SetPasswordSerializer, UpdatePasswordSerializer, DeviceRegisterSerializer, \
+    AppVersionCheckSerializer, DeviceBulkRegisterSerializer
+from .otp import EXPIRATION_MINUTES, MAX_ATTEMPTS, issue_code, verify_code
+from .utils import generate_password, generate_username
+from .versions import app_version_snapshot
 from django.contrib.auth import get_user_model, authenticate
 
 from ..shared.exceptions.custom_exceptions import CustomException
+from ..shared.mixins.throttle_mixins import ThrottleFirstMixin
 from ..shared.permissions.mobile import IsMobileUser
+from ..shared.utils.custom_current_host import get_remote_ip
 from ..shared.utils.custom_response import CustomResponse
 
 User = get_user_model()
 
-EXPIRATION_MINUTES = 2
-MAX_ATTEMPTS = 10
-
 
-class RegisterAPIView(APIView):
+class RegisterAPIView(ThrottleFirstMixin, APIView):
     serializer_class = RegisterSerializer
     permission_classes = (IsMobileUser,)
+    throttle_scope = 'auth'
 
     def post(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data)
@@ -33,6 +33,7 @@ class RegisterAPIView(APIView):
 
         phone = serializer.validated_data['phone']
         password = serializer.validated_data['password']
+        code = issue_code(phone, get_remote_ip(request))
         user_exists = User.objects.filter(phone=phone).exists()
 
         if not user_exists:
@@ -47,15 +48,6 @@ class RegisterAPIView(APIView):
         else:
             created = False
 
-        PhoneOTP.objects.filter(phone=phone, used=False).delete()
-        code = generate_6_digit_code()
-        expires_at = expiry_in_minutes(EXPIRATION_MINUTES)
-        PhoneOTP.objects.create(
-            phone=phone,
-            code=code,
-            expires_at=expires_at
-        )
-
         data = {
             "phone": phone,
             "code": code,
@@ -73,9 +65,10 @@ class RegisterAPIView(APIView):
         )
 
 
-class VerifyCodeAPIView(APIView):
+class VerifyCodeAPIView(ThrottleFirstMixin, APIView):
     permission_classes = (IsMobileUser,)
     serializer_class = VerifySerializer
+    throttle_scope = 'auth'
 
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
@@ -83,84 +76,45 @@ class VerifyCodeAPIView(APIView):
         phone = serializer.validated_data["phone"]
         code = serializer.validated_data["code"]
 
-        otp = PhoneOTP.objects.filter(phone=phone, used=False).order_by('-created_at').first()
-        if not otp:
-            return CustomResponse.error(
-                message_key='CODE_NOT_FOUND',
-                context={'phone': phone},
-                status_code=status.HTTP_400_BAD_REQUEST
-            )
+        verify_code(phone, code)
 
-        if otp.is_expired():
-            otp.delete()
-            return CustomResponse.error(
-                message_key='CODE_EXPIRED',
-                context={'phone': phone},
-                status_code=status.HTTP_400_BAD_REQUEST
-            )
-
-        if otp.attempts >= MAX_ATTEMPTS:
-            return CustomResponse.error(
-                message_key='TOO_MANY_ATTEMPTS',
-                context={'phone': phone},
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS
-            )
-
-        if otp.code == str(code).zfill(6):
-            otp.used = True
-            otp.save()
-
-            user = get_object_or_404(User, phone=phone)
-            tokens = user.generate_jwt_tokens()
+        user = get_object_or_404(User, phone=phone)
+        tokens = user.generate_jwt_tokens()
+        if not user.is_active:
             user.is_active = True
-            user.save()
-            request.device.user = user
-            request.device.save()
-            return CustomResponse.success(
-                request=request,
-                message_key='PHONE_VERIFIED',
-                data={
-                    'detail': 'Phone verified successfully',
-                    'phone': phone,
-                    'tokens': tokens
-                },
-                status_code=status.HTTP_200_OK,
-            )
-
-        otp.attempts += 1
-        otp.save()
-        remaining = MAX_ATTEMPTS - otp.attempts
-
-        return CustomResponse.error(
-            message_key='INVALID_CODE',
-            context={'remaining_attempts': remaining},
-            status_code=status.HTTP_400_BAD_REQUEST
+            user.save(update_fields=['is_active'])
+        Device.objects.filter(pk=request.device.pk).update(user=user)
+        return CustomResponse.success(
+            request=request,
+            message_key='PHONE_VERIFIED',
+            data={
+                'detail': 'Phone verified successfully',
+                'phone': phone,
+                'tokens': tokens
+            },
+            status_code=status.HTTP_200_OK,
         )
 
 
-
-class LoginAPIView(APIView):
+class LoginAPIView(ThrottleFirstMixin, APIView):
     permission_classes = (IsMobileUser,)
     serializer_class = LoginSerializer
+    throttle_scope = 'auth'
 
     def post(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
         phone = serializer.validated_data['phone']
         password = serializer.validated_data['password']
-        user = User.objects.filter(phone=phone).first()
-        if not user:
-            return CustomResponse.error(message_key='USER_NOT_FOUND', context={'phone': phone})
-        username = user.username
-        user = authenticate(request, username=username, password=password)
+        user = authenticate(request, phone=phone, password=password)
         if not user:
+            # Only failed logins pay for telling the two apart
+            if not User.objects.filter(phone=phone).exists():
+                return CustomResponse.error(message_key='USER_NOT_FOUND', context={'phone': phone})
             return CustomResponse.error(message_key='INVALID_USER', context={'phone': phone})
 
         tokens = user.generate_jwt_tokens()
-        user.is_active = True
-        device = Device.objects.get(device_token=request.headers.get("Token"))
-        user.save()
-        device.user = user
+        Device.objects.filter(pk=request.device.pk).update(user=user)
         return CustomResponse.success(
             request=request,
             data={
@@ -172,9 +126,10 @@ class LoginAPIView(APIView):
         )
 
 
-class ForgotPasswordAPIView(APIView):
+class ForgotPasswordAPIView(ThrottleFirstMixin, APIView):
     serializer_class = ForgotPasswordSerializer
     permission_classes = (IsMobileUser,)
+    throttle_scope = 'auth'
 
     def post(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data)
@@ -186,14 +141,7 @@ class ForgotPasswordAPIView(APIView):
         if not user_exists:
             return CustomResponse.error(message_key='USER_NOT_FOUND', context={'phone': phone})
 
-        PhoneOTP.objects.filter(phone=phone, used=False).delete()
-        code = generate_6_digit_code()
-        expires_at = expiry_in_minutes(EXPIRATION_MINUTES)
-        PhoneOTP.objects.create(
-            phone=phone,
-            code=code,
-            expires_at=expires_at
-        )
+        code = issue_code(phone, get_remote_ip(request))
 
         data = {
             "phone": phone,
@@ -311,24 +259,51 @@ class DeviceRegisterCreateAPIView(generics.CreateAPIView):
     """
     Register device anonymously (no login required).
     Returns a device_token for future reference.
+    Registering an already known device_id refreshes it and returns its existing device_token.
     """
     serializer_class = DeviceRegisterSerializer
     permission_classes = [AllowAny]
 
-    def __init__(self, **kwargs: Any):
-        super().__init__(**kwargs)
-        self.device = None
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result, = Device.objects.upsert_devices([serializer.validated_data])
 
-    def perform_create(self, serializer):
-        device = serializer.save()
-        self.device = device
+        data = serializer.data
+        data['device_token'] = str(result['device_token'])
+        return CustomResponse.success(
+            message_key="SUCCESS_MESSAGE",
+            data=data,
+            status_code=status.HTTP_201_CREATED if result['created'] else status.HTTP_200_OK
+        )
+
+
+class DeviceBulkRegisterAPIView(APIView):
+    """
+    Register or refresh a fleet of devices (MDM onboarding) with a single upsert.
+    """
+    serializer_class = DeviceBulkRegisterSerializer
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = Device.objects.upsert_devices(serializer.validated_data['devices'])
 
-    def create(self, request, *args, **kwargs):
-        response = super().create(request, *args, **kwargs)
-        response.data['device_token'] = str(self.device.device_token)
         return CustomResponse.success(
             message_key="SUCCESS_MESSAGE",
-            data=response.data,
+            data={
+                'created': sum(result['created'] for result in results),
+                'updated': sum(not result['created'] for result in results),
+                'devices': [
+                    {
+                        'device_id': result['device_id'],
+                        'device_token': str(result['device_token']),
+                        'created': result['created'],
+                    }
+                    for result in results
+                ],
+            },
             status_code=status.HTTP_201_CREATED
         )
 
@@ -345,3 +320,25 @@ class DeviceListApiView(generics.ListAPIView):
             message_key="SUCCESS_MESSAGE",
             data=serializer.data
         )
+
+
+class AppVersionCheckAPIView(APIView):
+    """
+    Latest active version for the client's device type.
+    Served from the per-process version snapshot, without touching the database.
+    """
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request, *args, **kwargs):
+        serializer = AppVersionCheckSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        data = app_version_snapshot.check(
+            serializer.validated_data['device_type'],
+            serializer.validated_data['version']
+        )
+        return CustomResponse.success(
+            request=request,
+            data=data,
+            status_code=status.HTTP_200_OK
+        )
@@ -25,6 +25,13 @@ DEBUG = env.bool('DEBUG', default=True)
 ALLOWED_HOSTS = env.list('DJANGO_ALLOWED_HOSTS', default=['localhost', '127.0.0.1'])
 
 MEDIA_ROOT = env('MEDIA_ROOT', default='/vol/web/media/')
+# Threads per worker generating image variants after upload (0 = inline, in the request)
+IMAGE_VARIANT_WORKERS = env.int('IMAGE_VARIANT_WORKERS', default=2)
+# Private media are sent by nginx (X-Accel-Redirect) after the signature check
+MEDIA_ACCEL_REDIRECT = env.bool('MEDIA_ACCEL_REDIRECT', default=True)
+MEDIA_URL_TTL = env.int('MEDIA_URL_TTL', default=3600)
+# Partial files of resumable uploads (same volume as MEDIA_ROOT)
+CHUNKED_UPLOAD_DIR = env('CHUNKED_UPLOAD_DIR', default='/vol/web/uploads/')
 STATIC_ROOT = env('STATIC_ROOT', default='/vol/web/static/')
 
 # DATABASE SETTINGS
@@ -33,6 +40,31 @@ DB_NAME = env('DB_NAME', default='yandex')
 DB_USER = env('DB_USER', default='postgres')
 DB_PASS = env('DB_PASS', default='Amirshoh1505')
 DB_PORT = env('DB_PORT', default=5432)
+# Seconds a worker keeps its connection open (0: one per request); checked before reuse
+DB_CONN_MAX_AGE = env.int('DB_CONN_MAX_AGE', default=300)
+DB_CONN_HEALTH_CHECKS = env.bool('DB_CONN_HEALTH_CHECKS', default=True)
+# psycopg connection pool per uwsgi worker instead of one persistent connection (needs psycopg[pool] >= 3)
+DB_POOL = env.bool('DB_POOL', default=False)
+DB_POOL_MIN_SIZE = env.int('DB_POOL_MIN_SIZE', default=1)
+DB_POOL_MAX_SIZE = env.int('DB_POOL_MAX_SIZE', default=4)
+DB_POOL_TIMEOUT = env.float('DB_POOL_TIMEOUT', default=10.0)
+# Read replicas ("host" or "host:port", same name and credentials as the primary)
+DB_REPLICA_HOSTS = env.list('DB_REPLICA_HOSTS', default=[])
+DB_REPLICA_MAX_LAG = env.float('DB_REPLICA_MAX_LAG', default=5.0)
+# Seconds a device/user reads from the primary after writing
+DB_READ_YOUR_WRITES_SECONDS = env.int('DB_READ_YOUR_WRITES_SECONDS', default=15)
+# pgbouncer in transaction mode: no server-side cursors (they outlive a transaction)
+DB_PGBOUNCER = env.bool('DB_PGBOUNCER', default=False)
+
+# CACHE SETTINGS
+# Must be shared by all uwsgi workers (file cache on the app volume by default)
+CACHE = env.cache_url('CACHE_URL', default='filecache:///vol/web/cache/')
+
+# PUSH NOTIFICATIONS
+# apps.notifications.transports.FCMTransport in production (needs firebase-admin);
+# required unless DEBUG, the in-memory FakeTransport delivers nothing
+PUSH_TRANSPORT = env('PUSH_TRANSPORT', default='apps.notifications.transports.FakeTransport' if DEBUG else '')
+FCM_CREDENTIALS_FILE = env('FCM_CREDENTIALS_FILE', default='')
 
 # telegram bot
 TELEGRAM_BOT_TOKEN = env('TELEGRAM_BOT_TOKEN', default='7590412308:AAEXdbv2SdN-5hhqiFaUyLZL41PcbFrk9a4')
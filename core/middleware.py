@@ -1,7 +1,44 @@
+from django.utils import translation
+from django.utils.cache import patch_vary_headers
 from django.utils.deprecation import MiddlewareMixin
 
+from apps.shared.utils.custom_current_host import get_client_ip
+from apps.shared.utils.db_router import is_pinned, pin, replica_reads, replicas
+from apps.shared.utils.language import negotiate
+from apps.shared.utils.throttling import device_ident, user_ident
+from apps.users.activity import record_device_activity, record_device_seen
 from apps.users.models.device import Device
 
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets safe requests read from replicas (see apps.shared.utils.db_router), unless
+    their device, user or IP wrote recently; a successful write request pins its
+    device and user (its IP when it has neither) to the primary
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replicas():
+            return self.get_response(request)
+
+        device, user = device_ident(request), user_ident(request)
+        writer = [f'device:{device}' if device else None, f'user:{user}' if user else None]
+        ip = f'ip:{get_client_ip(request)}'
+
+        if request.method not in SAFE_METHODS:
+            response = self.get_response(request)
+            if response.status_code < 400:
+                pin(writer if any(writer) else [ip])
+            return response
+
+        with replica_reads(not is_pinned([*writer, ip])):
+            return self.get_response(request)
+
 
 class DeviceLanguageMiddleware(MiddlewareMixin):
     def process_request(self, request):
@@ -10,15 +47,24 @@ class DeviceLanguageMiddleware(MiddlewareMixin):
 
         if token:
             try:
-                device = Device.objects.filter(device_token=token).first()
+                device = Device.objects.select_related('app_version').filter(device_token=token).first()
             except Exception:
                 device = None
 
         if device:
-            lang = device.language.lower()
-        else:
-            lang = 'uz'
+            record_device_activity(device)
+            record_device_seen(device)
 
         request.device = device
-        request.lang = lang
-        print(request.device)
\ No newline at end of file
+        request.language = negotiate(request)
+        request.lang = request.language.code
+        # Scoped to this request, process_response deactivates it
+        translation.activate(request.language.content)
+
+    def process_response(self, request, response):
+        language = getattr(request, 'language', None)
+        if language is not None:
+            response.headers.setdefault('Content-Language', language.code)
+            patch_vary_headers(response, ('Accept-Language',))
+        translation.deactivate()
+        return response
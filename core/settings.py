@@ -51,10 +51,12 @@ INSTALLED_APPS = [
     'apps.recipes',
     'apps.admins',
     'apps.questionnaires',
+    'apps.notifications',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -96,9 +98,54 @@ DATABASES = {
         'PASSWORD': config.DB_PASS,
         'HOST': config.DB_HOST,
         'PORT': config.DB_PORT,
+        'CONN_MAX_AGE': config.DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': config.DB_CONN_HEALTH_CHECKS,
+        'DISABLE_SERVER_SIDE_CURSORS': config.DB_PGBOUNCER,
+        'OPTIONS': {},
     }
 }
 
+if config.DB_PGBOUNCER:
+    # PgBouncer in transaction mode hands each transaction to any server connection,
+    # where psycopg's server-side prepared statements may not exist
+    DATABASES['default']['OPTIONS']['prepare_threshold'] = None
+
+if config.DB_POOL:
+    # The pool keeps the connections, Django must close (return) them after each request
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': config.DB_POOL_MIN_SIZE,
+        'max_size': config.DB_POOL_MAX_SIZE,
+        'timeout': config.DB_POOL_TIMEOUT,
+    }
+
+# Read replicas, see apps.shared.utils.db_router
+DATABASE_REPLICAS = []
+for number, replica in enumerate(config.DB_REPLICA_HOSTS, start=1):
+    host, _, port = replica.partition(':')
+    alias = f'replica_{number}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or config.DB_PORT,
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        # Tests read the test database through the replica aliases
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['apps.shared.utils.db_router.ReplicaRouter']
+REPLICA_MAX_LAG = config.DB_REPLICA_MAX_LAG
+READ_YOUR_WRITES_SECONDS = config.DB_READ_YOUR_WRITES_SECONDS
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': config.CACHE,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -140,7 +187,31 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 STATIC_ROOT = config.STATIC_ROOT
+MEDIA_URL = '/media/'
 MEDIA_ROOT = config.MEDIA_ROOT
+MEDIA_ACCEL_REDIRECT = config.MEDIA_ACCEL_REDIRECT
+# nginx internal location aliased to MEDIA_ROOT
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+# Lifetime of signed private media URLs, in seconds
+MEDIA_URL_TTL = config.MEDIA_URL_TTL
+IMAGE_VARIANT_WORKERS = config.IMAGE_VARIANT_WORKERS
+CHUNKED_UPLOAD_DIR = config.CHUNKED_UPLOAD_DIR
+# Largest chunk accepted by one resumable upload request
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+# Hard size limits per media type, in bytes
+MEDIA_UPLOAD_LIMITS = {
+    'image': 20 * 1024 * 1024,
+    'video': 2 * 1024 * 1024 * 1024,
+    'audio': 200 * 1024 * 1024,
+    'document': 50 * 1024 * 1024,
+    'other': 20 * 1024 * 1024,
+}
+
+STORAGES = {
+    # Uploads are deduplicated and stored under their SHA-256 (see apps.shared.storage)
+    'default': {'BACKEND': 'apps.shared.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -160,6 +231,15 @@ REST_FRAMEWORK = {
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 
+    # Per throttle_scope, <scope>_<device|user|ip> overrides (apps.shared.utils.throttling)
+    'DEFAULT_THROTTLE_RATES': {
+        'auth': '10/min',
+        'auth_ip': '60/min',
+        'vote': '30/min',
+        'vote_ip': '300/min',
+        'rating': '20/min',
+        'rating_ip': '200/min',
+    },
 }
 
 SIMPLE_JWT = {
@@ -179,5 +259,10 @@ SIMPLE_JWT = {
 
 
 AUTH_USER_MODEL = 'users.User'
+# Phone + password for the mobile API, username + password for the admin
+AUTHENTICATION_BACKENDS = ['apps.users.backends.PhoneBackend']
 TELEGRAM_BOT_TOKEN = config.TELEGRAM_BOT_TOKEN
 TELEGRAM_CHANNEL_ID = config.TELEGRAM_CHANNEL_ID
+
+PUSH_TRANSPORT = config.PUSH_TRANSPORT
+FCM_CREDENTIALS_FILE = config.FCM_CREDENTIALS_FILE
@@ -17,6 +17,8 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework_simplejwt.views import TokenRefreshView
+
+from apps.shared.views import private_media
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularSwaggerView,
@@ -26,6 +28,7 @@ urlpatterns = [
     path('admins/', admin.site.urls),
     path('api/v1/', include('apps.urls.v1')),
     path('api/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('private-media/<path:name>', private_media, name='private_media'),
 ]
 
 urlpatterns += [
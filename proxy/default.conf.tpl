@@ -2,10 +2,29 @@ server {
     listen 80;
     server_name furniture.amirshox.uz www.furniture.amirshox.uz 159.89.19.244;
 
+    # Large media go through resumable uploads in chunks of at most 8 MB
+    client_max_body_size 100M;
+
     location /static/ {
         alias /vol/web/static/;
     }
 
+    # Content-addressed blobs never change
+    location /media/cas/ {
+        alias /vol/web/media/cas/;
+        add_header Cache-Control "public, max-age=31536000, immutable";
+    }
+
+    # Private files are only sent through signed URLs (X-Accel-Redirect from Django)
+    location /media/private/ {
+        return 404;
+    }
+
+    location /protected-media/ {
+        internal;
+        alias /vol/web/media/;
+    }
+
     location /media/ {
         alias /vol/web/media/;
     }